@@ -568,6 +568,123 @@ _create_option(
     visibility="hidden",
 )
 
+_create_option(
+    "runner.preloadScripts",
+    description="""
+        Compile the app's main script and the scripts in its pages/ directory
+        in the background when the server starts, instead of when each page
+        is first visited.
+    """,
+    default_val=False,
+    type_=bool,
+    visibility="hidden",
+)
+
+_create_option(
+    "runner.preloadImports",
+    description="""
+        When preloading scripts (see `runner.preloadScripts`), also import the
+        modules that they import at their top level, so that the first visit
+        of a page doesn't have to.
+    """,
+    default_val=False,
+    type_=bool,
+    visibility="hidden",
+)
+
+_create_option(
+    "runner.persistBytecodeCache",
+    description="""
+        Also cache the compiled bytecode of app scripts on disk (in
+        ~/.streamlit/bytecode_cache), so that new server processes don't have
+        to magic-transform and compile every page again.
+    """,
+    default_val=False,
+    type_=bool,
+    visibility="hidden",
+)
+
+_create_option(
+    "runner.maxConcurrentScriptRuns",
+    description="""
+        Max number of scripts (across all sessions) that run at the same time.
+        If set, scripts run on a shared pool of this many reusable threads, and
+        further reruns wait in a queue that is served round-robin by session.
+        If 0, every script run starts its own thread.
+    """,
+    default_val=0,
+    type_=int,
+    visibility="hidden",
+)
+
+_create_option(
+    "runner.admissionMaxRunningSessions",
+    description="""
+        Max number of sessions that run their script at the same time. Rerun
+        requests from other sessions wait in a queue until a running script
+        stops. If 0, there is no limit.
+    """,
+    default_val=0,
+    type_=int,
+    visibility="hidden",
+)
+
+_create_option(
+    "runner.admissionQueueTimeout",
+    description="""
+        Number of seconds a rerun request waits for
+        `runner.admissionMaxRunningSessions` before it's dropped and the
+        browser is told to retry later.
+    """,
+    default_val=10.0,
+    type_=float,
+    visibility="hidden",
+)
+
+_create_option(
+    "runner.rerunDebounceMs",
+    description="""
+        Debounce window for script reruns, in milliseconds. The first rerun
+        request of a session runs right away, but further full-script reruns
+        requested within this window (e.g. while dragging a slider) are merged
+        into one rerun on the latest widget states, which runs when the window
+        ends. If 0, every rerun request is handled right away.
+    """,
+    default_val=0.0,
+    type_=float,
+    visibility="hidden",
+)
+
+_create_option(
+    "runner.numScriptProcesses",
+    description="""
+        Number of worker processes that run app scripts. If set, each session
+        runs its script in one of these processes, so that CPU-bound scripts
+        of different sessions don't contend for the server's GIL. Caches are
+        not shared between processes. Requires the default in-memory media
+        file storage. If 0, scripts run in threads of the server process.
+    """,
+    default_val=0,
+    type_=int,
+    visibility="hidden",
+)
+
+_create_option(
+    "runner.interruptCheckIntervalMs",
+    description="""
+        If set, rerun and stop requests also interrupt pure-Python code in the
+        app's own source files (e.g. a long loop that doesn't call any
+        Streamlit command). The script checks for requests at most once per
+        this many milliseconds. This uses a trace function, which slows down
+        the app's own code, and isn't used while a debugger or coverage tool
+        is active. If 0, requests are only handled when the script calls a
+        Streamlit command.
+    """,
+    default_val=0.0,
+    type_=float,
+    visibility="hidden",
+)
+
 _create_option(
     "runner.fastReruns",
     description="""
@@ -644,6 +761,18 @@ _create_option(
     type_=str,
 )
 
+_create_option(
+    "server.fileWatcherMaxHashSize",
+    description="""
+        Max size, in megabytes, of watched files whose contents are hashed to
+        tell whether they really changed. Larger files are only compared by
+        their modification time, size and inode.
+    """,
+    default_val=50,
+    type_=int,
+    visibility="hidden",
+)
+
 
 @_create_option("server.cookieSecret", type_=str, sensitive=True)
 @util.memoize
@@ -806,6 +935,134 @@ _create_option(
     type_=bool,
 )
 
+_create_option(
+    "server.websocketCompressionMinSize",
+    description="""
+        Messages smaller than this many bytes are sent uncompressed, even if
+        websocket compression is enabled.
+    """,
+    default_val=1024,
+    type_=int,
+    visibility="hidden",
+)
+
+_create_option(
+    "server.websocketCompressionLevel",
+    description="""
+        zlib compression level (0-9) used for websocket compression.
+    """,
+    default_val=6,
+    type_=int,
+    visibility="hidden",
+)
+
+_create_option(
+    "server.websocketCompressionMemLevel",
+    description="""
+        zlib memory level (1-9) used for websocket compression.
+    """,
+    default_val=8,
+    type_=int,
+    visibility="hidden",
+)
+
+_create_option(
+    "server.websocketCompressionWindowBits",
+    description="""
+        Max size of the compression window (as a power of two, 9-15) used for
+        websocket compression. Smaller windows use less memory per connection.
+    """,
+    default_val=15,
+    type_=int,
+    visibility="hidden",
+)
+
+_create_option(
+    "server.websocketCompressionOffloadSize",
+    description="""
+        Messages of at least this many megabytes are compressed on a worker
+        thread instead of the server's eventloop.
+    """,
+    default_val=1,
+    type_=float,
+    visibility="hidden",
+)
+
+_create_option(
+    "server.flushByteBudgetPerSession",
+    description="""
+        Max number of bytes of ForwardMsgs sent to a single session before the
+        server moves on to the next session with pending messages. A single
+        message larger than this is still sent in one piece. Lifecycle messages
+        (e.g. "script finished") don't count against this budget.
+    """,
+    visibility="hidden",
+    default_val=1024 * 1024,
+    type_=int,
+)
+
+_create_option(
+    "server.flushTimeBudgetMs",
+    description="""
+        Max number of milliseconds the server spends sending ForwardMsgs to
+        sessions before pausing to handle other events. Sessions that weren't
+        served are served first after the pause.
+    """,
+    visibility="hidden",
+    default_val=50,
+    type_=int,
+)
+
+_create_option(
+    "server.flushCoalesceWindowMs",
+    description="""
+        Number of milliseconds the server waits between two flushes of
+        ForwardMsgs while sessions keep producing new messages, so that they are
+        sent in fewer, larger flushes. The first message after an idle period is
+        always sent immediately.
+    """,
+    visibility="hidden",
+    default_val=10,
+    type_=int,
+)
+
+_create_option(
+    "server.websocketWriteBufferHighWatermark",
+    description="""
+        Max size, in megabytes, of data written to a client's WebSocket connection
+        that the client hasn't read yet. Above this, the server stops sending new
+        messages to the session until the pending data drops to
+        `server.websocketWriteBufferLowWatermark`. In the meantime, outdated
+        messages for the same part of the app are replaced by newer ones.
+    """,
+    visibility="hidden",
+    default_val=16,
+    type_=int,
+)
+
+_create_option(
+    "server.websocketWriteBufferLowWatermark",
+    description="""
+        Size, in megabytes, that a paused client's unread WebSocket data has to
+        drop to before the server resumes sending it messages.
+    """,
+    visibility="hidden",
+    default_val=4,
+    type_=int,
+)
+
+_create_option(
+    "server.websocketSlowClientTimeout",
+    description="""
+        Number of seconds a client's unread WebSocket data may stay above
+        `server.websocketWriteBufferHighWatermark` before the server closes the
+        connection.
+    """,
+    visibility="hidden",
+    default_val=60,
+    type_=int,
+)
+
 _create_option(
     "server.enableStaticServing",
     description="""
@@ -827,6 +1084,70 @@ _create_option(
     type_=int,
 )
 
+_create_option(
+    "server.disconnectedSessionMaxMemory",
+    description="""
+        Max memory, in megabytes, that sessions whose websockets have been
+        disconnected may use in total, as estimated when they disconnect. When
+        set, this replaces the default limit of 128 disconnected sessions, and
+        the least recently used sessions are cleaned up first. If 0, the number
+        of sessions is limited instead.
+    """,
+    visibility="hidden",
+    default_val=0,
+    type_=int,
+)
+
+_create_option(
+    "server.disconnectedSessionHibernationDelay",
+    description="""
+        Number of seconds after which a session whose websocket has been
+        disconnected hibernates to save memory, until it's reconnected to. A
+        hibernating session releases its fragments and keeps its Session State
+        as a compressed pickle, so values are restored as copies. If 0, sessions
+        don't hibernate.
+    """,
+    visibility="hidden",
+    default_val=0,
+    type_=int,
+)
+
+_create_option(
+    "server.sessionStatePersistencePath",
+    description="""
+        Path of an SQLite database that snapshots of each session's Session State
+        are written to after every script run, so that the state can be restored
+        when a client reconnects after its session was cleaned up or the server
+        restarted. Only values set through `st.session_state` are persisted.
+        If not set, Session State isn't persisted.
+    """,
+    visibility="hidden",
+    default_val=None,
+    type_=str,
+)
+
+_create_option(
+    "server.sessionStatePersistenceCodec",
+    description="""
+        How persisted Session State values are encoded. One of "pickle", or
+        "zlib" to also compress them.
+    """,
+    visibility="hidden",
+    default_val="pickle",
+    type_=str,
+)
+
+_create_option(
+    "server.sessionStatePersistenceTTL",
+    description="""
+        Number of seconds after its last change that the persisted Session State
+        of a session is removed.
+    """,
+    visibility="hidden",
+    default_val=24 * 60 * 60,
+    type_=int,
+)
+
 # Config Section: Browser #
 
 _create_section("browser", "Configuration of non-UI browser options.")
@@ -15,7 +15,7 @@
 from __future__ import annotations
 
 from enum import Enum, EnumMeta
-from typing import Any, Final, Iterable, Sequence, TypeVar, overload
+from typing import Any, Callable, Final, Iterable, Sequence, TypeVar, overload
 
 from streamlit import config, logger
 from streamlit.dataframe_util import OptionSequence, convert_anything_to_list
@@ -29,6 +29,9 @@ from streamlit.type_util import (
 _LOGGER: Final = logger.get_logger(__name__)
 
 _FLOAT_EQUALITY_EPSILON: Final[float] = 0.000000000005
+# Building a value -> index map costs about as much as a handful of scans over
+# the options, so it's only done to look up more default values than this.
+_MIN_VALUES_FOR_INDEX_MAP: Final = 8
 _Value = TypeVar("_Value")
 
 
@@ -48,6 +51,14 @@ def index_(iterable: Iterable[_Value], x: _Value) -> int:
     -------
     int
     """
+    if isinstance(iterable, list) and not isinstance(x, float):
+        # The float tolerance below only applies if x is a float, so otherwise
+        # the much faster built-in lookup finds the same item.
+        try:
+            return iterable.index(x)
+        except ValueError:
+            raise ValueError(f"{str(x)} is not in iterable") from None
+
     for i, value in enumerate(iterable):
         if x == value:
             return i
@@ -66,14 +77,58 @@ def check_and_convert_to_indices(
 
     default_values = convert_anything_to_list(default_values)
 
+    index_map = (
+        _build_index_map(opt)
+        if len(default_values) >= _MIN_VALUES_FOR_INDEX_MAP
+        else None
+    )
+
+    indices = []
     for value in default_values:
-        if value not in opt:
+        try:
+            indices.append(_index_of(opt, index_map, value))
+        except ValueError:
             raise StreamlitAPIException(
                 f"The default value '{value}' is not part of the options. "
                 "Please make sure that every default values also exists in the options."
-            )
+            ) from None
+    return indices
+
+
+def _index_of(opt: Sequence[Any], index_map: dict[Any, int] | None, value: Any) -> int:
+    """Return the index of value in opt, using index_map if possible."""
+    if index_map is not None:
+        try:
+            return index_map[value]
+        except KeyError:
+            raise ValueError(f"{str(value)} is not in options") from None
+        except TypeError:
+            # The value is unhashable, but may still be equal to an option.
+            pass
+    return opt.index(value)
+
+
+def _build_index_map(opt: Sequence[Any]) -> dict[Any, int] | None:
+    """Return a map of each option to the index of its first occurrence, or
+    None if not all options are hashable.
+    """
+    index_map: dict[Any, int] = {}
+    try:
+        for i, option in enumerate(opt):
+            index_map.setdefault(option, i)
+    except TypeError:
+        return None
+    return index_map
+
 
-    return [opt.index(value) for value in default_values]
+def format_options(opt: Sequence[Any], format_func: Callable[[Any], Any]) -> list[str]:
+    """Return the label of each option.
+
+    Widgets need the labels both to compute their element ID and to fill their
+    proto, so they should call this once and use the result for both, as
+    format_func may be expensive for long lists of options.
+    """
+    return [str(format_func(option)) for option in opt]
 
 
 def convert_to_sequence_and_check_comparable(options: OptionSequence[T]) -> Sequence[T]:
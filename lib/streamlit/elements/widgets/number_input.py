@@ -387,8 +387,12 @@ class NumberInputMixin:
         if not all_int_args and not all_float_args:
             raise StreamlitMixedNumericTypesError(value=value, min_value=min_value, max_value=max_value, step=step)
 
-        session_state = get_session_state().filtered_state
-        if key is not None and key in session_state and session_state[key] is None:
+        session_state = get_session_state()
+        if (
+            key is not None
+            and session_state.has_filtered_key(key)
+            and session_state.get_filtered_value(key) is None
+        ):
             value = None
 
         if value == "min":
@@ -20,7 +20,11 @@ from typing import TYPE_CHECKING, Any, Callable, Generic, Sequence, cast, overlo
 
 from streamlit.dataframe_util import OptionSequence, convert_anything_to_list
 from streamlit.elements.lib.form_utils import current_form_id
-from streamlit.elements.lib.options_selector_utils import index_, maybe_coerce_enum
+from streamlit.elements.lib.options_selector_utils import (
+    format_options,
+    index_,
+    maybe_coerce_enum,
+)
 from streamlit.elements.lib.policies import (
     check_widget_policies,
     maybe_raise_label_warnings,
@@ -313,13 +317,14 @@ class RadioMixin:
 
         opt = convert_anything_to_list(options)
         check_python_comparable(opt)
+        formatted_options = format_options(opt, format_func)
 
         element_id = compute_and_register_element_id(
             "radio",
             user_key=key,
             form_id=current_form_id(self.dg),
             label=label,
-            options=[str(format_func(option)) for option in opt],
+            options=formatted_options,
             index=index,
             help=help,
             horizontal=horizontal,
@@ -346,8 +351,12 @@ class RadioMixin:
                     f"Radio captions must be strings. Passed type: {type(caption).__name__}"
                 )
 
-        session_state = get_session_state().filtered_state
-        if key is not None and key in session_state and session_state[key] is None:
+        session_state = get_session_state()
+        if (
+            key is not None
+            and session_state.has_filtered_key(key)
+            and session_state.get_filtered_value(key) is None
+        ):
             index = None
 
         radio_proto = RadioProto()
@@ -355,7 +364,7 @@ class RadioMixin:
         radio_proto.label = label
         if index is not None:
             radio_proto.default = index
-        radio_proto.options[:] = [str(format_func(option)) for option in opt]
+        radio_proto.options[:] = formatted_options
         radio_proto.form_id = current_form_id(self.dg)
         radio_proto.horizontal = horizontal
         radio_proto.disabled = disabled
@@ -32,6 +32,7 @@ from typing_extensions import TypeGuard
 from streamlit.dataframe_util import OptionSequence, convert_anything_to_list
 from streamlit.elements.lib.form_utils import current_form_id
 from streamlit.elements.lib.options_selector_utils import (
+    format_options,
     index_,
     maybe_coerce_enum,
     maybe_coerce_enum_sequence,
@@ -368,13 +369,14 @@ class SelectSliderMixin:
 
         # Convert element to index of the elements
         slider_value = as_index_list(value)
+        formatted_options = format_options(opt, format_func)
 
         element_id = compute_and_register_element_id(
             "select_slider",
             user_key=key,
             form_id=current_form_id(self.dg),
             label=label,
-            options=[str(format_func(option)) for option in opt],
+            options=formatted_options,
             value=slider_value,
             help=help,
         )
@@ -389,7 +391,7 @@ class SelectSliderMixin:
         slider_proto.max = len(opt) - 1
         slider_proto.step = 1  # default for index changes
         slider_proto.data_type = SliderProto.INT
-        slider_proto.options[:] = [str(format_func(option)) for option in opt]
+        slider_proto.options[:] = formatted_options
         slider_proto.form_id = current_form_id(self.dg)
         slider_proto.disabled = disabled
         slider_proto.label_visibility.value = get_label_visibility_proto_value(
@@ -19,7 +19,11 @@ from typing import TYPE_CHECKING, Any, Callable, Generic, Sequence, cast, overlo
 
 from streamlit.dataframe_util import OptionSequence, convert_anything_to_list
 from streamlit.elements.lib.form_utils import current_form_id
-from streamlit.elements.lib.options_selector_utils import index_, maybe_coerce_enum
+from streamlit.elements.lib.options_selector_utils import (
+    format_options,
+    index_,
+    maybe_coerce_enum,
+)
 from streamlit.elements.lib.policies import (
     check_widget_policies,
     maybe_raise_label_warnings,
@@ -287,13 +291,14 @@ class SelectboxMixin:
 
         opt = convert_anything_to_list(options)
         check_python_comparable(opt)
+        formatted_options = format_options(opt, format_func)
 
         element_id = compute_and_register_element_id(
             "selectbox",
             user_key=key,
             form_id=current_form_id(self.dg),
             label=label,
-            options=[str(format_func(option)) for option in opt],
+            options=formatted_options,
             index=index,
             help=help,
             placeholder=placeholder,
@@ -309,8 +314,12 @@ class SelectboxMixin:
                 "Selectbox index must be greater than or equal to 0 and less than the length of options."
             )
 
-        session_state = get_session_state().filtered_state
-        if key is not None and key in session_state and session_state[key] is None:
+        session_state = get_session_state()
+        if (
+            key is not None
+            and session_state.has_filtered_key(key)
+            and session_state.get_filtered_value(key) is None
+        ):
             index = None
 
         selectbox_proto = SelectboxProto()
@@ -318,7 +327,7 @@ class SelectboxMixin:
         selectbox_proto.label = label
         if index is not None:
             selectbox_proto.default = index
-        selectbox_proto.options[:] = [str(format_func(option)) for option in opt]
+        selectbox_proto.options[:] = formatted_options
         selectbox_proto.form_id = current_form_id(self.dg)
         selectbox_proto.placeholder = placeholder
         selectbox_proto.disabled = disabled
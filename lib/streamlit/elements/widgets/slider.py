@@ -574,10 +574,10 @@ class SliderMixin:
 
             single_value = True
 
-            session_state = get_session_state().filtered_state
+            session_state = get_session_state()
 
-            if key is not None and key in session_state:
-                state_value = session_state[key]
+            if key is not None and session_state.has_filtered_key(key):
+                state_value = session_state.get_filtered_value(key)
                 single_value = isinstance(state_value, tuple(SUPPORTED_TYPES.keys()))
 
             if single_value:
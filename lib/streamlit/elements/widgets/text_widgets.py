@@ -290,8 +290,12 @@ class TextWidgetsMixin:
             placeholder=str(placeholder),
         )
 
-        session_state = get_session_state().filtered_state
-        if key is not None and key in session_state and session_state[key] is None:
+        session_state = get_session_state()
+        if (
+            key is not None
+            and session_state.has_filtered_key(key)
+            and session_state.get_filtered_value(key) is None
+        ):
             value = None
 
         text_input_proto = TextInputProto()
@@ -567,8 +571,12 @@ class TextWidgetsMixin:
             placeholder=str(placeholder),
         )
 
-        session_state = get_session_state().filtered_state
-        if key is not None and key in session_state and session_state[key] is None:
+        session_state = get_session_state()
+        if (
+            key is not None
+            and session_state.has_filtered_key(key)
+            and session_state.get_filtered_value(key) is None
+        ):
             value = None
 
         text_area_proto = TextAreaProto()
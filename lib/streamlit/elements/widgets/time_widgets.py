@@ -518,8 +518,12 @@ class TimeWidgetsMixin:
         )
         del value
 
-        session_state = get_session_state().filtered_state
-        if key is not None and key in session_state and session_state[key] is None:
+        session_state = get_session_state()
+        if (
+            key is not None
+            and session_state.has_filtered_key(key)
+            and session_state.get_filtered_value(key) is None
+        ):
             parsed_time = None
 
         time_input_proto = TimeInputProto()
@@ -841,10 +845,10 @@ class TimeWidgetsMixin:
             # We already calculated the id, so there is no risk of this causing
             # the id to change.
 
-            session_state = get_session_state().filtered_state
+            session_state = get_session_state()
 
-            if key is not None and key in session_state:
-                state_value = session_state[key]
+            if key is not None and session_state.has_filtered_key(key):
+                state_value = session_state.get_filtered_value(key)
                 parsed_values = _DateInputValues.from_raw_values(
                     value=state_value,
                     min_value=min_value,
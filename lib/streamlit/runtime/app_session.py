@@ -38,6 +38,7 @@ from streamlit.runtime.forward_msg_queue import ForwardMsgQueue
 from streamlit.runtime.fragment import FragmentStorage, MemoryFragmentStorage
 from streamlit.runtime.metrics_util import Installation
 from streamlit.runtime.pages_manager import PagesManager
+from streamlit.runtime.rerun_debouncer import RerunDebouncer
 from streamlit.runtime.scriptrunner import RerunData, ScriptRunner, ScriptRunnerEvent
 from streamlit.runtime.secrets import secrets_singleton
 from streamlit.string_util import to_snake_case
@@ -48,7 +49,12 @@ if TYPE_CHECKING:
     from streamlit.proto.BackMsg_pb2 import BackMsg
     from streamlit.proto.PagesChanged_pb2 import PagesChanged
     from streamlit.runtime.script_data import ScriptData
+    from streamlit.runtime.script_run_admission import ScriptRunAdmissionController
     from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.runtime.scriptrunner.script_process_pool import (
+        ProcessScriptRunner,
+        ScriptProcessPool,
+    )
     from streamlit.runtime.state import SessionState
     from streamlit.runtime.uploaded_file_manager import UploadedFileManager
     from streamlit.source_util import PageHash, PageInfo
@@ -62,6 +68,19 @@ class AppSessionState(Enum):
     SHUTDOWN_REQUESTED = "SHUTDOWN_REQUESTED"
 
 
+class HibernationResult(Enum):
+    """The result of AppSession.hibernate()."""
+
+    # The session hibernates, or doesn't need to (e.g. it's shut down).
+    HIBERNATED = "HIBERNATED"
+    # The session's script is still running, or a rerun is waiting to start.
+    # Hibernating may succeed later.
+    BUSY = "BUSY"
+    # The session's Session State can't be compressed, so there's no point in
+    # trying again.
+    FAILED = "FAILED"
+
+
 def _generate_scriptrun_id() -> str:
     """Randomly generate a unique ID for a script execution."""
     return str(uuid.uuid4())
@@ -142,6 +161,12 @@ class AppSession:
 
         self._state = AppSessionState.APP_NOT_RUNNING
 
+        # True while the session hibernates (see hibernate()).
+        self._hibernated = False
+        # True if the fragments were released by hibernate() and haven't been
+        # recreated by a full script run since.
+        self._fragments_released = False
+
         # Need to remember the client state here because when a script reruns
         # due to the source code changing we need to pass in the previous client state.
         self._client_state = ClientState()
@@ -155,7 +180,14 @@ class AppSession:
 
         self._run_on_save = config.get_option("server.runOnSave")
 
-        self._scriptrunner: ScriptRunner | None = None
+        self._scriptrunner: ScriptRunner | ProcessScriptRunner | None = None
+
+        debounce_window = config.get_option("runner.rerunDebounceMs") / 1000
+        self._rerun_debouncer: RerunDebouncer | None = (
+            RerunDebouncer(debounce_window, self._request_admission)
+            if debounce_window > 0
+            else None
+        )
 
         # This needs to be lazily imported to avoid a dependency cycle.
         from streamlit.runtime.state import SessionState
@@ -187,6 +219,10 @@ class AppSession:
         called again in the case when a session is disconnected and is being reconnect
         to.
         """
+        # File changes may rerun the script from the watcher threads, so the
+        # session can't hibernate while they're registered.
+        self._wake()
+
         if self._local_sources_watcher is None:
             self._local_sources_watcher = LocalSourcesWatcher(self._pages_manager)
 
@@ -216,6 +252,63 @@ class AppSession:
         self._stop_config_listener = None
         self._stop_pages_listener = None
 
+    def hibernate(self) -> HibernationResult:
+        """Release the memory that an idle, disconnected session doesn't need.
+
+        The fragments of the last script run are released, and Session State
+        is compressed (see SessionState.hibernate). The session wakes up
+        automatically when its file watchers are registered again on reconnect,
+        or it gets its next BackMsg. The next rerun is then always a full script
+        run, which recreates the fragments.
+
+        While the session hibernates, the stats of its Session State account for
+        the compressed size.
+
+        Returns BUSY if the session can't hibernate yet because its script is
+        still running or a rerun is waiting to start, and FAILED if its Session
+        State can't be compressed. The session is left unchanged in both cases.
+
+        Threading: UNSAFE. Must be called on the eventloop thread, after the
+        session's file watchers were disconnected.
+        """
+        if self._state == AppSessionState.SHUTDOWN_REQUESTED or self._hibernated:
+            return HibernationResult.HIBERNATED
+        if (
+            self._state == AppSessionState.APP_IS_RUNNING
+            or self._scriptrunner
+            or self._has_pending_rerun()
+        ):
+            return HibernationResult.BUSY
+
+        if not self._session_state.hibernate():
+            return HibernationResult.FAILED
+        self._fragment_storage.clear()
+        self._fragments_released = True
+        self._hibernated = True
+        _LOGGER.debug("Session hibernated (id=%s)", self.id)
+        return HibernationResult.HIBERNATED
+
+    def _has_pending_rerun(self) -> bool:
+        """True if a rerun is held back by the debouncer or waits for
+        admission.
+        """
+        if (
+            self._rerun_debouncer is not None
+            and self._rerun_debouncer.has_pending_rerun
+        ):
+            return True
+        admission_controller = self._get_admission_controller()
+        return admission_controller is not None and admission_controller.is_queued(
+            self.id
+        )
+
+    def _wake(self) -> None:
+        """Undo hibernate(), if the session is hibernating."""
+        if self._hibernated:
+            self._session_state.wake()
+            self._hibernated = False
+            _LOGGER.debug("Session woke up (id=%s)", self.id)
+
     def flush_browser_queue(self) -> list[ForwardMsg]:
         """Clear the forward message queue and return the messages it contained.
 
@@ -259,6 +352,23 @@ class AppSession:
             # generally already done so by the time we get here.
             self.disconnect_file_watchers()
 
+            # Drop a rerun request that is still waiting for admission. (If the
+            # script is running, its admission is released once it stops.)
+            if self._scriptrunner is None:
+                self._release_admission()
+
+            if self._rerun_debouncer is not None:
+                self._rerun_debouncer.cancel()
+                _LOGGER.debug(
+                    "Rerun debouncer stats (id=%s): %s",
+                    self.id,
+                    self._rerun_debouncer.stats,
+                )
+
+            process_pool = self._get_script_process_pool()
+            if process_pool is not None:
+                process_pool.close_session(self.id)
+
     def _enqueue_forward_msg(self, msg: ForwardMsg) -> None:
         """Enqueue a new ForwardMsg to our browser queue.
 
@@ -281,6 +391,7 @@ class AppSession:
 
     def handle_backmsg(self, msg: BackMsg) -> None:
         """Process a BackMsg."""
+        self._wake()
         try:
             msg_type = msg.WhichOneof("type")
 
@@ -354,8 +465,14 @@ class AppSession:
             _LOGGER.warning("Discarding rerun request after shutdown")
             return
 
+        # A full script run recreates the fragments released by hibernate().
+        fragments_released = self._fragments_released
+        self._fragments_released = False
+
         if client_state:
             fragment_id = client_state.fragment_id
+            if fragments_released:
+                fragment_id = ""
 
             rerun_data = RerunData(
                 client_state.query_string,
@@ -368,6 +485,59 @@ class AppSession:
         else:
             rerun_data = RerunData()
 
+        if self._rerun_debouncer is None and self._get_admission_controller() is None:
+            self._rerun(rerun_data)
+            return
+
+        # The debouncer and admission controller must only be used on the
+        # eventloop thread, but rerun requests may come from other threads (e.g.
+        # file watchers).
+        if self._is_on_event_loop_thread():
+            self._debounce_rerun(rerun_data)
+        else:
+            self._event_loop.call_soon_threadsafe(self._debounce_rerun, rerun_data)
+
+    def _debounce_rerun(self, rerun_data: RerunData) -> None:
+        if self._state == AppSessionState.SHUTDOWN_REQUESTED:
+            # The session was shut down after the rerun was requested from
+            # another thread.
+            return
+
+        if self._rerun_debouncer is None:
+            self._request_admission(rerun_data)
+        else:
+            self._rerun_debouncer.request_rerun(rerun_data)
+
+    def _request_admission(self, rerun_data: RerunData) -> None:
+        if self._state == AppSessionState.SHUTDOWN_REQUESTED:
+            return
+
+        admission_controller = self._get_admission_controller()
+        if admission_controller is None:
+            self._rerun(rerun_data)
+            return
+
+        admission_controller.request_run(
+            self.id,
+            on_admitted=lambda: self._rerun(rerun_data),
+            on_shed=self._on_rerun_shed,
+        )
+
+    def _rerun(self, rerun_data: RerunData) -> None:
+        """Run the script with the given RerunData, either by sending a rerun
+        request to our current ScriptRunner or by creating a new one.
+        """
+        if self._state == AppSessionState.SHUTDOWN_REQUESTED:
+            # This can happen if the session was shut down while waiting for
+            # the admission controller. The admission it was just given must
+            # be released, since no script will run to release it.
+            self._release_admission()
+            return
+
+        # The script must see the session's values, not the emptied state of a
+        # hibernating session.
+        self._wake()
+
         if self._scriptrunner is not None:
             if (
                 bool(config.get_option("runner.fastReruns"))
@@ -392,6 +562,40 @@ class AppSession:
         # request - so we'll create and start a new ScriptRunner.
         self._create_scriptrunner(rerun_data)
 
+    def _on_rerun_shed(self) -> None:
+        """Tell the browser that its rerun request was dropped because the
+        server is overloaded.
+        """
+        admission_controller = self._get_admission_controller()
+        msg = ForwardMsg()
+        msg.session_event.rerun_rejected.retry_after = (
+            admission_controller.queue_timeout if admission_controller else 0
+        )
+        self._enqueue_forward_msg(msg)
+
+    def _release_admission(self) -> None:
+        admission_controller = self._get_admission_controller()
+        if admission_controller is not None:
+            admission_controller.release(self.id)
+
+    @staticmethod
+    def _get_admission_controller() -> ScriptRunAdmissionController | None:
+        if not runtime.exists():
+            return None
+        return runtime.get_instance().script_run_admission_controller
+
+    @staticmethod
+    def _get_script_process_pool() -> ScriptProcessPool | None:
+        if not runtime.exists():
+            return None
+        return runtime.get_instance().script_process_pool
+
+    def _is_on_event_loop_thread(self) -> bool:
+        try:
+            return asyncio.get_running_loop() is self._event_loop
+        except RuntimeError:
+            return False
+
     def request_script_stop(self) -> None:
         """Request that the scriptrunner stop execution.
 
@@ -402,6 +606,16 @@ class AppSession:
 
     def _create_scriptrunner(self, initial_rerun_data: RerunData) -> None:
         """Create and run a new ScriptRunner with the given RerunData."""
+        process_pool = self._get_script_process_pool()
+        if process_pool is not None:
+            self._scriptrunner = process_pool.create_runner(
+                self.id, initial_rerun_data, self._user_info
+            )
+            self._scriptrunner.on_event.connect(self._on_scriptrunner_event)
+            self._scriptrunner.on_rerun_rejected.connect(self._on_rerun_rejected)
+            self._scriptrunner.start()
+            return
+
         self._scriptrunner = ScriptRunner(
             session_id=self.id,
             main_script_path=self._script_data.main_script_path,
@@ -412,6 +626,9 @@ class AppSession:
             user_info=self._user_info,
             fragment_storage=self._fragment_storage,
             pages_manager=self._pages_manager,
+            worker_pool=(
+                runtime.get_instance().script_runner_pool if runtime.exists() else None
+            ),
         )
         self._scriptrunner.on_event.connect(self._on_scriptrunner_event)
         self._scriptrunner.start()
@@ -438,7 +655,10 @@ class AppSession:
         """One of our source files changed. Clear the cache and schedule a rerun if
         appropriate.
         """
-        self._script_cache.clear()
+        self._script_cache.clear(filepath)
+        process_pool = self._get_script_process_pool()
+        if process_pool is not None:
+            process_pool.on_source_file_changed(filepath)
 
         if filepath is not None and not self._should_rerun_on_file_change(filepath):
             return
@@ -473,9 +693,34 @@ class AppSession:
             retain_lifecycle_msgs=True, fragment_ids_this_run=fragment_ids_this_run
         )
 
+    def _on_rerun_rejected(
+        self, sender: ProcessScriptRunner, rerun_data: RerunData
+    ) -> None:
+        """Called when a ProcessScriptRunner's worker didn't accept a rerun
+        request that was already handed to it.
+
+        This is called from the worker's reader thread. The rerun is handled
+        on the eventloop thread by a new ScriptRunner.
+        """
+        self._event_loop.call_soon_threadsafe(
+            lambda: self._handle_rerun_rejected_on_event_loop(sender, rerun_data)
+        )
+
+    def _handle_rerun_rejected_on_event_loop(
+        self, sender: ProcessScriptRunner, rerun_data: RerunData
+    ) -> None:
+        if (
+            sender is not self._scriptrunner
+            or self._state == AppSessionState.SHUTDOWN_REQUESTED
+        ):
+            # The rerun was superseded by a later one that started a new
+            # ScriptRunner, or the session is shutting down.
+            return
+        self._create_scriptrunner(rerun_data)
+
     def _on_scriptrunner_event(
         self,
-        sender: ScriptRunner | None,
+        sender: ScriptRunner | ProcessScriptRunner | None,
         event: ScriptRunnerEvent,
         forward_msg: ForwardMsg | None = None,
         exception: BaseException | None = None,
@@ -505,7 +750,7 @@ class AppSession:
 
     def _handle_scriptrunner_event_on_event_loop(
         self,
-        sender: ScriptRunner | None,
+        sender: ScriptRunner | ProcessScriptRunner | None,
         event: ScriptRunnerEvent,
         forward_msg: ForwardMsg | None = None,
         exception: BaseException | None = None,
@@ -520,7 +765,7 @@ class AppSession:
 
         Parameters
         ----------
-        sender : ScriptRunner | None
+        sender : ScriptRunner | ProcessScriptRunner | None
             The ScriptRunner that emitted the event. (This may be set to
             None when called from `handle_backmsg_exception`, if no
             ScriptRunner was active when the backmsg exception was raised.)
@@ -654,6 +899,7 @@ class AppSession:
 
             self._client_state = client_state
             self._scriptrunner = None
+            self._release_admission()
 
         elif event == ScriptRunnerEvent.ENQUEUE_FORWARD_MSG:
             assert (
@@ -806,6 +1052,9 @@ class AppSession:
         caching.cache_data.clear()
         caching.cache_resource.clear()
         self._session_state.clear()
+        process_pool = self._get_script_process_pool()
+        if process_pool is not None:
+            process_pool.clear_caches(self.id)
 
     def _handle_app_heartbeat_request(self) -> None:
         """Handle an incoming app heartbeat.
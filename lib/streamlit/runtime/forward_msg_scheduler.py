@@ -0,0 +1,204 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Callable, Final, Iterator, NamedTuple
+
+from streamlit.runtime.stats import CacheStat, CacheStatsProvider, group_stats
+
+if TYPE_CHECKING:
+    from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+# Messages that tell the client about the lifecycle of a session or script run.
+# They are small, and delaying them makes an app feel unresponsive, so they are
+# never held back by a session's byte budget.
+_LIFECYCLE_MSG_TYPES: Final = frozenset(
+    {
+        "new_session",
+        "script_finished",
+        "session_status_changed",
+        "parent_message",
+    }
+)
+
+
+def _is_lifecycle_msg(msg: ForwardMsg) -> bool:
+    return msg.WhichOneof("type") in _LIFECYCLE_MSG_TYPES
+
+
+class _PendingMsg(NamedTuple):
+    msg: ForwardMsg
+    byte_length: int
+    is_lifecycle: bool
+
+
+class _SessionQueue:
+    """The messages flushed from one session's ForwardMsgQueue that haven't been
+    sent yet.
+    """
+
+    def __init__(self) -> None:
+        self.msgs: deque[_PendingMsg] = deque()
+        self.byte_length = 0
+        self.num_lifecycle_msgs = 0
+
+    def append(self, msg: ForwardMsg) -> None:
+        pending = _PendingMsg(msg, msg.ByteSize(), _is_lifecycle_msg(msg))
+        self.msgs.append(pending)
+        self.byte_length += pending.byte_length
+        self.num_lifecycle_msgs += pending.is_lifecycle
+
+    def popleft(self) -> _PendingMsg:
+        pending = self.msgs.popleft()
+        self.byte_length -= pending.byte_length
+        self.num_lifecycle_msgs -= pending.is_lifecycle
+        return pending
+
+
+class ForwardMsgScheduler(CacheStatsProvider):
+    """Decides which of the sessions' pending ForwardMsgs the Runtime sends on
+    each iteration of its loop.
+
+    Sessions are served round-robin. On each round, a session is sent messages
+    until its byte budget is used up (a single message larger than the budget is
+    still sent whole), and the round ends early once the time budget is used up;
+    the next round then continues with the sessions that weren't served. Lifecycle
+    messages don't count against the byte budget, and sessions that have lifecycle
+    messages pending are served first. The order of a single session's messages is
+    never changed.
+
+    ForwardMsgScheduler is not thread-safe - it should only be used from the
+    Runtime's eventloop thread.
+    """
+
+    def __init__(
+        self,
+        byte_budget_per_session: int,
+        time_budget: float,
+        timer: Callable[[], float] = time.perf_counter,
+    ) -> None:
+        """Create a ForwardMsgScheduler.
+
+        Parameters
+        ----------
+        byte_budget_per_session
+            The max number of (non-lifecycle) message bytes sent to a single session
+            per round.
+        time_budget
+            The number of seconds after which a round ends, even if not all
+            sessions were served.
+        timer
+            The clock used to measure the time budget.
+        """
+        self._byte_budget_per_session = byte_budget_per_session
+        self._time_budget = time_budget
+        self._timer = timer
+        # Insertion order is the round-robin order. A served session is moved to
+        # the end.
+        self._queues: dict[str, _SessionQueue] = {}
+
+    def enqueue(self, session_id: str, msgs: list[ForwardMsg]) -> None:
+        """Add messages flushed from a session's ForwardMsgQueue."""
+        if not msgs:
+            return
+        queue = self._queues.get(session_id)
+        if queue is None:
+            queue = self._queues[session_id] = _SessionQueue()
+        for msg in msgs:
+            queue.append(msg)
+
+    def remove_session(self, session_id: str) -> None:
+        """Drop all pending messages of a session."""
+        self._queues.pop(session_id, None)
+
+    def has_pending(self, can_send: Callable[[str], bool] = lambda _: True) -> bool:
+        """True if any session has messages that weren't sent yet.
+
+        Parameters
+        ----------
+        can_send
+            Sessions for which it returns False are ignored, as in next_round.
+        """
+        return any(can_send(session_id) for session_id in self._queues)
+
+    def queue_depth(self, session_id: str) -> tuple[int, int]:
+        """Return the number of pending messages and their total size in bytes
+        for the given session.
+        """
+        queue = self._queues.get(session_id)
+        if queue is None:
+            return 0, 0
+        return len(queue.msgs), queue.byte_length
+
+    def next_round(
+        self, can_send: Callable[[str], bool] = lambda _: True
+    ) -> Iterator[tuple[str, list[ForwardMsg]]]:
+        """Yield (session_id, messages) tuples for one round of sending.
+
+        Parameters
+        ----------
+        can_send
+            Called with a session ID before serving that session. Sessions for which
+            it returns False (e.g. because their client can't keep up) are skipped
+            and keep their place in the round-robin order.
+        """
+        start = self._timer()
+        session_ids = sorted(
+            self._queues,
+            key=lambda session_id: self._queues[session_id].num_lifecycle_msgs == 0,
+        )
+        for session_id in session_ids:
+            queue = self._queues.get(session_id)
+            if queue is None or not can_send(session_id):
+                continue
+
+            msgs: list[ForwardMsg] = []
+            bytes_sent = 0
+            while queue.msgs:
+                next_msg = queue.msgs[0]
+                if (
+                    not next_msg.is_lifecycle
+                    and bytes_sent > 0
+                    and bytes_sent + next_msg.byte_length
+                    > self._byte_budget_per_session
+                ):
+                    break
+                queue.popleft()
+                msgs.append(next_msg.msg)
+                if not next_msg.is_lifecycle:
+                    bytes_sent += next_msg.byte_length
+
+            # Move the served session to the end of the round-robin order.
+            del self._queues[session_id]
+            if queue.msgs:
+                self._queues[session_id] = queue
+
+            yield session_id, msgs
+
+            if self._timer() - start >= self._time_budget:
+                break
+
+    def get_stats(self) -> list[CacheStat]:
+        stats: list[CacheStat] = [
+            CacheStat(
+                category_name="ForwardMessageQueue",
+                cache_name="",
+                byte_length=queue.byte_length,
+            )
+            for queue in self._queues.values()
+        ]
+        return group_stats(stats)
@@ -102,6 +102,11 @@ class MemoryMediaFileStorage(MediaFileStorage, CacheStatsProvider):
         self._files_by_id: dict[str, MemoryFile] = {}
         self._media_endpoint = media_endpoint
 
+    @property
+    def media_endpoint(self) -> str:
+        """The local endpoint that media is served from."""
+        return self._media_endpoint
+
     def load_and_get_id(
         self,
         path_or_data: str | bytes,
@@ -14,19 +14,85 @@
 
 from __future__ import annotations
 
-from typing import MutableMapping
+import asyncio
+from typing import TYPE_CHECKING, Any, Final, NamedTuple
 
 from cachetools import TTLCache
 
+from streamlit.logger import get_logger
 from streamlit.runtime.session_manager import SessionInfo, SessionStorage
+from streamlit.runtime.stats import CacheStat, CacheStatsProvider
 
+if TYPE_CHECKING:
+    # The `list` method of MemorySessionStorage shadows the builtin.
+    import builtins
 
-class MemorySessionStorage(SessionStorage):
+_LOGGER: Final = get_logger(__name__)
+
+# A rough estimate of the memory used by an AppSession apart from its Session
+# State: its ScriptRunner, message queue, fragment storage, file watchers, etc.
+_SESSION_OVERHEAD_BYTES: Final = 64 * 1024
+
+# The session's script may still be stopping, and changing its Session State,
+# while its size is estimated. A failed estimate is retried a few times, after
+# giving the script time to stop.
+_MAX_SIZE_ESTIMATE_ATTEMPTS: Final = 3
+_SIZE_ESTIMATE_RETRY_DELAY_SECONDS: Final = 1.0
+
+
+def _estimate_session_size(session_info: SessionInfo) -> int:
+    """Estimate the memory used by a session, in bytes.
+
+    This walks the session's whole Session State, so it's slow for large states
+    and shouldn't be called on the eventloop thread.
+    """
+    session_state_stats = session_info.session.session_state.get_stats()
+    return _SESSION_OVERHEAD_BYTES + sum(
+        stat.byte_length for stat in session_state_stats
+    )
+
+
+class SessionStorageStats(NamedTuple):
+    """Counters of a MemorySessionStorage, for tuning its size.
+
+    Properties
+    ----------
+    evictions : int
+        The number of sessions removed before their TTL expired, to make room
+        for other sessions.
+    """
+
+    evictions: int
+
+
+class _SessionCache(TTLCache):  # type: ignore[misc]
+    """A TTLCache that counts the entries it evicts to make room."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.evictions = 0
+
+    def popitem(self) -> tuple[str, SessionInfo]:
+        # Only called when the cache is full, after expired entries were
+        # already removed.
+        item: tuple[str, SessionInfo] = super().popitem()
+        self.evictions += 1
+        return item
+
+
+class MemorySessionStorage(SessionStorage, CacheStatsProvider):
     """A SessionStorage that stores sessions in memory.
 
-    At most maxsize sessions are stored with a TTL of ttl seconds. This class is really
-    just a thin wrapper around cachetools.TTLCache that complies with the SessionStorage
+    At most maxsize sessions, or sessions using at most max_memory_bytes in
+    total, are stored with a TTL of ttl seconds. This class is really just a thin
+    wrapper around cachetools.TTLCache that complies with the SessionStorage
     protocol.
+
+    With max_memory_bytes set, the size of a session is estimated once when
+    it's saved, on a thread of the eventloop's default executor. Until the
+    estimate is done, the session counts as _SESSION_OVERHEAD_BYTES. Without
+    it, sessions aren't sized at all, and always count as
+    _SESSION_OVERHEAD_BYTES in the stats.
     """
 
     # NOTE: The defaults for maxsize and ttl are chosen arbitrarily for now. These
@@ -39,6 +105,7 @@ class MemorySessionStorage(SessionStorage):
         self,
         maxsize: int = 128,
         ttl_seconds: int = 2 * 60,  # 2 minutes
+        max_memory_bytes: int | None = None,
     ) -> None:
         """Instantiate a new MemorySessionStorage.
 
@@ -55,20 +122,140 @@ class MemorySessionStorage(SessionStorage):
             The time in seconds for an entry added to a MemorySessionStorage to live.
             After this amount of time has passed for a given entry, it becomes
             inaccessible and will be removed eventually.
+
+        max_memory_bytes
+            If set, the sessions stored in this MemorySessionStorage may use at
+            most this much memory in total, as estimated when they're saved,
+            and maxsize is ignored. Entries are removed in the same way as when
+            exceeding maxsize.
         """
+        self._budgeted = max_memory_bytes is not None
+        # The estimated sizes of the stored sessions, by session ID.
+        self._session_sizes: dict[str, int] = {}
+        self._cache: _SessionCache
+        if max_memory_bytes is not None:
+            self._cache = _SessionCache(
+                maxsize=max_memory_bytes,
+                ttl=ttl_seconds,
+                getsizeof=self._get_session_size,
+            )
+        else:
+            self._cache = _SessionCache(maxsize=maxsize, ttl=ttl_seconds)
 
-        self._cache: MutableMapping[str, SessionInfo] = TTLCache(
-            maxsize=maxsize, ttl=ttl_seconds
-        )
+    @property
+    def stats(self) -> SessionStorageStats:
+        return SessionStorageStats(evictions=self._cache.evictions)
 
     def get(self, session_id: str) -> SessionInfo | None:
-        return self._cache.get(session_id, None)
+        session_info: SessionInfo | None = self._cache.get(session_id, None)
+        return session_info
 
     def save(self, session_info: SessionInfo) -> None:
-        self._cache[session_info.session.id] = session_info
+        self._session_sizes.pop(session_info.session.id, None)
+        self._store(session_info)
+        if not self._budgeted:
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Not called on an eventloop thread, so there's no loop to hand the
+            # result back to.
+            self._on_size_estimated(session_info, _estimate_session_size(session_info))
+            return
+
+        self._estimate_size(loop, session_info, attempt=1)
+
+    def _estimate_size(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        session_info: SessionInfo,
+        attempt: int,
+    ) -> None:
+        if session_info.session.id not in self._cache:
+            # The session was deleted, evicted or expired in the meantime.
+            return
+
+        future = loop.run_in_executor(None, _estimate_session_size, session_info)
+        future.add_done_callback(
+            lambda f: self._on_size_estimate_done(loop, session_info, attempt, f)
+        )
+
+    def _store(self, session_info: SessionInfo) -> None:
+        try:
+            self._cache[session_info.session.id] = session_info
+        except ValueError:
+            # The session alone uses more than max_memory_bytes, so it's
+            # evicted right away.
+            self._cache.evictions += 1
+            _LOGGER.debug(
+                "Session %s is too large to be stored", session_info.session.id
+            )
+
+    def _get_session_size(self, session_info: SessionInfo) -> int:
+        return self._session_sizes.get(session_info.session.id, _SESSION_OVERHEAD_BYTES)
+
+    def _on_size_estimate_done(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        session_info: SessionInfo,
+        attempt: int,
+        future: asyncio.Future[int],
+    ) -> None:
+        if future.cancelled():
+            return
+
+        exception = future.exception()
+        if exception is None:
+            self._on_size_estimated(session_info, future.result())
+        elif attempt < _MAX_SIZE_ESTIMATE_ATTEMPTS:
+            # E.g. the session's script was still changing its Session State.
+            loop.call_later(
+                _SIZE_ESTIMATE_RETRY_DELAY_SECONDS,
+                self._estimate_size,
+                loop,
+                session_info,
+                attempt + 1,
+            )
+        else:
+            _LOGGER.warning(
+                "Failed to estimate the size of session %s, so it counts as %s "
+                "bytes towards the memory budget",
+                session_info.session.id,
+                _SESSION_OVERHEAD_BYTES,
+                exc_info=exception,
+            )
+
+    def _on_size_estimated(self, session_info: SessionInfo, size: int) -> None:
+        session_id = session_info.session.id
+        if session_id not in self._cache:
+            # The session was deleted, evicted or expired in the meantime.
+            return
+
+        # Drop the sizes of sessions that are gone.
+        self._session_sizes = {
+            other_id: other_size
+            for other_id, other_size in self._session_sizes.items()
+            if other_id in self._cache
+        }
+        self._session_sizes[session_id] = size
+        # Store the session again so that the cache accounts for its size. This
+        # may evict other sessions, or the session itself. (It's removed first,
+        # since TTLCache would otherwise count its old size too when making
+        # room.)
+        del self._cache[session_id]
+        self._store(session_info)
 
     def delete(self, session_id: str) -> None:
         del self._cache[session_id]
+        self._session_sizes.pop(session_id, None)
 
     def list(self) -> list[SessionInfo]:
         return list(self._cache.values())
+
+    def get_stats(self) -> builtins.list[CacheStat]:
+        if self._budgeted:
+            byte_length = int(self._cache.currsize)
+        else:
+            byte_length = len(self._cache) * _SESSION_OVERHEAD_BYTES
+        return [CacheStat("session_storage", "", byte_length)]
@@ -0,0 +1,147 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, replace
+from typing import Callable, Final
+
+from streamlit.logger import get_logger
+from streamlit.runtime.scriptrunner_utils.script_requests import (
+    RerunData,
+    coalesce_widget_states,
+)
+
+_LOGGER: Final = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class RerunDebouncerStats:
+    """A snapshot of a RerunDebouncer's counters."""
+
+    # Number of rerun requests passed to the debouncer.
+    num_requests: int = 0
+    # Number of reruns the debouncer let through.
+    num_runs: int = 0
+    # Number of rerun requests that were merged into a later one instead of
+    # starting a run of their own.
+    num_coalesced: int = 0
+
+
+class RerunDebouncer:
+    """Collapses bursts of rerun requests from a session into fewer runs.
+
+    The first rerun request after a quiet period is let through right away.
+    Full-script reruns requested within `window` seconds of the last run that
+    was let through are held back, and merged with each other, until the window
+    ends. Then the merged rerun is let through and a new window starts.
+
+    Merging keeps the latest widget states, but also keeps the trigger values
+    (e.g. button clicks) of the merged requests, like ScriptRequests does when it
+    coalesces rerun requests to a running script.
+
+    Fragment reruns are never held back, since they are cheap and have their own
+    queue in the ScriptRunner. A held rerun is let through before them, so that
+    the requests stay in order.
+
+    RerunDebouncer is not thread-safe - it should only be used from the
+    Runtime's eventloop thread.
+    """
+
+    def __init__(self, window: float, run: Callable[[RerunData], None]) -> None:
+        """Create a RerunDebouncer.
+
+        Parameters
+        ----------
+        window
+            The number of seconds after a run during which further full-script
+            reruns are held back.
+        run
+            Called with the RerunData of each rerun that is let through.
+        """
+        if window <= 0:
+            raise ValueError("window must be positive")
+        self._window = window
+        self._run = run
+        self._pending: RerunData | None = None
+        self._timer_handle: asyncio.TimerHandle | None = None
+        self._stats = RerunDebouncerStats()
+
+    def request_rerun(self, rerun_data: RerunData) -> None:
+        """Let the rerun through now, or hold it back until the current window
+        ends.
+        """
+        self._stats = replace(self._stats, num_requests=self._stats.num_requests + 1)
+
+        if rerun_data.fragment_id:
+            self._flush()
+            self._let_through(rerun_data, start_window=False)
+            return
+
+        if self._timer_handle is None:
+            self._let_through(rerun_data, start_window=True)
+            return
+
+        if self._pending is None:
+            self._pending = rerun_data
+            return
+
+        self._stats = replace(self._stats, num_coalesced=self._stats.num_coalesced + 1)
+        self._pending = replace(
+            rerun_data,
+            widget_states=coalesce_widget_states(
+                self._pending.widget_states, rerun_data.widget_states
+            ),
+        )
+
+    def cancel(self) -> None:
+        """Drop the held rerun, if any, and stop the current window."""
+        self._pending = None
+        if self._timer_handle is not None:
+            self._timer_handle.cancel()
+            self._timer_handle = None
+
+    @property
+    def has_pending_rerun(self) -> bool:
+        """True if a rerun is held back until the current window ends."""
+        return self._pending is not None
+
+    @property
+    def stats(self) -> RerunDebouncerStats:
+        return self._stats
+
+    def _flush(self) -> None:
+        if self._pending is None:
+            return
+        rerun_data = self._pending
+        self._pending = None
+        self._let_through(rerun_data, start_window=False)
+
+    def _let_through(self, rerun_data: RerunData, start_window: bool) -> None:
+        if start_window:
+            self._timer_handle = asyncio.get_running_loop().call_later(
+                self._window, self._on_window_end
+            )
+        self._stats = replace(self._stats, num_runs=self._stats.num_runs + 1)
+        self._run(rerun_data)
+
+    def _on_window_end(self) -> None:
+        self._timer_handle = None
+        rerun_data = self._pending
+        if rerun_data is None:
+            return
+        self._pending = None
+        _LOGGER.debug("Letting through a debounced rerun.")
+        self._let_through(rerun_data, start_window=True)
@@ -38,18 +38,29 @@ from streamlit.runtime.forward_msg_cache import (
     create_reference_msg,
     populate_hash_if_needed,
 )
+from streamlit.runtime.forward_msg_scheduler import ForwardMsgScheduler
 from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
 from streamlit.runtime.memory_session_storage import MemorySessionStorage
 from streamlit.runtime.runtime_util import is_cacheable_msg
 from streamlit.runtime.script_data import ScriptData
+from streamlit.runtime.script_run_admission import ScriptRunAdmissionController
 from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.runtime.scriptrunner.script_process_pool import ScriptProcessPool
+from streamlit.runtime.scriptrunner.script_runner_pool import ScriptRunnerPool
 from streamlit.runtime.session_manager import (
     ActiveSessionInfo,
+    FlowControlledSessionClient,
     SessionClient,
     SessionClientDisconnectedError,
+    SessionClientStatProvider,
     SessionManager,
     SessionStorage,
 )
+from streamlit.runtime.session_state_storage import (
+    SessionStatePersister,
+    SessionStateStorage,
+)
 from streamlit.runtime.state import (
     SCRIPT_RUN_WITHOUT_ERRORS_KEY,
     SessionStateStatProvider,
@@ -69,6 +80,70 @@ SCRIPT_RUN_CHECK_TIMEOUT: Final = 60
 
 _LOGGER: Final = get_logger(__name__)
 
+# The min number of seconds the Runtime waits before it continues sending
+# messages that were held back by the flush budgets, so that it never spins
+# without waiting when the flush coalesce window is 0.
+_MIN_HELD_BACK_FLUSH_DELAY: Final = 0.005
+
+
+def _create_forward_msg_scheduler() -> ForwardMsgScheduler:
+    return ForwardMsgScheduler(
+        byte_budget_per_session=config.get_option("server.flushByteBudgetPerSession"),
+        time_budget=config.get_option("server.flushTimeBudgetMs") / 1000,
+    )
+
+
+def _create_script_runner_pool() -> ScriptRunnerPool | None:
+    max_workers = config.get_option("runner.maxConcurrentScriptRuns")
+    if max_workers <= 0:
+        return None
+    return ScriptRunnerPool(max_workers)
+
+
+def _create_script_process_pool(
+    main_script_path: str,
+    media_file_storage: MediaFileStorage,
+    uploaded_file_mgr: UploadedFileManager,
+) -> ScriptProcessPool | None:
+    num_processes = config.get_option("runner.numScriptProcesses")
+    if num_processes <= 0:
+        return None
+    if not isinstance(media_file_storage, MemoryMediaFileStorage):
+        _LOGGER.warning(
+            "runner.numScriptProcesses requires the default media file storage. "
+            "Running scripts in the server process instead."
+        )
+        return None
+    return ScriptProcessPool(
+        num_processes, main_script_path, media_file_storage, uploaded_file_mgr
+    )
+
+
+def _create_script_run_admission_controller() -> ScriptRunAdmissionController | None:
+    max_running = config.get_option("runner.admissionMaxRunningSessions")
+    if max_running <= 0:
+        return None
+    return ScriptRunAdmissionController(
+        max_running=max_running,
+        queue_timeout=config.get_option("runner.admissionQueueTimeout"),
+    )
+
+
+def _create_session_state_persister(
+    storage: SessionStateStorage | None,
+) -> SessionStatePersister | None:
+    if storage is None:
+        return None
+    return SessionStatePersister(
+        storage, config.get_option("server.sessionStatePersistenceCodec")
+    )
+
+
+def _is_write_buffer_full(client: SessionClient) -> bool:
+    return (
+        isinstance(client, FlowControlledSessionClient) and client.is_write_buffer_full
+    )
+
 
 class RuntimeStoppedError(Exception):
     """Raised by operations on a Runtime instance that is stopped."""
@@ -107,6 +182,11 @@ class RuntimeConfig:
     # The SessionStorage instance for the SessionManager to use.
     session_storage: SessionStorage = field(default_factory=MemorySessionStorage)
 
+    # The storage that snapshots of sessions' Session State are written to, so
+    # that it can be restored when a client reconnects after its session was
+    # cleaned up or the server restarted. If None, Session State isn't persisted.
+    session_state_storage: SessionStateStorage | None = None
+
     # True if the command used to start Streamlit was `streamlit hello`.
     is_hello: bool = False
 
@@ -206,6 +286,18 @@ class Runtime:
         self._media_file_mgr = MediaFileManager(storage=config.media_file_storage)
         self._cache_storage_manager = config.cache_storage_manager
         self._script_cache = ScriptCache()
+        self._msg_scheduler = _create_forward_msg_scheduler()
+        self._script_runner_pool = _create_script_runner_pool()
+        self._script_process_pool = _create_script_process_pool(
+            config.script_path, config.media_file_storage, self._uploaded_file_mgr
+        )
+        self._script_run_admission_controller = (
+            _create_script_run_admission_controller()
+        )
+
+        self._session_state_persister = _create_session_state_persister(
+            config.session_state_storage
+        )
 
         self._session_mgr = config.session_manager_class(
             session_storage=config.session_storage,
@@ -218,6 +310,8 @@ class Runtime:
         self._stats_mgr.register_provider(get_data_cache_stats_provider())
         self._stats_mgr.register_provider(get_resource_cache_stats_provider())
         self._stats_mgr.register_provider(self._message_cache)
+        self._stats_mgr.register_provider(self._msg_scheduler)
+        self._stats_mgr.register_provider(SessionClientStatProvider(self._session_mgr))
         self._stats_mgr.register_provider(self._uploaded_file_mgr)
         self._stats_mgr.register_provider(SessionStateStatProvider(self._session_mgr))
 
@@ -249,6 +343,38 @@ class Runtime:
     def stats_mgr(self) -> StatsManager:
         return self._stats_mgr
 
+    @property
+    def script_cache(self) -> ScriptCache:
+        return self._script_cache
+
+    @property
+    def script_runner_pool(self) -> ScriptRunnerPool | None:
+        """The pool that runs all sessions' scripts, or None if each
+        ScriptRunner starts its own thread.
+        """
+        return self._script_runner_pool
+
+    @property
+    def script_process_pool(self) -> ScriptProcessPool | None:
+        """The pool of worker processes that run all sessions' scripts, or None
+        if scripts run in the server process.
+        """
+        return self._script_process_pool
+
+    @property
+    def script_run_admission_controller(self) -> ScriptRunAdmissionController | None:
+        """Limits the number of sessions running their script at the same time,
+        or None if there is no limit.
+        """
+        return self._script_run_admission_controller
+
+    @property
+    def session_state_persister(self) -> SessionStatePersister | None:
+        """Writes snapshots of sessions' Session State and restores them, or
+        None if Session State isn't persisted.
+        """
+        return self._session_state_persister
+
     @property
     def stopped(self) -> Awaitable[None]:
         """A Future that completes when the Runtime's run loop has exited."""
@@ -388,6 +514,18 @@ class Runtime:
             existing_session_id=existing_session_id,
             session_id_override=session_id_override,
         )
+        if (
+            existing_session_id is not None
+            and session_id != existing_session_id
+            and self._session_state_persister is not None
+        ):
+            # The client's previous session is gone, e.g. because it expired or
+            # the server restarted, so restore its last snapshot. This reads
+            # from the storage, so it's done on the script thread, at the start
+            # of the new session's first script run.
+            self._session_state_persister.schedule_restore(
+                existing_session_id, session_id
+            )
         self._set_state(RuntimeState.ONE_OR_MORE_SESSIONS_CONNECTED)
         self._get_async_objs().has_connection.set()
 
@@ -434,10 +572,14 @@ class Runtime:
         -----
         Threading: UNSAFE. Must be called on the eventloop thread.
         """
+        if self._session_state_persister is not None:
+            self._session_state_persister.cancel_restore(session_id)
+
         session_info = self._session_mgr.get_session_info(session_id)
         if session_info:
             self._message_cache.remove_refs_for_session(session_info.session)
             self._session_mgr.close_session(session_id)
+        self._msg_scheduler.remove_session(session_id)
         self._on_session_disconnected()
 
     def disconnect_session(self, session_id: str) -> None:
@@ -470,6 +612,7 @@ class Runtime:
             # that will be useful once the browser tab reconnects.
             self._message_cache.remove_refs_for_session(session_info.session)
             self._session_mgr.disconnect_session(session_id)
+        self._msg_scheduler.remove_session(session_id)
         self._on_session_disconnected()
 
     def handle_backmsg(self, session_id: str, msg: BackMsg) -> None:
@@ -529,6 +672,18 @@ class Runtime:
 
         session_info.session.handle_backmsg_exception(exc)
 
+    def notify_write_buffer_drained(self) -> None:
+        """Tell the Runtime that a FlowControlledSessionClient's write buffer is
+        no longer full, so that the messages held back for it are sent.
+
+        Notes
+        -----
+        Threading: SAFE. May be called on any thread.
+        """
+        if self._state in (RuntimeState.STOPPING, RuntimeState.STOPPED):
+            return
+        self._enqueued_some_message()
+
     @property
     async def is_ready_for_browser_connection(self) -> tuple[bool, str]:
         if self._state not in (
@@ -598,6 +753,7 @@ class Runtime:
         """
 
         async_objs = self._get_async_objs()
+        coalesce_window = config.get_option("server.flushCoalesceWindowMs") / 1000
 
         try:
             if self._state == RuntimeState.INITIAL:
@@ -630,21 +786,60 @@ class Runtime:
                     async_objs.need_send_data.clear()
 
                     for active_session_info in self._session_mgr.list_active_sessions():
-                        msg_list = active_session_info.session.flush_browser_queue()
+                        if _is_write_buffer_full(active_session_info.client):
+                            # Leave the messages in the session's ForwardMsgQueue
+                            # while its client isn't keeping up, so that newer
+                            # Deltas replace the outdated ones they supersede.
+                            # The client calls notify_write_buffer_drained once
+                            # it can accept them again.
+                            continue
+
+                        self._msg_scheduler.enqueue(
+                            active_session_info.session.id,
+                            active_session_info.session.flush_browser_queue(),
+                        )
+
+                    for session_id, msg_list in self._msg_scheduler.next_round(
+                        self._can_send_to_session
+                    ):
+                        active_session_info = self._session_mgr.get_active_session_info(
+                            session_id
+                        )
+                        if active_session_info is None:
+                            self._msg_scheduler.remove_session(session_id)
+                            continue
+
+                        # All messages from one flush are written without
+                        # yielding in between, which allows clients that support
+                        # batch framing to send them in a single websocket frame.
                         for msg in msg_list:
                             try:
                                 self._send_message(active_session_info, msg)
                             except SessionClientDisconnectedError:
-                                self._session_mgr.disconnect_session(
-                                    active_session_info.session.id
-                                )
-
-                            # Yield for a tick after sending a message.
-                            await asyncio.sleep(0)
-
-                    # Yield for a few milliseconds between session message
-                    # flushing.
-                    await asyncio.sleep(0.01)
+                                self._msg_scheduler.remove_session(session_id)
+                                self._session_mgr.disconnect_session(session_id)
+                                break
+
+                        # Yield for a tick after flushing a session's messages.
+                        await asyncio.sleep(0)
+
+                    if self._msg_scheduler.has_pending(self._can_send_to_session):
+                        # Some messages were held back by the flush budgets. Make
+                        # sure we come back for them, after giving the eventloop
+                        # a real break. (Messages held back because a client
+                        # isn't keeping up are sent once it calls
+                        # notify_write_buffer_drained.)
+                        async_objs.need_send_data.set()
+                        await asyncio.sleep(
+                            max(coalesce_window, _MIN_HELD_BACK_FLUSH_DELAY)
+                        )
+                    elif async_objs.need_send_data.is_set():
+                        # More messages were enqueued while we were flushing, so
+                        # sessions are busy producing them. Wait a few
+                        # milliseconds to send them in fewer, larger flushes.
+                        # Otherwise, we go straight back to waiting so that the
+                        # first message after an idle period is sent immediately.
+                        await asyncio.sleep(coalesce_window)
                 else:
                     # Break out of the thread loop if we encounter any other state.
                     break
@@ -671,6 +866,11 @@ class Runtime:
                 # is no longer so tightly coupled to a browser tab.
                 self._session_mgr.close_session(session_info.session.id)
 
+            if self._script_runner_pool is not None:
+                self._script_runner_pool.shutdown()
+            if self._script_process_pool is not None:
+                self._script_process_pool.shutdown()
+
             self._set_state(RuntimeState.STOPPED)
             async_objs.stopped.set_result(None)
 
@@ -683,6 +883,18 @@ Please report this bug at https://github.com/streamlit/streamlit/issues.
 """
             )
 
+    def _can_send_to_session(self, session_id: str) -> bool:
+        """False if the session's client can't currently accept more messages.
+
+        Notes
+        -----
+        Threading: UNSAFE. Must be called on the eventloop thread.
+        """
+        session_info = self._session_mgr.get_active_session_info(session_id)
+        if session_info is None:
+            return True
+        return not _is_write_buffer_full(session_info.client)
+
     def _send_message(self, session_info: ActiveSessionInfo, msg: ForwardMsg) -> None:
         """Send a message to a client.
 
@@ -16,7 +16,8 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any
+import struct
+from typing import TYPE_CHECKING, Any, Final
 
 from streamlit import config
 from streamlit.errors import MarkdownFormattedException, StreamlitAPIException
@@ -88,6 +89,40 @@ def serialize_forward_msg(msg: ForwardMsg) -> bytes:
     return msg_str
 
 
+# Each ForwardMsg in a batch frame is prefixed with its length as a big-endian
+# unsigned 32-bit integer.
+_BATCH_LENGTH_PREFIX: Final = struct.Struct(">I")
+
+
+def pack_forward_msg_batch(serialized_msgs: list[bytes]) -> bytes:
+    """Pack already-serialized ForwardMsgs into a single batch frame.
+
+    The frame is the concatenation of each message's length prefix followed by
+    the message bytes themselves.
+    """
+    return b"".join(
+        _BATCH_LENGTH_PREFIX.pack(len(msg_bytes)) + msg_bytes
+        for msg_bytes in serialized_msgs
+    )
+
+
+def unpack_forward_msg_batch(frame: bytes) -> list[bytes]:
+    """Split a batch frame created by pack_forward_msg_batch into the serialized
+    ForwardMsgs it contains.
+    """
+    serialized_msgs: list[bytes] = []
+    view = memoryview(frame)
+    offset = 0
+    while offset < len(view):
+        (length,) = _BATCH_LENGTH_PREFIX.unpack_from(view, offset)
+        offset += _BATCH_LENGTH_PREFIX.size
+        if offset + length > len(view):
+            raise ValueError("Truncated ForwardMsg batch frame.")
+        serialized_msgs.append(bytes(view[offset : offset + length]))
+        offset += length
+    return serialized_msgs
+
+
 # This needs to be initialized lazily to avoid calling config.get_option() and
 # thus initializing config options when this file is first imported.
 _max_message_size_bytes: int | None = None
@@ -0,0 +1,167 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Callable, Final
+
+from streamlit.logger import get_logger
+
+_LOGGER: Final = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class ScriptRunAdmissionStats:
+    """A snapshot of a ScriptRunAdmissionController's gauges and counters."""
+
+    # Number of sessions that are currently admitted to run their script.
+    num_running: int
+    # Number of sessions waiting to be admitted.
+    num_queued: int
+    # Total number of rerun requests that were dropped because they waited for
+    # longer than the queue timeout.
+    num_shed: int
+
+
+@dataclass
+class _QueuedRun:
+    on_admitted: Callable[[], None]
+    on_shed: Callable[[], None]
+    timeout_handle: asyncio.TimerHandle
+
+
+class ScriptRunAdmissionController:
+    """Limits the number of sessions that run their script at the same time.
+
+    A session that requests a rerun while the limit is reached waits in a FIFO
+    queue until another session's script stops. Further rerun requests from a
+    queued session replace its queued request (keeping its place in the queue),
+    since only the latest one matters. A request that waits for longer than the
+    queue timeout is dropped, and the session is told to retry later.
+
+    A session that is already running its script is never queued, so that
+    reruns requested while a script runs (e.g. by widget interactions) are
+    handled as usual.
+
+    ScriptRunAdmissionController is not thread-safe - it should only be used from
+    the Runtime's eventloop thread.
+    """
+
+    def __init__(self, max_running: int, queue_timeout: float) -> None:
+        """Create a ScriptRunAdmissionController.
+
+        Parameters
+        ----------
+        max_running
+            The max number of sessions that run their script at the same time.
+        queue_timeout
+            The number of seconds after which a queued rerun request is dropped.
+        """
+        if max_running < 1:
+            raise ValueError("max_running must be at least 1")
+        self._max_running = max_running
+        self._queue_timeout = queue_timeout
+        self._running: set[str] = set()
+        # Insertion order is the admission order.
+        self._queued: dict[str, _QueuedRun] = {}
+        self._num_shed = 0
+
+    @property
+    def queue_timeout(self) -> float:
+        return self._queue_timeout
+
+    def request_run(
+        self,
+        session_id: str,
+        on_admitted: Callable[[], None],
+        on_shed: Callable[[], None],
+    ) -> None:
+        """Request that a session may run its script.
+
+        Parameters
+        ----------
+        session_id
+            The session's ID.
+        on_admitted
+            Called (possibly right away) once the session may run its script.
+        on_shed
+            Called instead of `on_admitted` if the request is dropped.
+        """
+        if session_id in self._running:
+            on_admitted()
+            return
+
+        queued = self._queued.get(session_id)
+        if queued is not None:
+            # Coalesce with the already queued request. The replaced request is
+            # neither admitted nor shed, since the new one supersedes it.
+            queued.on_admitted = on_admitted
+            queued.on_shed = on_shed
+            return
+
+        if len(self._running) < self._max_running and not self._queued:
+            self._running.add(session_id)
+            on_admitted()
+            return
+
+        timeout_handle = asyncio.get_running_loop().call_later(
+            self._queue_timeout, self._shed, session_id
+        )
+        self._queued[session_id] = _QueuedRun(on_admitted, on_shed, timeout_handle)
+
+    def release(self, session_id: str) -> None:
+        """Release the session's admission when its script stops, or drop its
+        queued request when it shuts down.
+        """
+        queued = self._queued.pop(session_id, None)
+        if queued is not None:
+            queued.timeout_handle.cancel()
+
+        if session_id in self._running:
+            self._running.remove(session_id)
+            self._admit_queued()
+
+    def is_queued(self, session_id: str) -> bool:
+        """True if the session has a rerun request waiting for admission."""
+        return session_id in self._queued
+
+    def _admit_queued(self) -> None:
+        while self._queued and len(self._running) < self._max_running:
+            session_id = next(iter(self._queued))
+            queued = self._queued.pop(session_id)
+            queued.timeout_handle.cancel()
+            self._running.add(session_id)
+            queued.on_admitted()
+
+    def _shed(self, session_id: str) -> None:
+        queued = self._queued.pop(session_id, None)
+        if queued is None:
+            return
+        self._num_shed += 1
+        _LOGGER.debug(
+            "Dropping rerun request of session %s after waiting %s seconds.",
+            session_id,
+            self._queue_timeout,
+        )
+        queued.on_shed()
+
+    @property
+    def stats(self) -> ScriptRunAdmissionStats:
+        return ScriptRunAdmissionStats(
+            num_running=len(self._running),
+            num_queued=len(self._queued),
+            num_shed=self._num_shed,
+        )
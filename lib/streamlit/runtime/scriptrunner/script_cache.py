@@ -14,32 +14,71 @@
 
 from __future__ import annotations
 
+import contextlib
+import importlib.util
+import marshal
 import os.path
+import sys
+import tempfile
 import threading
-from typing import Any
+from typing import Any, Final
 
 from streamlit import config
+from streamlit.file_util import get_streamlit_file_path
+from streamlit.logger import get_logger
 from streamlit.runtime.scriptrunner import magic
 from streamlit.source_util import open_python_file
+from streamlit.util import calc_md5
+from streamlit.version import STREAMLIT_VERSION_STRING
+
+_LOGGER: Final = get_logger(__name__)
+
+_BYTECODE_CACHE_DIR_NAME: Final = "bytecode_cache"
+_BYTECODE_FILE_EXTENSION: Final = "code"
+
+
+def get_bytecode_cache_folder_path() -> str:
+    return get_streamlit_file_path(_BYTECODE_CACHE_DIR_NAME)
 
 
 class ScriptCache:
-    """Thread-safe cache of Python script bytecode."""
+    """Thread-safe cache of Python script bytecode.
+
+    If `runner.persistBytecodeCache` is set, compiled scripts are also written
+    to disk (like `__pycache__`), so that new processes don't have to
+    magic-transform and compile them again. Disk entries are keyed by the
+    script's path and source, the Python and Streamlit versions and the magic
+    options.
+    """
 
     def __init__(self):
         # Mapping of script_path: bytecode
         self._cache: dict[str, Any] = {}
+        # Protects _cache and _path_locks. Scripts are compiled while holding
+        # only their path's lock, so that different scripts compile in parallel.
         self._lock = threading.Lock()
+        self._path_locks: dict[str, threading.Lock] = {}
+        # Incremented when entries are removed, so that bytecode compiled from
+        # a file that changed in the meantime isn't cached.
+        self._generation = 0
+
+    def clear(self, script_path: str | None = None) -> None:
+        """Remove the entry for the given script from the cache, or all entries
+        if no script is given.
 
-    def clear(self) -> None:
-        """Remove all entries from the cache.
+        Entries on disk are keyed by the script's source, so they don't need to
+        be removed.
 
         Notes
         -----
         Threading: SAFE. May be called on any thread.
         """
         with self._lock:
-            self._cache.clear()
+            self._generation += 1
+            if script_path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(os.path.abspath(script_path), None)
 
     def get_bytecode(self, script_path: str) -> Any:
         """Return the bytecode for the Python script at the given path.
@@ -63,27 +102,120 @@ class ScriptCache:
             if bytecode is not None:
                 # Fast path: the code is already cached.
                 return bytecode
+            path_lock = self._path_locks.setdefault(script_path, threading.Lock())
 
-            # Populate the cache
-            with open_python_file(script_path) as f:
-                filebody = f.read()
+        with path_lock:
+            with self._lock:
+                bytecode = self._cache.get(script_path, None)
+                if bytecode is not None:
+                    # Another thread compiled the script while we waited.
+                    return bytecode
+                generation = self._generation
 
-            if config.get_option("runner.magicEnabled"):
-                filebody = magic.add_magic(filebody, script_path)
+            bytecode = self._load_bytecode(script_path)
 
-            bytecode = compile(  # type: ignore
-                filebody,
-                # Pass in the file path so it can show up in exceptions.
-                script_path,
-                # We're compiling entire blocks of Python, so we need "exec"
-                # mode (as opposed to "eval" or "single").
-                mode="exec",
-                # Don't inherit any flags or "future" statements.
-                flags=0,
-                dont_inherit=1,
-                # Use the default optimization options.
-                optimize=-1,
-            )
-
-            self._cache[script_path] = bytecode
+            with self._lock:
+                if generation == self._generation:
+                    self._cache[script_path] = bytecode
             return bytecode
+
+    def _load_bytecode(self, script_path: str) -> Any:
+        with open_python_file(script_path) as f:
+            filebody = f.read()
+
+        magic_enabled = bool(config.get_option("runner.magicEnabled"))
+        persist = bool(config.get_option("runner.persistBytecodeCache"))
+        if persist:
+            cache_file_path = _get_cache_file_path(script_path, filebody, magic_enabled)
+            bytecode = _read_cache_file(cache_file_path)
+            if bytecode is not None:
+                return bytecode
+
+        if magic_enabled:
+            filebody = magic.add_magic(filebody, script_path)
+
+        bytecode = compile(  # type: ignore
+            filebody,
+            # Pass in the file path so it can show up in exceptions.
+            script_path,
+            # We're compiling entire blocks of Python, so we need "exec"
+            # mode (as opposed to "eval" or "single").
+            mode="exec",
+            # Don't inherit any flags or "future" statements.
+            flags=0,
+            dont_inherit=1,
+            # Use the default optimization options.
+            optimize=-1,
+        )
+
+        if persist:
+            _write_cache_file(cache_file_path, bytecode)
+        return bytecode
+
+
+def _get_cache_file_path(script_path: str, filebody: str, magic_enabled: bool) -> str:
+    """Return the path of the disk cache file for the given script source.
+
+    The file name starts with the hash of the script's path, so that the stale
+    files of a script can be found and removed.
+    """
+    source_key = calc_md5(
+        "\0".join(
+            [
+                importlib.util.MAGIC_NUMBER.hex(),
+                sys.implementation.cache_tag or "",
+                STREAMLIT_VERSION_STRING,
+                # The options that affect magic.add_magic.
+                str(magic_enabled),
+                str(config.get_option("magic.displayLastExprIfNoSemicolon")),
+                str(config.get_option("magic.displayRootDocString")),
+                filebody,
+            ]
+        )
+    )
+    return os.path.join(
+        get_bytecode_cache_folder_path(),
+        f"{calc_md5(script_path)}-{source_key}.{_BYTECODE_FILE_EXTENSION}",
+    )
+
+
+def _read_cache_file(cache_file_path: str) -> Any:
+    """Return the bytecode stored in the given file, or None if it doesn't
+    exist or can't be read.
+    """
+    try:
+        with open(cache_file_path, "rb") as f:
+            return marshal.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as ex:
+        _LOGGER.debug("Unable to read bytecode cache file %s: %s", cache_file_path, ex)
+        return None
+
+
+def _write_cache_file(cache_file_path: str, bytecode: Any) -> None:
+    """Write bytecode to the given file, and remove the stale files of the same
+    script. Errors are logged and otherwise ignored.
+    """
+    cache_dir, file_name = os.path.split(cache_file_path)
+    path_prefix = file_name.split("-", 1)[0] + "-"
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        for other_file_name in os.listdir(cache_dir):
+            if other_file_name.startswith(path_prefix) and other_file_name != file_name:
+                # Another process may have removed the file already.
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(os.path.join(cache_dir, other_file_name))
+
+        # Write to a temporary file first, so that other processes never read
+        # a partially written file.
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                marshal.dump(bytecode, f)
+            os.replace(temp_path, cache_file_path)
+        except BaseException:
+            os.remove(temp_path)
+            raise
+    except Exception as ex:
+        _LOGGER.debug("Unable to write bytecode cache file %s: %s", cache_file_path, ex)
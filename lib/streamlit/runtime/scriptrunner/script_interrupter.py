@@ -0,0 +1,112 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import os
+import sys
+import time
+from contextlib import contextmanager
+from types import FrameType
+from typing import Any, Callable, Final, Iterator
+
+from streamlit.logger import get_logger
+
+_LOGGER: Final = get_logger(__name__)
+
+# Streamlit's own code is never interrupted by the tracer. It only yields at the
+# usual yield points.
+_STREAMLIT_DIR: Final = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))), ""
+)
+
+_TraceFunction = Callable[[FrameType, str, Any], Any]
+
+
+class ScriptInterrupter:
+    """Lets a ScriptRunner interrupt pure-Python code in its script.
+
+    Normally, a script only handles rerun and stop requests when it calls a
+    Streamlit command, so a long loop in the script keeps running after its
+    results have become obsolete. While `trace()` is active, a trace function
+    calls `check` at most every `check_interval` seconds from code in the app's
+    own source files, which can then raise a RerunException or StopException.
+
+    Only frames of files in `app_dir` are traced, excluding installed packages
+    and Streamlit itself, so the script is never interrupted in the middle of
+    library code. Code that runs in C extensions (e.g. a long pandas operation)
+    can't be interrupted this way either. Long-running helpers should poll the
+    script run's ScriptRunCancellationToken instead.
+
+    Tracing slows down the traced code, so it's opt-in.
+    """
+
+    def __init__(
+        self,
+        app_dir: str,
+        check_interval: float,
+        check: Callable[[], None],
+        timer: Callable[[], float] = time.perf_counter,
+    ):
+        self._app_dir = os.path.join(os.path.realpath(app_dir), "")
+        self._check_interval = check_interval
+        self._check = check
+        self._timer = timer
+        self._next_check = 0.0
+        # Whether the frames of each source file should be traced.
+        self._is_traced_file: dict[str, bool] = {}
+
+    @contextmanager
+    def trace(self) -> Iterator[None]:
+        """Trace the code that runs on the current thread within this context."""
+        if sys.gettrace() is not None:
+            # Don't get in the way of debuggers and coverage tools.
+            _LOGGER.debug("A trace function is already set. Not tracing script.")
+            yield
+            return
+
+        self._next_check = self._timer() + self._check_interval
+        sys.settrace(self._trace_call)
+        try:
+            yield
+        finally:
+            sys.settrace(None)
+
+    def _should_trace(self, filename: str) -> bool:
+        is_traced = self._is_traced_file.get(filename)
+        if is_traced is None:
+            path = os.path.realpath(filename)
+            is_traced = (
+                path.startswith(self._app_dir)
+                and not path.startswith(_STREAMLIT_DIR)
+                and "site-packages" not in path
+                and "dist-packages" not in path
+            )
+            self._is_traced_file[filename] = is_traced
+        return is_traced
+
+    def _trace_call(
+        self, frame: FrameType, event: str, arg: Any
+    ) -> _TraceFunction | None:
+        if not self._should_trace(frame.f_code.co_filename):
+            return None
+        return self._trace_line
+
+    def _trace_line(self, frame: FrameType, event: str, arg: Any) -> _TraceFunction:
+        now = self._timer()
+        if now >= self._next_check:
+            self._next_check = now + self._check_interval
+            # If this raises, the exception is raised in the traced frame.
+            self._check()
+        return self._trace_line
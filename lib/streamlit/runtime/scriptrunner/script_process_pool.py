@@ -0,0 +1,749 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Run app scripts in a pool of worker processes instead of threads.
+
+Each session is pinned to one worker process, which holds the session's
+SessionState, FragmentStorage and PagesManager and runs its scripts with a
+regular ScriptRunner. In the server process, a ProcessScriptRunner stands in for
+that ScriptRunner: it forwards rerun and stop requests (including the widget
+states and uploaded files they refer to) to the worker, and re-emits the
+ScriptRunnerEvents (including ForwardMsgs) the worker sends back.
+
+Caches (st.cache_data, st.cache_resource) are local to each worker process.
+Media files created by a script are mirrored into the server's
+MemoryMediaFileStorage so that the server can serve them.
+"""
+
+from __future__ import annotations
+
+import itertools
+import multiprocessing
+import pickle
+import sys
+import threading
+import time
+from collections import Counter
+from typing import TYPE_CHECKING, Any, Callable, Final
+
+from blinker import Signal
+
+from streamlit import config
+from streamlit.config_option import ConfigOption
+from streamlit.logger import get_logger
+from streamlit.proto.ClientState_pb2 import ClientState
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.scriptrunner.script_runner import ScriptRunnerEvent
+
+if TYPE_CHECKING:
+    from multiprocessing.connection import Connection
+    from multiprocessing.process import BaseProcess
+
+    from streamlit.runtime.media_file_storage import MediaFileKind
+    from streamlit.runtime.scriptrunner_utils.script_requests import RerunData
+    from streamlit.runtime.uploaded_file_manager import (
+        UploadedFileManager,
+        UploadedFileRec,
+    )
+
+_LOGGER: Final = get_logger(__name__)
+
+# How long a worker has to say whether its ScriptRunner accepted a rerun
+# request.
+_RERUN_ACK_TIMEOUT: Final = 10.0
+
+# How often a worker's reader thread checks for rerun requests that weren't
+# acknowledged in time.
+_RERUN_ACK_POLL_INTERVAL: Final = 1.0
+
+
+def _get_uploaded_files(
+    uploaded_file_mgr: UploadedFileManager,
+    session_id: str,
+    rerun_data: RerunData,
+) -> list[UploadedFileRec]:
+    """Return the uploaded files that the widget states of a rerun refer to."""
+    if rerun_data.widget_states is None:
+        return []
+
+    file_ids = [
+        file_info.file_id
+        for widget in rerun_data.widget_states.widgets
+        if widget.WhichOneof("value") == "file_uploader_state_value"
+        for file_info in widget.file_uploader_state_value.uploaded_file_info
+    ]
+    if not file_ids:
+        return []
+    return uploaded_file_mgr.get_files(session_id, file_ids)
+
+
+class ProcessScriptRunner:
+    """Stands in for a ScriptRunner that runs in a worker process.
+
+    It has the same interface that AppSession uses on a ScriptRunner, and emits
+    the same events on `on_event`. Rerun requests are acknowledged by the
+    worker asynchronously, so a request that the worker's ScriptRunner turns
+    out not to accept is reported on `on_rerun_rejected` instead. Events are
+    emitted on the worker's reader thread.
+    """
+
+    def __init__(
+        self,
+        worker: _Worker,
+        runner_id: int,
+        session_id: str,
+        initial_rerun_data: RerunData,
+        user_info: dict[str, str | None],
+    ):
+        self._worker = worker
+        self._runner_id = runner_id
+        self._session_id = session_id
+        self._initial_rerun_data = initial_rerun_data
+        self._user_info = user_info
+        self._is_stopped = False
+        self._client_state = ClientState()
+
+        self._lock = threading.Lock()
+        # The number of rerun requests the worker hasn't acknowledged yet, and
+        # the RerunData of the latest one.
+        self._num_pending_reruns = 0
+        self._last_rerun_data: RerunData | None = None
+        self._rerun_rejected = False
+        # The RerunData of the rejected rerun request, until it's reported
+        # right before the SHUTDOWN event.
+        self._rejected_rerun_data: RerunData | None = None
+        # The kwargs of a SHUTDOWN event that is held back until the pending
+        # rerun requests are acknowledged.
+        self._pending_shutdown_kwargs: dict[str, Any] | None = None
+
+        self.on_event = Signal(
+            doc="""Emitted when a ScriptRunnerEvent occurs in the worker process.
+
+            See ScriptRunner.on_event.
+            """
+        )
+
+        self.on_rerun_rejected = Signal(
+            doc="""Emitted when the worker's ScriptRunner didn't accept a rerun
+            request that request_rerun already returned True for, because it
+            was stopping or didn't acknowledge the request in time. It's
+            emitted at most once, right before the SHUTDOWN event, so that the
+            worker's ScriptRunner has stopped running the script by then.
+
+            Parameters
+            ----------
+            rerun_data : RerunData
+                The RerunData of the latest rerun request, which has to be
+                handled by a new ScriptRunner.
+            """
+        )
+
+    def start(self) -> None:
+        """Start running the script in the worker process."""
+        self._worker.start_runner(self, self._initial_rerun_data, self._user_info)
+
+    def request_rerun(self, rerun_data: RerunData) -> bool:
+        """Request that the worker's ScriptRunner restart its script.
+
+        Like ScriptRunner.request_rerun, return False if the ScriptRunner has
+        stopped (or is stopping) and can't handle the request. This doesn't
+        wait for the worker to acknowledge the request: if the worker's
+        ScriptRunner doesn't accept it, `on_rerun_rejected` is emitted later.
+        """
+        with self._lock:
+            if self._is_stopped or not self._worker.request_rerun(self, rerun_data):
+                self._is_stopped = True
+                return False
+
+            self._num_pending_reruns += 1
+            self._last_rerun_data = rerun_data
+            return True
+
+    def request_stop(self) -> None:
+        """Request that the worker's ScriptRunner stop and shut down."""
+        self._is_stopped = True
+        self._worker.send(("stop", self._runner_id))
+
+    def _on_worker_event(
+        self, event: ScriptRunnerEvent, kwargs: dict[str, Any]
+    ) -> None:
+        if event == ScriptRunnerEvent.SHUTDOWN:
+            with self._lock:
+                self._is_stopped = True
+                self._client_state = kwargs["client_state"]
+                if self._num_pending_reruns > 0:
+                    # A rejected rerun request must be reported first, while
+                    # this is still the session's current ScriptRunner.
+                    self._pending_shutdown_kwargs = kwargs
+                    return
+                rejected_rerun_data = self._rejected_rerun_data
+                self._rejected_rerun_data = None
+            self._send_shutdown(kwargs, rejected_rerun_data)
+            return
+        self.on_event.send(self, event=event, **kwargs)
+
+    def _on_rerun_ack(self, accepted: bool) -> None:
+        """Called when the worker acknowledged a rerun request, or failed to.
+
+        A rejected request is only reported with the SHUTDOWN event, since the
+        worker's ScriptRunner may still be running the script until then, and
+        the rejected rerun must not run concurrently with it.
+        """
+        shutdown_kwargs = None
+        rejected_rerun_data = None
+        with self._lock:
+            self._num_pending_reruns -= 1
+            if not accepted and not self._rerun_rejected:
+                self._rerun_rejected = True
+                self._is_stopped = True
+                self._rejected_rerun_data = self._last_rerun_data
+            if self._num_pending_reruns == 0:
+                shutdown_kwargs = self._pending_shutdown_kwargs
+                self._pending_shutdown_kwargs = None
+                if shutdown_kwargs is not None:
+                    rejected_rerun_data = self._rejected_rerun_data
+                    self._rejected_rerun_data = None
+
+        if shutdown_kwargs is not None:
+            self._send_shutdown(shutdown_kwargs, rejected_rerun_data)
+
+    def _send_shutdown(
+        self, kwargs: dict[str, Any], rejected_rerun_data: RerunData | None
+    ) -> None:
+        if rejected_rerun_data is not None:
+            self.on_rerun_rejected.send(self, rerun_data=rejected_rerun_data)
+        self.on_event.send(self, event=ScriptRunnerEvent.SHUTDOWN, **kwargs)
+
+    def _on_worker_died(self) -> None:
+        """Shut down as if the worker's ScriptRunner had stopped."""
+        self._on_worker_event(
+            ScriptRunnerEvent.SHUTDOWN, {"client_state": self._client_state}
+        )
+
+
+class _Worker:
+    """The server-side handle of a worker process."""
+
+    def __init__(self, pool: ScriptProcessPool, process: BaseProcess, conn: Connection):
+        self._pool = pool
+        self._process = process
+        self._conn = conn
+        self._send_lock = threading.Lock()
+        self._lock = threading.Lock()
+        self._runners: dict[int, ProcessScriptRunner] = {}
+        # Maps the IDs of unacknowledged rerun requests to the runner that sent
+        # them and the time.monotonic() deadline for their acknowledgement.
+        self._rerun_acks: dict[int, tuple[ProcessScriptRunner, float]] = {}
+        self._request_ids = itertools.count()
+        self.session_ids: set[str] = set()
+        self.is_alive = True
+
+        self._reader_thread = threading.Thread(
+            target=self._read_messages,
+            name="ScriptProcessPool.readerThread",
+            daemon=True,
+        )
+        self._reader_thread.start()
+
+    def send(self, msg: tuple[Any, ...]) -> None:
+        try:
+            with self._send_lock:
+                self._conn.send(msg)
+        except (OSError, ValueError):
+            # The worker died. Its runners are shut down by the reader thread.
+            _LOGGER.debug("Dropping message for dead script worker: %s", msg[0])
+
+    def start_runner(
+        self,
+        runner: ProcessScriptRunner,
+        rerun_data: RerunData,
+        user_info: dict[str, str | None],
+    ) -> None:
+        with self._lock:
+            self._runners[runner._runner_id] = runner
+        if not self.is_alive:
+            runner._on_worker_died()
+            return
+
+        self.send(
+            (
+                "start",
+                runner._runner_id,
+                runner._session_id,
+                rerun_data,
+                user_info,
+                self._pool._get_uploaded_files(runner._session_id, rerun_data),
+            )
+        )
+
+    def request_rerun(self, runner: ProcessScriptRunner, rerun_data: RerunData) -> bool:
+        """Send a rerun request to the worker without waiting for it to be
+        acknowledged. The acknowledgement is passed to runner._on_rerun_ack on
+        the reader thread.
+
+        Returns False if the worker died and the request wasn't sent.
+        """
+        request_id = next(self._request_ids)
+        with self._lock:
+            if not self.is_alive:
+                return False
+            self._rerun_acks[request_id] = (
+                runner,
+                time.monotonic() + _RERUN_ACK_TIMEOUT,
+            )
+
+        self.send(
+            (
+                "rerun",
+                runner._runner_id,
+                request_id,
+                rerun_data,
+                self._pool._get_uploaded_files(runner._session_id, rerun_data),
+            )
+        )
+        return True
+
+    def terminate(self) -> None:
+        self.send(("exit",))
+        self._process.join(timeout=5)
+        if self._process.is_alive():
+            self._process.terminate()
+
+    def _read_messages(self) -> None:
+        while True:
+            try:
+                has_msg = self._conn.poll(_RERUN_ACK_POLL_INTERVAL)
+                msg = self._conn.recv() if has_msg else None
+            except (EOFError, OSError):
+                break
+
+            if msg is not None:
+                try:
+                    self._handle_message(msg)
+                except Exception:
+                    _LOGGER.exception("Failed to handle message from script worker")
+            self._expire_rerun_acks()
+
+        _LOGGER.debug("Script worker process exited")
+        with self._lock:
+            self.is_alive = False
+            runners = list(self._runners.values())
+            self._runners.clear()
+            unacked_runners = [runner for runner, _ in self._rerun_acks.values()]
+            self._rerun_acks.clear()
+        for runner in unacked_runners:
+            runner._on_rerun_ack(False)
+        for runner in runners:
+            runner._on_worker_died()
+
+    def _expire_rerun_acks(self) -> None:
+        """Reject the rerun requests that weren't acknowledged in time."""
+        now = time.monotonic()
+        with self._lock:
+            expired_ids = [
+                request_id
+                for request_id, (_, deadline) in self._rerun_acks.items()
+                if deadline <= now
+            ]
+            expired_runners = [
+                self._rerun_acks.pop(request_id)[0] for request_id in expired_ids
+            ]
+
+        for runner in expired_runners:
+            _LOGGER.warning(
+                "Script worker didn't acknowledge a rerun request in time. "
+                "Starting a new script run once the current one stopped."
+            )
+            runner.request_stop()
+            runner._on_rerun_ack(False)
+
+    def _handle_message(self, msg: tuple[Any, ...]) -> None:
+        msg_type = msg[0]
+        if msg_type == "event":
+            _, runner_id, event, kwargs = msg
+            with self._lock:
+                runner = self._runners.get(runner_id)
+                if event == ScriptRunnerEvent.SHUTDOWN:
+                    self._runners.pop(runner_id, None)
+            if runner is not None:
+                runner._on_worker_event(event, kwargs)
+        elif msg_type == "rerun_ack":
+            _, request_id, accepted = msg
+            with self._lock:
+                ack = self._rerun_acks.pop(request_id, None)
+            if ack is not None:
+                runner, _ = ack
+                runner._on_rerun_ack(accepted)
+        elif msg_type == "media_added":
+            _, data, mimetype, kind, filename = msg
+            self._pool._on_media_file_added(data, mimetype, kind, filename)
+        elif msg_type == "media_deleted":
+            _, file_id = msg
+            self._pool._on_media_file_deleted(file_id)
+        else:
+            _LOGGER.warning("Unexpected message from script worker: %s", msg_type)
+
+
+class ScriptProcessPool:
+    """Runs app scripts in a pool of worker processes.
+
+    Worker processes are started on demand, up to `num_processes`. A session is
+    assigned to the worker with the fewest sessions when it first runs its
+    script, and stays on that worker until it's closed (or the worker dies).
+    """
+
+    def __init__(
+        self,
+        num_processes: int,
+        main_script_path: str,
+        media_file_storage: MemoryMediaFileStorage,
+        uploaded_file_mgr: UploadedFileManager,
+    ):
+        if num_processes < 1:
+            raise ValueError("num_processes must be at least 1")
+        self._num_processes = num_processes
+        self._main_script_path = main_script_path
+        self._media_file_storage = media_file_storage
+        self._uploaded_file_mgr = uploaded_file_mgr
+
+        self._lock = threading.Lock()
+        self._workers: list[_Worker] = []
+        self._workers_by_session: dict[str, _Worker] = {}
+        self._runner_ids = itertools.count()
+        # Number of workers that hold each mirrored media file.
+        self._media_file_refs: Counter[str] = Counter()
+        self._is_shutdown = False
+
+    def create_runner(
+        self,
+        session_id: str,
+        initial_rerun_data: RerunData,
+        user_info: dict[str, str | None],
+    ) -> ProcessScriptRunner:
+        """Create a ProcessScriptRunner for the given session. Like a
+        ScriptRunner, it starts running once its start() method is called.
+        """
+        worker = self._get_worker(session_id)
+        return ProcessScriptRunner(
+            worker, next(self._runner_ids), session_id, initial_rerun_data, user_info
+        )
+
+    def close_session(self, session_id: str) -> None:
+        """Release the worker-side state of a session that shut down."""
+        with self._lock:
+            worker = self._workers_by_session.pop(session_id, None)
+            if worker is None:
+                return
+            worker.session_ids.discard(session_id)
+        worker.send(("close_session", session_id))
+
+    def on_source_file_changed(self, filepath: str | None) -> None:
+        """Tell all workers that a source file changed, so that they don't use
+        the stale bytecode or module.
+        """
+        for worker in self._live_workers():
+            worker.send(("source_file_changed", filepath))
+
+    def clear_caches(self, session_id: str) -> None:
+        """Clear the caches of all workers, and the state of the given session."""
+        for worker in self._live_workers():
+            worker.send(("clear_caches", session_id))
+
+    def shutdown(self) -> None:
+        """Stop all worker processes."""
+        with self._lock:
+            self._is_shutdown = True
+            workers = self._workers
+            self._workers = []
+            self._workers_by_session.clear()
+        for worker in workers:
+            worker.terminate()
+
+    def _live_workers(self) -> list[_Worker]:
+        with self._lock:
+            return [worker for worker in self._workers if worker.is_alive]
+
+    def _get_worker(self, session_id: str) -> _Worker:
+        with self._lock:
+            if self._is_shutdown:
+                raise RuntimeError("ScriptProcessPool has been shut down")
+
+            worker = self._workers_by_session.get(session_id)
+            if worker is not None and worker.is_alive:
+                return worker
+
+            self._workers = [w for w in self._workers if w.is_alive]
+            if len(self._workers) < self._num_processes:
+                worker = self._start_worker()
+                self._workers.append(worker)
+            else:
+                worker = min(self._workers, key=lambda w: len(w.session_ids))
+
+            worker.session_ids.add(session_id)
+            self._workers_by_session[session_id] = worker
+            return worker
+
+    def _start_worker(self) -> _Worker:
+        # Forking a process that runs Tornado and other threads isn't safe, so
+        # workers are always spawned.
+        ctx = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = ctx.Pipe()
+        process = ctx.Process(
+            target=_run_worker,
+            args=(
+                child_conn,
+                self._main_script_path,
+                self._media_file_storage.media_endpoint,
+                _get_config_overrides(),
+            ),
+            name="ScriptProcessPool.worker",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        _LOGGER.debug("Started script worker process %s", process.pid)
+        return _Worker(self, process, parent_conn)
+
+    def _get_uploaded_files(
+        self, session_id: str, rerun_data: RerunData
+    ) -> list[UploadedFileRec]:
+        return _get_uploaded_files(self._uploaded_file_mgr, session_id, rerun_data)
+
+    def _on_media_file_added(
+        self,
+        data: bytes,
+        mimetype: str,
+        kind: MediaFileKind,
+        filename: str | None,
+    ) -> None:
+        file_id = self._media_file_storage.load_and_get_id(
+            data, mimetype, kind, filename
+        )
+        with self._lock:
+            self._media_file_refs[file_id] += 1
+
+    def _on_media_file_deleted(self, file_id: str) -> None:
+        with self._lock:
+            self._media_file_refs[file_id] -= 1
+            if self._media_file_refs[file_id] > 0:
+                return
+            del self._media_file_refs[file_id]
+        self._media_file_storage.delete_file(file_id)
+
+
+def _get_config_overrides() -> dict[str, tuple[Any, str]]:
+    """Return the config options that don't have their default value, so that
+    worker processes can use the same config.
+    """
+    return {
+        key: (option.value, option.where_defined)
+        for key, option in config.get_config_options().items()
+        if option.where_defined != ConfigOption.DEFAULT_DEFINITION
+    }
+
+
+# Everything below runs in the worker processes.
+
+
+class _ForwardingMediaFileStorage(MemoryMediaFileStorage):
+    """A MemoryMediaFileStorage that mirrors its files into the server's
+    storage. File IDs only depend on a file's content, so the server's storage
+    serves the files under the same URLs.
+    """
+
+    def __init__(self, media_endpoint: str, send: Callable[[tuple[Any, ...]], None]):
+        super().__init__(media_endpoint)
+        self._send = send
+        self._forwarded_file_ids: set[str] = set()
+
+    def load_and_get_id(
+        self,
+        path_or_data: str | bytes,
+        mimetype: str,
+        kind: MediaFileKind,
+        filename: str | None = None,
+    ) -> str:
+        data = (
+            self._read_file(path_or_data)
+            if isinstance(path_or_data, str)
+            else path_or_data
+        )
+        file_id = super().load_and_get_id(data, mimetype, kind, filename)
+        if file_id not in self._forwarded_file_ids:
+            self._forwarded_file_ids.add(file_id)
+            self._send(("media_added", data, mimetype, kind, filename))
+        return file_id
+
+    def delete_file(self, file_id: str) -> None:
+        super().delete_file(file_id)
+        if file_id in self._forwarded_file_ids:
+            self._forwarded_file_ids.discard(file_id)
+            self._send(("media_deleted", file_id))
+
+
+def _picklable_event_kwargs(kwargs: dict[str, Any]) -> dict[str, Any]:
+    exception = kwargs.get("exception")
+    if exception is not None:
+        try:
+            pickle.dumps(exception)
+        except Exception:
+            kwargs = {**kwargs, "exception": RuntimeError(str(exception))}
+    return kwargs
+
+
+def _run_worker(
+    conn: Connection,
+    main_script_path: str,
+    media_endpoint: str,
+    config_overrides: dict[str, tuple[Any, str]],
+) -> None:
+    """The entry point of a worker process."""
+    # Imported here, since they are only needed in worker processes.
+    from streamlit.runtime import Runtime, RuntimeConfig, caching
+    from streamlit.runtime.fragment import MemoryFragmentStorage
+    from streamlit.runtime.memory_uploaded_file_manager import (
+        MemoryUploadedFileManager,
+    )
+    from streamlit.runtime.pages_manager import PagesManager
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.runtime.scriptrunner.script_runner import ScriptRunner
+    from streamlit.runtime.state import SessionState
+
+    config.get_config_options()
+    for key, (value, where_defined) in config_overrides.items():
+        config._set_option(key, value, where_defined)
+    # Workers run scripts themselves, and never start workers of their own.
+    config._set_option("runner.numScriptProcesses", 0, "<script worker>")
+
+    send_lock = threading.Lock()
+
+    def send(msg: tuple[Any, ...]) -> None:
+        with send_lock:
+            conn.send(msg)
+
+    # The Runtime is never started. It only provides the managers that script
+    # runs access through `runtime.get_instance()`.
+    uploaded_file_mgr = MemoryUploadedFileManager(
+        # Upload URLs are only handed out by the server process.
+        upload_endpoint=""
+    )
+    rt = Runtime(
+        RuntimeConfig(
+            script_path=main_script_path,
+            command_line=None,
+            media_file_storage=_ForwardingMediaFileStorage(media_endpoint, send),
+            uploaded_file_manager=uploaded_file_mgr,
+        )
+    )
+    script_cache = ScriptCache()
+
+    session_states: dict[str, SessionState] = {}
+    fragment_storages: dict[str, MemoryFragmentStorage] = {}
+    pages_managers: dict[str, PagesManager] = {}
+    runners: dict[int, ScriptRunner] = {}
+
+    def add_uploaded_files(session_id: str, files: list[UploadedFileRec]) -> None:
+        for file in files:
+            uploaded_file_mgr.add_file(session_id, file)
+
+    def forward_events(runner_id: int) -> Callable[..., None]:
+        def on_event(
+            sender: ScriptRunner, event: ScriptRunnerEvent, **kwargs: Any
+        ) -> None:
+            if event == ScriptRunnerEvent.SHUTDOWN:
+                runners.pop(runner_id, None)
+            send(("event", runner_id, event, _picklable_event_kwargs(kwargs)))
+
+        return on_event
+
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break
+
+        msg_type = msg[0]
+        if msg_type == "start":
+            _, runner_id, session_id, rerun_data, user_info, files = msg
+            add_uploaded_files(session_id, files)
+            if session_id not in session_states:
+                session_states[session_id] = SessionState()
+                fragment_storages[session_id] = MemoryFragmentStorage()
+                # The server process watches the pages directory.
+                pages_managers[session_id] = PagesManager(
+                    main_script_path, script_cache, setup_watcher=False
+                )
+
+            runner = ScriptRunner(
+                session_id=session_id,
+                main_script_path=main_script_path,
+                session_state=session_states[session_id],
+                uploaded_file_mgr=uploaded_file_mgr,
+                script_cache=script_cache,
+                initial_rerun_data=rerun_data,
+                user_info=user_info,
+                fragment_storage=fragment_storages[session_id],
+                pages_manager=pages_managers[session_id],
+            )
+            runner.on_event.connect(forward_events(runner_id), weak=False)
+            runners[runner_id] = runner
+            runner.start()
+
+        elif msg_type == "rerun":
+            _, runner_id, request_id, rerun_data, files = msg
+            runner = runners.get(runner_id)
+            accepted = False
+            if runner is not None:
+                add_uploaded_files(runner._session_id, files)
+                accepted = runner.request_rerun(rerun_data)
+            send(("rerun_ack", request_id, accepted))
+
+        elif msg_type == "stop":
+            _, runner_id = msg
+            runner = runners.get(runner_id)
+            if runner is not None:
+                runner.request_stop()
+
+        elif msg_type == "close_session":
+            _, session_id = msg
+            for runner in list(runners.values()):
+                if runner._session_id == session_id:
+                    runner.request_stop()
+            session_states.pop(session_id, None)
+            fragment_storages.pop(session_id, None)
+            pages_managers.pop(session_id, None)
+            uploaded_file_mgr.remove_session_files(session_id)
+            rt.media_file_mgr.clear_session_refs(session_id)
+            rt.media_file_mgr.remove_orphaned_files()
+
+        elif msg_type == "source_file_changed":
+            _, filepath = msg
+            script_cache.clear(filepath)
+            if filepath is not None:
+                for name, module in list(sys.modules.items()):
+                    if getattr(module, "__file__", None) == filepath:
+                        del sys.modules[name]
+
+        elif msg_type == "clear_caches":
+            _, session_id = msg
+            caching.cache_data.clear()
+            caching.cache_resource.clear()
+            if session_id in session_states:
+                session_states[session_id].clear()
+
+        elif msg_type == "exit":
+            break
+
+    for runner in list(runners.values()):
+        runner.request_stop()
@@ -15,10 +15,11 @@
 from __future__ import annotations
 
 import gc
+import os
 import sys
 import threading
 import types
-from contextlib import contextmanager
+from contextlib import contextmanager, nullcontext
 from enum import Enum
 from timeit import default_timer as timer
 from typing import TYPE_CHECKING, Callable, Final
@@ -36,6 +37,7 @@ from streamlit.runtime.metrics_util import (
 )
 from streamlit.runtime.scriptrunner.exec_code import exec_func_with_error_handling
 from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.runtime.scriptrunner.script_interrupter import ScriptInterrupter
 from streamlit.runtime.scriptrunner_utils.exceptions import (
     RerunException,
     StopException,
@@ -44,8 +46,10 @@ from streamlit.runtime.scriptrunner_utils.script_requests import (
     RerunData,
     ScriptRequests,
     ScriptRequestType,
+    ScriptRunCancellationToken,
 )
 from streamlit.runtime.scriptrunner_utils.script_run_context import (
+    SCRIPT_RUN_CONTEXT_ATTR_NAME,
     ScriptRunContext,
     add_script_run_ctx,
     get_script_run_ctx,
@@ -61,6 +65,7 @@ if TYPE_CHECKING:
     from streamlit.runtime.fragment import FragmentStorage
     from streamlit.runtime.pages_manager import PagesManager
     from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+    from streamlit.runtime.scriptrunner.script_runner_pool import ScriptRunnerPool
     from streamlit.runtime.uploaded_file_manager import UploadedFileManager
 
 _LOGGER: Final = get_logger(__name__)
@@ -126,6 +131,7 @@ class ScriptRunner:
         user_info: dict[str, str | None],
         fragment_storage: FragmentStorage,
         pages_manager: PagesManager,
+        worker_pool: ScriptRunnerPool | None = None,
     ):
         """Initialize the ScriptRunner.
 
@@ -164,6 +170,10 @@ class ScriptRunner:
 
         fragment_storage
             The AppSession's FragmentStorage instance.
+
+        worker_pool
+            If set, the ScriptRunner runs on one of the pool's worker threads
+            instead of starting its own thread.
         """
         self._session_id = session_id
         self._main_script_path = main_script_path
@@ -176,8 +186,25 @@ class ScriptRunner:
         self._fragment_storage = fragment_storage
 
         self._pages_manager = pages_manager
+        self._worker_pool = worker_pool
         self._requests = ScriptRequests()
         self._requests.request_rerun(initial_rerun_data)
+        self._cancellation_token = ScriptRunCancellationToken(
+            self._requests, self._maybe_handle_execution_control_request
+        )
+
+        interrupt_check_interval = (
+            config.get_option("runner.interruptCheckIntervalMs") / 1000
+        )
+        self._interrupter = (
+            ScriptInterrupter(
+                os.path.dirname(main_script_path),
+                interrupt_check_interval,
+                self._maybe_handle_execution_control_request,
+            )
+            if interrupt_check_interval > 0
+            else None
+        )
 
         self.on_event = Signal(
             doc="""Emitted when a ScriptRunnerEvent occurs.
@@ -211,8 +238,10 @@ class ScriptRunner:
         # _maybe_handle_execution_control_request.
         self._execing = False
 
-        # This is initialized in start()
+        # This is initialized in start(), or once a worker thread picks up the
+        # ScriptRunner if it runs in a worker pool.
         self._script_thread: threading.Thread | None = None
+        self._is_started = False
 
     def __repr__(self) -> str:
         return util.repr_(self)
@@ -241,13 +270,19 @@ class ScriptRunner:
         return self._requests.request_rerun(rerun_data)
 
     def start(self) -> None:
-        """Start a new thread to process the ScriptEventQueue.
+        """Start a new thread (or submit a job to the worker pool) to process
+        the ScriptEventQueue.
 
         This must be called only once.
 
         """
-        if self._script_thread is not None:
+        if self._is_started:
             raise Exception("ScriptRunner was already started")
+        self._is_started = True
+
+        if self._worker_pool is not None:
+            self._worker_pool.submit(self._session_id, self._run_in_worker_thread)
+            return
 
         self._script_thread = threading.Thread(
             target=self._run_script_thread,
@@ -255,6 +290,17 @@ class ScriptRunner:
         )
         self._script_thread.start()
 
+    def _run_in_worker_thread(self) -> None:
+        """The entry point for a worker pool job."""
+        self._script_thread = threading.current_thread()
+        try:
+            self._run_script_thread()
+        finally:
+            # The worker thread is reused for other sessions, so it must not
+            # keep our ScriptRunContext.
+            setattr(self._script_thread, SCRIPT_RUN_CONTEXT_ATTR_NAME, None)
+            self._script_thread = None
+
     def _get_script_run_ctx(self) -> ScriptRunContext:
         """Get the ScriptRunContext for the current thread.
 
@@ -300,6 +346,7 @@ class ScriptRunner:
             session_id=self._session_id,
             _enqueue=self._enqueue_forward_msg,
             script_requests=self._requests,
+            cancellation_token=self._cancellation_token,
             query_string="",
             session_state=self._session_state,
             uploaded_file_mgr=self._uploaded_file_mgr,
@@ -412,6 +459,12 @@ class ScriptRunner:
 
         assert self._is_in_script_thread()
 
+        # Restore the Session State of the client's previous session, if it was
+        # lost. This is only scheduled for a new session's first script run.
+        persister = runtime.get_instance().session_state_persister
+        if persister is not None:
+            persister.restore_pending(self._session_id, self._session_state)
+
         # An explicit loop instead of recursion to avoid stack overflows
         while True:
             _LOGGER.debug("Running script %s", rerun_data)
@@ -535,7 +588,9 @@ class ScriptRunner:
             def code_to_exec(code=code, module=module, ctx=ctx, rerun_data=rerun_data):
                 with modified_sys_path(
                     self._main_script_path
-                ), self._set_execing_flag():
+                ), self._set_execing_flag(), (
+                    self._interrupter.trace() if self._interrupter else nullcontext()
+                ):
                     # Run callbacks for widgets whose values have changed.
                     if rerun_data.widget_states is not None:
                         self._session_state.on_script_will_rerun(
@@ -654,6 +709,12 @@ class ScriptRunner:
         # are marked as active.
         runtime.get_instance().media_file_mgr.remove_orphaned_files()
 
+        # Persist the changes to Session State, so that they can be restored
+        # into a new session if this one is lost, e.g. when the server restarts.
+        persister = runtime.get_instance().session_state_persister
+        if persister is not None and not premature_stop:
+            persister.snapshot(self._session_id, self._session_state)
+
         # Force garbage collection to run, to help avoid memory use building up
         # This is usually not an issue, but sometimes GC takes time to kick in and
         # causes apps to go over resource limits, and forcing it to run between
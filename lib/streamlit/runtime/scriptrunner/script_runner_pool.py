@@ -0,0 +1,200 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Callable, Final, NamedTuple
+
+from streamlit.logger import get_logger
+
+_LOGGER: Final = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class ScriptRunnerPoolStats:
+    """A snapshot of a ScriptRunnerPool's counters."""
+
+    # Number of worker threads that currently exist.
+    num_workers: int = 0
+    # Number of workers currently running a job.
+    num_busy_workers: int = 0
+    # Number of jobs waiting for a worker.
+    num_queued_jobs: int = 0
+    # Number of jobs that have finished running.
+    num_completed_jobs: int = 0
+    # Total and max time that finished jobs waited for a worker, in seconds.
+    total_wait_time: float = 0.0
+    max_wait_time: float = 0.0
+    # Total time that finished jobs spent running, in seconds.
+    total_run_time: float = 0.0
+
+
+class _Job(NamedTuple):
+    session_id: str
+    fn: Callable[[], None]
+    submit_time: float
+
+
+class ScriptRunnerPool:
+    """A bounded pool of threads that execute ScriptRunners.
+
+    Without a pool, each ScriptRunner starts its own thread, which exits once the
+    runner has handled all pending rerun requests. With a pool, ScriptRunners
+    submit their work as a job instead, and at most `max_workers` jobs run at the
+    same time. Worker threads are created on demand and then kept around for
+    later jobs.
+
+    Queued jobs are taken round-robin by session, so a session that submits many
+    jobs in a row can't starve the others.
+
+    Note that a job occupies its worker until its script stops running, so a
+    script that never finishes permanently takes up a worker.
+
+    ScriptRunnerPool is thread-safe.
+    """
+
+    def __init__(
+        self, max_workers: int, timer: Callable[[], float] = time.perf_counter
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self._max_workers = max_workers
+        self._timer = timer
+
+        self._lock = threading.Lock()
+        self._has_jobs = threading.Condition(self._lock)
+        # Insertion order is the round-robin order. A session is moved to the
+        # end when one of its jobs is taken.
+        self._queues: dict[str, deque[_Job]] = {}
+        self._workers: list[threading.Thread] = []
+        self._num_busy_workers = 0
+        self._is_shutdown = False
+        self._stats = ScriptRunnerPoolStats()
+
+    def submit(self, session_id: str, fn: Callable[[], None]) -> None:
+        """Queue `fn` to be called on a worker thread.
+
+        Raises
+        ------
+        RuntimeError
+            If the pool has been shut down.
+        """
+        with self._lock:
+            if self._is_shutdown:
+                raise RuntimeError("ScriptRunnerPool has been shut down")
+
+            queue = self._queues.get(session_id)
+            if queue is None:
+                queue = self._queues[session_id] = deque()
+            queue.append(_Job(session_id, fn, self._timer()))
+            self._stats = replace(
+                self._stats, num_queued_jobs=self._stats.num_queued_jobs + 1
+            )
+
+            num_free_workers = len(self._workers) - self._num_busy_workers
+            if (
+                self._stats.num_queued_jobs > num_free_workers
+                and len(self._workers) < self._max_workers
+            ):
+                self._start_worker()
+            else:
+                self._has_jobs.notify()
+
+    def shutdown(self) -> None:
+        """Stop idle workers, and busy workers once their current job is done.
+
+        Jobs that are still queued are dropped.
+        """
+        with self._lock:
+            self._is_shutdown = True
+            self._queues.clear()
+            self._stats = replace(self._stats, num_queued_jobs=0)
+            self._has_jobs.notify_all()
+
+    @property
+    def stats(self) -> ScriptRunnerPoolStats:
+        with self._lock:
+            return replace(
+                self._stats,
+                num_workers=len(self._workers),
+                num_busy_workers=self._num_busy_workers,
+            )
+
+    def _start_worker(self) -> None:
+        # Worker threads are daemon threads so that idle workers don't keep the
+        # process alive.
+        worker = threading.Thread(
+            target=self._run_worker,
+            name=f"ScriptRunner.scriptThread-{len(self._workers)}",
+            daemon=True,
+        )
+        self._workers.append(worker)
+        worker.start()
+
+    def _pop_job(self) -> _Job | None:
+        """Take the next job round-robin. Must be called with the lock held."""
+        session_id = next(iter(self._queues), None)
+        if session_id is None:
+            return None
+
+        queue = self._queues.pop(session_id)
+        job = queue.popleft()
+        if queue:
+            self._queues[session_id] = queue
+        self._stats = replace(
+            self._stats, num_queued_jobs=self._stats.num_queued_jobs - 1
+        )
+        return job
+
+    def _run_worker(self) -> None:
+        while True:
+            with self._lock:
+                job = self._pop_job()
+                while job is None:
+                    if self._is_shutdown:
+                        self._workers.remove(threading.current_thread())
+                        return
+                    self._has_jobs.wait()
+                    job = self._pop_job()
+                self._num_busy_workers += 1
+
+            start_time = self._timer()
+            try:
+                job.fn()
+            except Exception:
+                _LOGGER.exception("Unhandled exception in ScriptRunnerPool job")
+            end_time = self._timer()
+
+            wait_time = start_time - job.submit_time
+            run_time = end_time - start_time
+            _LOGGER.debug(
+                "Script job for session %s waited %.1f ms and ran %.1f ms",
+                job.session_id,
+                wait_time * 1000,
+                run_time * 1000,
+            )
+            with self._lock:
+                self._num_busy_workers -= 1
+                stats = self._stats
+                self._stats = replace(
+                    stats,
+                    num_completed_jobs=stats.num_completed_jobs + 1,
+                    total_wait_time=stats.total_wait_time + wait_time,
+                    max_wait_time=max(stats.max_wait_time, wait_time),
+                    total_run_time=stats.total_run_time + run_time,
+                )
@@ -17,7 +17,7 @@ from __future__ import annotations
 import threading
 from dataclasses import dataclass, field, replace
 from enum import Enum
-from typing import cast
+from typing import Callable, cast
 
 from streamlit import util
 from streamlit.proto.Common_pb2 import StringTriggerValue as StringTriggerValueProto
@@ -89,7 +89,7 @@ def _fragment_run_should_not_preempt_script(
     return bool(fragment_id_queue) and not is_fragment_scoped_rerun
 
 
-def _coalesce_widget_states(
+def coalesce_widget_states(
     old_states: WidgetStates | None, new_states: WidgetStates | None
 ) -> WidgetStates | None:
     """Coalesce an older WidgetStates into a newer one, and return a new
@@ -158,6 +158,24 @@ class ScriptRequests:
         self._state = ScriptRequestType.CONTINUE
         self._rerun_data = RerunData()
 
+    @property
+    def has_interrupt_request(self) -> bool:
+        """True if there's a STOP request, or a RERUN request that will interrupt
+        the running script at its next yield point.
+
+        This doesn't take the lock, so the result may be outdated by the time it
+        is used.
+        """
+        state = self._state
+        if state == ScriptRequestType.STOP:
+            return True
+        return state == ScriptRequestType.RERUN and not (
+            _fragment_run_should_not_preempt_script(
+                self._rerun_data.fragment_id_queue,
+                self._rerun_data.is_fragment_scoped_rerun,
+            )
+        )
+
     def request_stop(self) -> None:
         """Request that the ScriptRunner stop running. A stopped ScriptRunner
         can't be used anymore. STOP requests succeed unconditionally.
@@ -201,7 +219,7 @@ class ScriptRequests:
                 # We already have an existing Rerun request, so we can coalesce the new
                 # rerun request into the existing one.
 
-                coalesced_states = _coalesce_widget_states(
+                coalesced_states = coalesce_widget_states(
                     self._rerun_data.widget_states, new_data.widget_states
                 )
 
@@ -296,3 +314,37 @@ class ScriptRequests:
             # state to STOP.
             self._state = ScriptRequestType.STOP
             return ScriptRequest(ScriptRequestType.STOP)
+
+
+class ScriptRunCancellationToken:
+    """Lets long-running code check whether its script run is obsolete.
+
+    A script run is cancelled once the ScriptRunner received a STOP request, or a
+    RERUN request that interrupts the run. Long-running helpers (e.g. cached
+    functions or connectors) can poll the token of the current run, which is
+    available as `get_script_run_ctx().cancellation_token`, to stop early instead
+    of computing a result that will be thrown away.
+
+    Thread-safe.
+    """
+
+    def __init__(
+        self, script_requests: ScriptRequests, yield_callback: Callable[[], None]
+    ):
+        self._script_requests = script_requests
+        self._yield_callback = yield_callback
+
+    @property
+    def is_cancelled(self) -> bool:
+        """True if the script run has been cancelled."""
+        return self._script_requests.has_interrupt_request
+
+    def raise_if_cancelled(self) -> None:
+        """Stop the script run right away if it has been cancelled, by raising a
+        RerunException or StopException.
+
+        This only has an effect on the script thread. Code that runs on other
+        threads should check `is_cancelled` instead.
+        """
+        if self.is_cancelled:
+            self._yield_callback()
@@ -16,7 +16,9 @@ from __future__ import annotations
 
 from abc import abstractmethod
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Callable, Protocol, cast
+from typing import TYPE_CHECKING, Callable, Protocol, cast, runtime_checkable
+
+from streamlit.runtime.stats import CacheStat, CacheStatsProvider
 
 if TYPE_CHECKING:
     from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
@@ -43,6 +45,30 @@ class SessionClient(Protocol):
         raise NotImplementedError
 
 
+@runtime_checkable
+class FlowControlledSessionClient(SessionClient, Protocol):
+    """A SessionClient that can tell the Runtime to hold back messages because
+    its connection isn't keeping up with the data being sent.
+
+    Once is_write_buffer_full becomes False again, the client must call
+    Runtime.notify_write_buffer_drained so that the held back messages are sent.
+    """
+
+    @property
+    @abstractmethod
+    def is_write_buffer_full(self) -> bool:
+        """True if the client can't currently accept more ForwardMsgs without
+        buffering them in server memory.
+        """
+        raise NotImplementedError
+
+    @property
+    @abstractmethod
+    def buffered_bytes(self) -> int:
+        """The number of bytes sent to the client that it hasn't received yet."""
+        raise NotImplementedError
+
+
 @dataclass
 class ActiveSessionInfo:
     """Type containing data related to an active session.
@@ -392,3 +418,23 @@ class SessionManager(Protocol):
         int
         """
         return len(self.list_active_sessions())
+
+
+@dataclass
+class SessionClientStatProvider(CacheStatsProvider):
+    """Reports the data buffered in server memory for each active session whose
+    client is a FlowControlledSessionClient.
+    """
+
+    _session_mgr: SessionManager
+
+    def get_stats(self) -> list[CacheStat]:
+        return [
+            CacheStat(
+                category_name="websocket_write_buffer",
+                cache_name=session_info.session.id,
+                byte_length=session_info.client.buffered_bytes,
+            )
+            for session_info in self._session_mgr.list_active_sessions()
+            if isinstance(session_info.client, FlowControlledSessionClient)
+        ]
@@ -0,0 +1,250 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import pickle
+import threading
+import zlib
+from abc import abstractmethod
+from typing import TYPE_CHECKING, Any, Callable, Collection, Final, Mapping, Protocol
+
+from streamlit.logger import get_logger
+
+if TYPE_CHECKING:
+    from streamlit.runtime.state import SafeSessionState
+
+_LOGGER: Final = get_logger(__name__)
+
+
+class SessionStateStorageError(Exception):
+    """Exception class for errors raised by SessionStateStorage."""
+
+
+class SessionStateStorage(Protocol):
+    """Storage for snapshots of the Session State of sessions.
+
+    Snapshots outlive the sessions they were taken of, including across server
+    restarts, so that a client that reconnects after its session was cleaned up
+    gets its Session State back. Values are stored as encoded bytes, keyed by
+    session ID and Session State key.
+    """
+
+    @abstractmethod
+    def load(self, session_id: str) -> dict[str, bytes]:
+        """Return the stored values of the given session.
+
+        Parameters
+        ----------
+        session_id
+            The ID of the session whose values to return.
+
+        Returns
+        -------
+        dict[str, bytes]
+            The encoded values of the session, keyed by their Session State key.
+            Empty if nothing is stored for the session.
+
+        Raises
+        ------
+        SessionStateStorageError
+            Raised if the values can't be loaded.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def save(
+        self,
+        session_id: str,
+        changed_values: Mapping[str, bytes],
+        removed_keys: Collection[str],
+    ) -> None:
+        """Update the stored values of the given session.
+
+        Parameters
+        ----------
+        session_id
+            The ID of the session whose values to update.
+
+        changed_values
+            Encoded values to store, keyed by their Session State key. These
+            replace any values already stored for the same keys.
+
+        removed_keys
+            Keys whose stored values should be removed.
+
+        Raises
+        ------
+        SessionStateStorageError
+            Raised if the values can't be saved.
+        """
+        raise NotImplementedError
+
+    @abstractmethod
+    def delete(self, session_id: str) -> None:
+        """Remove all stored values of the given session.
+
+        Raises
+        ------
+        SessionStateStorageError
+            Raised if the values can't be removed.
+        """
+        raise NotImplementedError
+
+
+def _zlib_encode(value: Any) -> bytes:
+    return zlib.compress(pickle.dumps(value))
+
+
+def _zlib_decode(data: bytes) -> Any:
+    return pickle.loads(zlib.decompress(data))
+
+
+# The codecs that Session State values can be encoded with, by the name used
+# for them in the server.sessionStatePersistenceCodec config option.
+CODECS: Final[dict[str, tuple[Callable[[Any], bytes], Callable[[bytes], Any]]]] = {
+    "pickle": (pickle.dumps, pickle.loads),
+    "zlib": (_zlib_encode, _zlib_decode),
+}
+
+
+class SessionStatePersister:
+    """Writes snapshots of Session State to a SessionStateStorage, and restores
+    them into new sessions.
+
+    Snapshots are incremental: only the values of user keys that were set since
+    the last snapshot of a session are encoded and written. (So values that are
+    mutated in place aren't written again until they're set.) Widget values
+    aren't persisted, since the frontend sends them again when it reconnects.
+
+    All storage access happens on script threads, so that a slow storage
+    doesn't block the eventloop.
+    """
+
+    def __init__(self, storage: SessionStateStorage, codec: str = "pickle") -> None:
+        """Create a SessionStatePersister.
+
+        Parameters
+        ----------
+        storage
+            The storage that snapshots are written to and restored from.
+
+        codec
+            The name of the codec in CODECS to encode values with.
+        """
+        if codec not in CODECS:
+            raise ValueError(
+                f"Unknown Session State codec {codec!r}. "
+                f"Valid codecs are: {', '.join(CODECS)}."
+            )
+        self._storage = storage
+        self._encode, self._decode = CODECS[codec]
+        # Mapping of the ID of a new session -> the ID of the session whose
+        # snapshot is restored into it at the start of its first script run.
+        self._pending_restores: dict[str, str] = {}
+        self._pending_restores_lock = threading.Lock()
+
+    def snapshot(self, session_id: str, session_state: SafeSessionState) -> None:
+        """Write the values of the session's state that changed since its last
+        snapshot.
+
+        Threading: SAFE. Should be called on the script thread, after the
+        script run finished.
+        """
+
+        def save(changed_values: Mapping[str, bytes], removed_keys: set[str]):
+            self._storage.save(session_id, changed_values, removed_keys)
+
+        try:
+            session_state.persist_changes(self._encode, save)
+        except SessionStateStorageError:
+            # The changes are written with the next snapshot instead.
+            _LOGGER.warning(
+                "Failed to write the Session State of session %s",
+                session_id,
+                exc_info=True,
+            )
+
+    def schedule_restore(self, old_session_id: str, new_session_id: str) -> None:
+        """Restore the last snapshot of the session with ID old_session_id into
+        the state of the session with ID new_session_id, when restore_pending
+        is called at the start of the new session's first script run.
+
+        Threading: SAFE. May be called on any thread.
+        """
+        with self._pending_restores_lock:
+            self._pending_restores[new_session_id] = old_session_id
+
+    def cancel_restore(self, session_id: str) -> None:
+        """Cancel the restore scheduled for the session with the given ID, if
+        any, e.g. because the session was closed before its first script run.
+
+        Threading: SAFE. May be called on any thread.
+        """
+        with self._pending_restores_lock:
+            self._pending_restores.pop(session_id, None)
+
+    def restore_pending(self, session_id: str, session_state: SafeSessionState) -> bool:
+        """Do the restore scheduled for the session with the given ID, if any.
+
+        Returns True if there was a snapshot to restore.
+
+        Threading: SAFE. Should be called on the script thread, before the
+        session's script runs.
+        """
+        with self._pending_restores_lock:
+            old_session_id = self._pending_restores.pop(session_id, None)
+        if old_session_id is None:
+            return False
+        return self.restore(old_session_id, session_id, session_state)
+
+    def restore(
+        self,
+        old_session_id: str,
+        new_session_id: str,
+        session_state: SafeSessionState,
+    ) -> bool:
+        """Restore the last snapshot of the session with ID old_session_id into
+        the state of a new session, and move the snapshot over to it.
+
+        Returns True if there was a snapshot to restore.
+
+        Threading: SAFE. Should be called on the script thread, before the new
+        session's first script run.
+        """
+        try:
+            encoded_values = self._storage.load(old_session_id)
+            if not encoded_values:
+                return False
+
+            values = {}
+            for key, data in encoded_values.items():
+                try:
+                    values[key] = self._decode(data)
+                except Exception:
+                    # E.g. the value's class no longer exists after an app update.
+                    _LOGGER.debug("Failed to decode Session State value %r", key)
+
+            self._storage.save(new_session_id, encoded_values, ())
+            self._storage.delete(old_session_id)
+        except SessionStateStorageError:
+            _LOGGER.warning(
+                "Failed to restore the Session State of session %s",
+                old_session_id,
+                exc_info=True,
+            )
+            return False
+
+        session_state.restore_persisted_values(values, encoded_values.keys())
+        return True
@@ -0,0 +1,159 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""SessionStateStorage implementation that stores values in an SQLite database."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+import time
+from typing import Collection, Mapping
+
+from streamlit.runtime.session_state_storage import (
+    SessionStateStorage,
+    SessionStateStorageError,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS session_state (
+    session_id TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    PRIMARY KEY (session_id, key)
+);
+"""
+
+
+class SQLiteSessionStateStorage(SessionStateStorage):
+    """A SessionStateStorage that stores values in an SQLite database file.
+
+    The values of a session are removed once they haven't been updated for
+    ttl_seconds.
+    """
+
+    def __init__(self, path: str, ttl_seconds: float = 24 * 60 * 60) -> None:
+        """Open (or create) the database at the given path.
+
+        Parameters
+        ----------
+        path
+            The path of the database file. Its parent directory is created if
+            it doesn't exist.
+
+        ttl_seconds
+            The time in seconds after its last update that the values of a
+            session are removed.
+
+        Raises
+        ------
+        SessionStateStorageError
+            Raised if the database can't be opened.
+        """
+        self._ttl_seconds = ttl_seconds
+        # Connections are used from the eventloop thread and from script
+        # threads, so access is serialized with a lock.
+        self._lock = threading.Lock()
+        try:
+            dirname = os.path.dirname(path)
+            if dirname:
+                os.makedirs(dirname, exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            # Writes happen after every script run that changed Session State,
+            # so they shouldn't wait for the disk. With WAL, a crash may lose
+            # the latest writes, but never corrupts the database.
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+            self._remove_expired()
+        except (OSError, sqlite3.Error) as e:
+            raise SessionStateStorageError(
+                f"Failed to open the Session State database at {path}"
+            ) from e
+
+    def load(self, session_id: str) -> dict[str, bytes]:
+        try:
+            with self._lock:
+                self._remove_expired()
+                rows = self._conn.execute(
+                    "SELECT key, value FROM session_state WHERE session_id = ?",
+                    (session_id,),
+                ).fetchall()
+        except sqlite3.Error as e:
+            raise SessionStateStorageError(
+                f"Failed to load the Session State of session {session_id}"
+            ) from e
+        return {key: bytes(value) for key, value in rows}
+
+    def save(
+        self,
+        session_id: str,
+        changed_values: Mapping[str, bytes],
+        removed_keys: Collection[str],
+    ) -> None:
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO sessions VALUES (?, ?)",
+                    (session_id, time.time()),
+                )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO session_state VALUES (?, ?, ?)",
+                    [(session_id, key, value) for key, value in changed_values.items()],
+                )
+                self._conn.executemany(
+                    "DELETE FROM session_state WHERE session_id = ? AND key = ?",
+                    [(session_id, key) for key in removed_keys],
+                )
+        except sqlite3.Error as e:
+            raise SessionStateStorageError(
+                f"Failed to save the Session State of session {session_id}"
+            ) from e
+
+    def delete(self, session_id: str) -> None:
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "DELETE FROM session_state WHERE session_id = ?", (session_id,)
+                )
+                self._conn.execute(
+                    "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+                )
+        except sqlite3.Error as e:
+            raise SessionStateStorageError(
+                f"Failed to delete the Session State of session {session_id}"
+            ) from e
+
+    def close(self) -> None:
+        """Close the database. The storage can't be used afterwards."""
+        with self._lock:
+            self._conn.close()
+
+    def _remove_expired(self) -> None:
+        """Remove the values of sessions that weren't updated within the TTL."""
+        expired_before = time.time() - self._ttl_seconds
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM session_state WHERE session_id IN "
+                "(SELECT session_id FROM sessions WHERE updated_at < ?)",
+                (expired_before,),
+            )
+            self._conn.execute(
+                "DELETE FROM sessions WHERE updated_at < ?", (expired_before,)
+            )
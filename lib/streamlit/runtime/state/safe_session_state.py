@@ -16,7 +16,7 @@ from __future__ import annotations
 
 import threading
 from contextlib import contextmanager
-from typing import TYPE_CHECKING, Any, Callable, Iterator
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator
 
 if TYPE_CHECKING:
     from streamlit.proto.WidgetStates_pb2 import WidgetState as WidgetStateProto
@@ -73,6 +73,20 @@ class SafeSessionState:
         with self._lock:
             self._state.maybe_check_serializable()
 
+    def persist_changes(
+        self,
+        encode: Callable[[Any], bytes],
+        save: Callable[[dict[str, bytes], set[str]], None],
+    ) -> None:
+        with self._lock:
+            self._state.persist_changes(encode, save)
+
+    def restore_persisted_values(
+        self, values: dict[str, Any], stored_keys: Iterable[str]
+    ) -> None:
+        with self._lock:
+            self._state.restore_persisted_values(values, stored_keys)
+
     def get_widget_states(self) -> list[WidgetStateProto]:
         """Return a list of serialized widget values for each widget with a value."""
         with self._lock:
@@ -88,6 +102,18 @@ class SafeSessionState:
         with self._lock:
             return self._state.filtered_state
 
+    def has_filtered_key(self, key: str) -> bool:
+        """True if `key` is in filtered_state, without building all of
+        filtered_state.
+        """
+        with self._lock:
+            return self._state.has_filtered_key(key)
+
+    def get_filtered_value(self, key: str) -> Any:
+        """Return `filtered_state[key]`, without building all of filtered_state."""
+        with self._lock:
+            return self._state.get_filtered_value(key)
+
     def __getitem__(self, key: str) -> Any:
         self._yield_callback()
         with self._lock:
@@ -16,12 +16,15 @@ from __future__ import annotations
 
 import json
 import pickle
+import zlib
 from copy import deepcopy
 from dataclasses import dataclass, field, replace
 from typing import (
     TYPE_CHECKING,
     Any,
+    Callable,
     Final,
+    Iterable,
     Iterator,
     KeysView,
     List,
@@ -59,6 +62,11 @@ SCRIPT_RUN_WITHOUT_ERRORS_KEY: Final = (
     f"{STREAMLIT_INTERNAL_KEY_PREFIX}_SCRIPT_RUN_WITHOUT_ERRORS"
 )
 
+# Values of these types can always be pickled.
+_ALWAYS_SERIALIZABLE_TYPES: Final = frozenset(
+    {bool, bytes, complex, float, int, str, type(None)}
+)
+
 
 @dataclass(frozen=True)
 class Serialized:
@@ -165,6 +173,10 @@ class WStates(MutableMapping[str, Any]):
     def values(self) -> set[Any]:  # type: ignore[override]
         return {self[wid] for wid in self}
 
+    def clear(self) -> None:
+        # MutableMapping.clear() would pop, and thereby deserialize, each value.
+        self.states.clear()
+
     def update(self, other: WStates) -> None:  # type: ignore[override]
         """Copy all widget values and metadata from 'other' into this mapping,
         overwriting any data in this mapping that's also present in 'other'.
@@ -190,15 +202,13 @@ class WStates(MutableMapping[str, Any]):
         fragment_ids_this_run: list[str] | None,
     ) -> None:
         """Remove widget state for stale widgets."""
-        self.states = {
-            k: v
-            for k, v in self.states.items()
-            if not _is_stale_widget(
-                self.widget_metadata.get(k),
-                active_widget_ids,
-                fragment_ids_this_run,
-            )
-        }
+        for widget_id in _get_stale_widget_ids(
+            self.states.keys(),
+            self.widget_metadata,
+            active_widget_ids,
+            fragment_ids_this_run,
+        ):
+            del self.states[widget_id]
 
     def get_serialized(self, k: str) -> WidgetStateProto | None:
         """Get the serialized value of the widget with the given id.
@@ -365,6 +375,21 @@ class SessionState:
     # widget state at one point.
     query_params: QueryParams = field(default_factory=QueryParams)
 
+    # Keys (or widget ids) whose values passed _check_serializable and haven't
+    # been written, or handed out to code that may mutate them, since.
+    _serializable_keys: set[str] = field(default_factory=set, compare=False)
+
+    # User keys whose values were passed to persist_changes and haven't been
+    # written since.
+    _persisted_keys: set[str] = field(default_factory=set, compare=False)
+
+    # User keys that have a value in the SessionStateStorage.
+    _stored_keys: set[str] = field(default_factory=set, compare=False)
+
+    # The values of _old_state, pickled and compressed, while the session
+    # hibernates.
+    _hibernated_state: bytes | None = field(default=None, compare=False)
+
     def __repr__(self):
         return util.repr_(self)
 
@@ -374,9 +399,14 @@ class SessionState:
         _old_state dict, and then clear our current session_state and
         widget_state.
         """
-        for key_or_wid in self:
+        wid_key_map = self._key_id_mapper.id_key_mapping
+        for key_or_wid in self._keys():
             try:
-                self._old_state[key_or_wid] = self[key_or_wid]
+                # Same as self[key_or_wid], without mapping keys to widget IDs
+                # again, which _keys() already did.
+                self._old_state[key_or_wid] = self._getitem(
+                    key_or_wid, wid_key_map.get(key_or_wid, key_or_wid)
+                )
             except KeyError:
                 # handle key errors from widget state not having metadata gracefully
                 # https://github.com/streamlit/streamlit/issues/7206
@@ -387,9 +417,14 @@ class SessionState:
     def clear(self) -> None:
         """Reset self completely, clearing all current and old values."""
         self._old_state.clear()
+        self._hibernated_state = None
         self._new_session_state.clear()
         self._new_widget_state.clear()
         self._key_id_mapper.clear()
+        self._serializable_keys.clear()
+        # _stored_keys is kept, so that the stored values are removed with the
+        # next snapshot.
+        self._persisted_keys.clear()
 
     @property
     def filtered_state(self) -> dict[str, Any]:
@@ -417,6 +452,28 @@ class SessionState:
 
         return state
 
+    def has_filtered_key(self, key: str) -> bool:
+        """True if `key` is in filtered_state, without building all of
+        filtered_state.
+        """
+        try:
+            self.get_filtered_value(key)
+        except KeyError:
+            return False
+        return True
+
+    def get_filtered_value(self, key: str) -> Any:
+        """Return `filtered_state[key]`, without building all of filtered_state.
+
+        Raises a KeyError if there's no such key. Like `_get_value`, this is for
+        values that aren't handed out to user code.
+        """
+        if is_element_id(key) or _is_internal_key(key):
+            # These keys are never part of filtered_state. Keyed widgets are
+            # looked up by their user key instead.
+            raise KeyError(_missing_key_error_message(key))
+        return self._get_value(key)
+
     def _keys(self) -> set[str]:
         """All keys active in Session State, with widget keys converted
         to widget ids when one is known. (This includes autogenerated keys
@@ -445,6 +502,15 @@ class SessionState:
         return len(self._keys())
 
     def __getitem__(self, key: str) -> Any:
+        # The caller may mutate the value in place, so it needs to be checked
+        # for serializability again. (It's only persisted again once it's set,
+        # so that large values that are only read aren't encoded and written
+        # after every script run.)
+        self._serializable_keys.discard(self._get_widget_id(key))
+        return self._get_value(key)
+
+    def _get_value(self, key: str) -> Any:
+        """Same as self[key], for values that aren't handed out to user code."""
         wid_key_map = self._key_id_mapper.id_key_mapping
         widget_id = self._get_widget_id(key)
 
@@ -519,9 +585,12 @@ class SessionState:
                 )
 
         self._new_session_state[user_key] = value
+        self._value_may_have_changed(user_key)
+        self._value_may_have_changed(self._get_widget_id(user_key))
 
     def __delitem__(self, key: str) -> None:
         widget_id = self._get_widget_id(key)
+        self._value_may_have_changed(widget_id)
 
         if not (key in self or widget_id in self):
             raise KeyError(_missing_key_error_message(key))
@@ -545,6 +614,7 @@ class SessionState:
         """Set the value of all widgets represented in the given WidgetStatesProto."""
         for state in widget_states.widgets:
             self._new_widget_state.set_widget_from_proto(state)
+            self._value_may_have_changed(state.id)
 
     def on_script_will_rerun(self, latest_widget_states: WidgetStatesProto) -> None:
         """Called by ScriptRunner before its script re-runs.
@@ -564,8 +634,17 @@ class SessionState:
         """
         from streamlit.runtime.scriptrunner import RerunException
 
+        # Only widgets with a callback are checked for changes, since checking
+        # deserializes the widget's new value. All others are deserialized
+        # once they're accessed or registered, if at all. (E.g. a fragment run
+        # only registers the widgets of its fragments.)
+        widget_metadata = self._new_widget_state.widget_metadata
         changed_widget_ids = [
-            wid for wid in self._new_widget_state if self._widget_changed(wid)
+            wid
+            for wid in self._new_widget_state
+            if (metadata := widget_metadata.get(wid)) is not None
+            and metadata.callback is not None
+            and self._widget_changed(wid)
         ]
         for wid in changed_widget_ids:
             try:
@@ -627,28 +706,41 @@ class SessionState:
 
         # Remove entries from _old_state corresponding to
         # widgets not in widget_ids.
-        self._old_state = {
-            k: v
-            for k, v in self._old_state.items()
-            if (
-                not is_element_id(k)
-                or not _is_stale_widget(
-                    self._new_widget_state.widget_metadata.get(k),
-                    active_widget_ids,
-                    ctx.fragment_ids_this_run,
-                )
-            )
-        }
+        for key in _get_stale_widget_ids(
+            self._old_state.keys(),
+            self._new_widget_state.widget_metadata,
+            active_widget_ids,
+            ctx.fragment_ids_this_run,
+        ):
+            if is_element_id(key):
+                del self._old_state[key]
 
     def _set_widget_metadata(self, widget_metadata: WidgetMetadata[Any]) -> None:
         """Set a widget's metadata."""
         widget_id = widget_metadata.id
+        if isinstance(self._new_widget_state.states.get(widget_id), Serialized):
+            # A value received from the frontend is deserialized with the
+            # metadata of the run it was received for, which is about to be
+            # replaced.
+            try:
+                self._new_widget_state[widget_id]
+            except KeyError:
+                # There's no metadata yet, so the value gets deserialized with
+                # the new one.
+                pass
         self._new_widget_state.widget_metadata[widget_id] = widget_metadata
 
     def get_widget_states(self) -> list[WidgetStateProto]:
         """Return a list of serialized widget values for each widget with a value."""
         return self._new_widget_state.as_widget_states()
 
+    def _value_may_have_changed(self, key_or_wid: str) -> None:
+        """Forget that the value with the given key or widget id was checked
+        for serializability and persisted.
+        """
+        self._serializable_keys.discard(key_or_wid)
+        self._persisted_keys.discard(key_or_wid)
+
     def _get_widget_id(self, k: str) -> str:
         """Turns a value that might be a widget id or a user provided key into
         an appropriate widget id.
@@ -682,11 +774,12 @@ class SessionState:
             deserializer = metadata.deserializer
             initial_widget_value = deepcopy(deserializer(None, metadata.id))
             self._new_widget_state.set_from_value(widget_id, initial_widget_value)
+            self._value_may_have_changed(widget_id)
 
         # Get the current value of the widget for use as its return value.
         # We return a copy, so that reference types can't be accidentally
         # mutated by user code.
-        widget_value = cast(T, self[widget_id])
+        widget_value = cast(T, self._get_value(widget_id))
         widget_value = deepcopy(widget_value)
 
         # widget_value_changed indicates to the caller that the widget's
@@ -699,7 +792,7 @@ class SessionState:
 
     def __contains__(self, key: str) -> bool:
         try:
-            self[key]
+            self._get_value(key)
         except KeyError:
             return False
         else:
@@ -716,16 +809,27 @@ class SessionState:
         """Verify that everything added to session state can be serialized.
         We use pickleability as the metric for serializability, and test for
         pickleability by just trying it.
+
+        Values that passed the check before, and haven't been written or
+        handed out to user code since, aren't checked again.
         """
-        for k in self:
-            try:
-                pickle.dumps(self[k])
-            except Exception as e:
-                err_msg = f"""Cannot serialize the value (of type `{type(self[k])}`) of '{k}' in st.session_state.
+        serializable_keys: set[str] = set()
+        for k in self._keys():
+            if k not in self._serializable_keys:
+                value = self._get_value(k)
+                try:
+                    if type(value) not in _ALWAYS_SERIALIZABLE_TYPES:
+                        pickle.dumps(value)
+                except Exception as e:
+                    err_msg = f"""Cannot serialize the value (of type `{type(value)}`) of '{k}' in st.session_state.
                 Streamlit has been configured to use [pickle](https://docs.python.org/3/library/pickle.html) to
                 serialize session_state values. Please convert the value to a pickle-serializable type. To learn
                 more about this behavior, see [our docs](https://docs.streamlit.io/knowledge-base/using-streamlit/serializable-session-state). """
-                raise UnserializableSessionStateError(err_msg) from e
+                    raise UnserializableSessionStateError(err_msg) from e
+            serializable_keys.add(k)
+        # Only values that haven't changed since they were last checked are
+        # skipped next time.
+        self._serializable_keys = serializable_keys
 
     def maybe_check_serializable(self) -> None:
         """Verify that session state can be serialized, if the relevant config
@@ -735,6 +839,79 @@ class SessionState:
         if config.get_option("runner.enforceSerializableSessionState"):
             self._check_serializable()
 
+    def hibernate(self) -> bool:
+        """Replace all values with a compressed pickle of them, to save memory
+        while the session is idle. `wake` must be called before the state is
+        used again.
+
+        Returns False, leaving the values in place, if they can't be pickled.
+        Values are restored as copies, so objects that are shared with other
+        sessions (e.g. cached resources) stop being shared.
+        """
+        if self._hibernated_state is not None:
+            return True
+
+        # Compacting is done at the start of each script run anyway, and
+        # leaves all values in _old_state.
+        self._compact_state()
+        try:
+            hibernated_state = zlib.compress(pickle.dumps(self._old_state))
+        except Exception:
+            return False
+
+        self._hibernated_state = hibernated_state
+        self._old_state = {}
+        return True
+
+    def wake(self) -> None:
+        """Restore the values replaced by `hibernate`."""
+        if self._hibernated_state is not None:
+            self._old_state = pickle.loads(zlib.decompress(self._hibernated_state))
+            self._hibernated_state = None
+
+    def persist_changes(
+        self,
+        encode: Callable[[Any], bytes],
+        save: Callable[[dict[str, bytes], set[str]], None],
+    ) -> None:
+        """Pass the values of user keys that changed since the last call,
+        encoded with `encode`, and the keys that were removed since, to `save`.
+
+        Values that can't be encoded are treated as removed. Widget values
+        aren't included. If `save` raises, its changes are passed again on the
+        next call.
+        """
+        keys = {
+            k for k in self._keys() if not is_element_id(k) and not _is_internal_key(k)
+        }
+        changed_values: dict[str, bytes] = {}
+        unencodable_keys: set[str] = set()
+        for k in keys - self._persisted_keys:
+            try:
+                changed_values[k] = encode(self._get_value(k))
+            except Exception:
+                unencodable_keys.add(k)
+
+        removed_keys = self._stored_keys - (keys - unencodable_keys)
+        if changed_values or removed_keys:
+            save(changed_values, removed_keys)
+
+        self._persisted_keys = keys
+        self._stored_keys = (self._stored_keys - removed_keys) | changed_values.keys()
+
+    def restore_persisted_values(
+        self, values: dict[str, Any], stored_keys: Iterable[str]
+    ) -> None:
+        """Set values restored from a SessionStateStorage, as if they were set
+        in a previous script run.
+
+        `stored_keys` are the keys that have a value in the storage, which
+        may include keys whose values couldn't be restored.
+        """
+        self._old_state.update(values)
+        self._persisted_keys.update(values.keys())
+        self._stored_keys.update(stored_keys)
+
 
 def _is_internal_key(key: str) -> bool:
     return key.startswith(STREAMLIT_INTERNAL_KEY_PREFIX)
@@ -757,6 +934,30 @@ def _is_stale_widget(
     return True
 
 
+def _get_stale_widget_ids(
+    widget_ids: KeysView[str],
+    widget_metadata: dict[str, WidgetMetadata[Any]],
+    active_widget_ids: set[str],
+    fragment_ids_this_run: list[str] | None,
+) -> set[str]:
+    """Return the IDs in widget_ids that `_is_stale_widget` considers stale.
+
+    Widgets that were active in this run and have metadata are never stale, so
+    only the remaining ones, usually few even in apps with thousands of
+    widgets, are checked one by one.
+    """
+    candidate_ids = (widget_ids - active_widget_ids) | (
+        widget_ids - widget_metadata.keys()
+    )
+    return {
+        widget_id
+        for widget_id in candidate_ids
+        if _is_stale_widget(
+            widget_metadata.get(widget_id), active_widget_ids, fragment_ids_this_run
+        )
+    }
+
+
 @dataclass
 class SessionStateStatProvider(CacheStatsProvider):
     _session_mgr: SessionManager
@@ -14,10 +14,13 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Callable, Final, List, cast
+import asyncio
+import weakref
+from typing import TYPE_CHECKING, Callable, Final, List, NamedTuple, cast
 
+from streamlit import config
 from streamlit.logger import get_logger
-from streamlit.runtime.app_session import AppSession
+from streamlit.runtime.app_session import AppSession, HibernationResult
 from streamlit.runtime.session_manager import (
     ActiveSessionInfo,
     SessionClient,
@@ -34,6 +37,23 @@ if TYPE_CHECKING:
 _LOGGER: Final = get_logger(__name__)
 
 
+class ReconnectStats(NamedTuple):
+    """Counters of the reconnects to disconnected sessions, for tuning the
+    SessionStorage.
+
+    Properties
+    ----------
+    hits : int
+        The number of reconnects that found their session in the storage.
+    misses : int
+        The number of reconnects that didn't find their session, e.g. because it
+        expired or was evicted from the storage, and got a new session instead.
+    """
+
+    hits: int
+    misses: int
+
+
 class WebsocketSessionManager(SessionManager):
     """A SessionManager used to manage sessions with lifecycles tied to those of a
     browser tab's websocket connection.
@@ -56,9 +76,20 @@ class WebsocketSessionManager(SessionManager):
         self._script_cache = script_cache
         self._message_enqueued_callback = message_enqueued_callback
 
+        # Mapping of AppSession.id -> the timer that hibernates the session,
+        # for disconnected sessions that don't hibernate yet.
+        self._hibernation_timers: dict[str, asyncio.TimerHandle] = {}
+
         # Mapping of AppSession.id -> ActiveSessionInfo.
         self._active_session_info_by_id: dict[str, ActiveSessionInfo] = {}
 
+        self._reconnect_hits = 0
+        self._reconnect_misses = 0
+
+    @property
+    def reconnect_stats(self) -> ReconnectStats:
+        return ReconnectStats(hits=self._reconnect_hits, misses=self._reconnect_misses)
+
     def connect_session(
         self,
         client: SessionClient,
@@ -77,14 +108,20 @@ class WebsocketSessionManager(SessionManager):
                 existing_session_id,
             )
 
-        session_info = (
+        session_info = None
+        if (
             existing_session_id
             and existing_session_id not in self._active_session_info_by_id
-            and self._session_storage.get(existing_session_id)
-        )
+        ):
+            session_info = self._session_storage.get(existing_session_id)
+            if session_info is None:
+                self._reconnect_misses += 1
+            else:
+                self._reconnect_hits += 1
 
         if session_info:
             existing_session = session_info.session
+            self._cancel_hibernation(existing_session.id)
             existing_session.register_file_watchers()
 
             self._active_session_info_by_id[existing_session.id] = ActiveSessionInfo(
@@ -133,6 +170,44 @@ class WebsocketSessionManager(SessionManager):
             )
             del self._active_session_info_by_id[session_id]
 
+            hibernation_delay = config.get_option(
+                "server.disconnectedSessionHibernationDelay"
+            )
+            if hibernation_delay > 0:
+                self._schedule_hibernation(session, hibernation_delay)
+
+    def _schedule_hibernation(self, session: AppSession, delay: float) -> None:
+        # The timer only holds a weak reference to the session, so that it
+        # doesn't keep a session alive that was removed from the session
+        # storage, e.g. because it expired.
+        self._hibernation_timers[session.id] = asyncio.get_running_loop().call_later(
+            delay, self._hibernate_session, session.id, weakref.ref(session), delay
+        )
+
+    def _hibernate_session(
+        self, session_id: str, session_ref: weakref.ref[AppSession], delay: float
+    ) -> None:
+        del self._hibernation_timers[session_id]
+        session = session_ref()
+        if session is None:
+            return
+
+        result = session.hibernate()
+        if result == HibernationResult.BUSY:
+            # The session's script is still stopping.
+            self._schedule_hibernation(session, delay)
+        elif result == HibernationResult.FAILED:
+            _LOGGER.debug(
+                "Session %s can't hibernate, since its Session State can't be "
+                "compressed",
+                session_id,
+            )
+
+    def _cancel_hibernation(self, session_id: str) -> None:
+        timer = self._hibernation_timers.pop(session_id, None)
+        if timer is not None:
+            timer.cancel()
+
     def get_active_session_info(self, session_id: str) -> ActiveSessionInfo | None:
         return self._active_session_info_by_id.get(session_id)
 
@@ -143,6 +218,7 @@ class WebsocketSessionManager(SessionManager):
         return list(self._active_session_info_by_id.values())
 
     def close_session(self, session_id: str) -> None:
+        self._cancel_hibernation(session_id)
         if session_id in self._active_session_info_by_id:
             active_session_info = self._active_session_info_by_id[session_id]
             del self._active_session_info_by_id[session_id]
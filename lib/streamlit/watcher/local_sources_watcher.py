@@ -16,6 +16,8 @@ from __future__ import annotations
 
 import os
 import sys
+import threading
+import weakref
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, Callable, Final, NamedTuple
 
@@ -26,6 +28,7 @@ from streamlit.watcher.path_watcher import (
     NoOpPathWatcher,
     get_default_path_watcher_class,
 )
+from streamlit.watcher.shared_path_watcher import SharedPathWatcher
 
 if TYPE_CHECKING:
     from types import ModuleType
@@ -133,7 +136,9 @@ class LocalSourcesWatcher:
 
         try:
             wm = WatchedModule(
-                watcher=PathWatcher(filepath, self.on_file_changed),
+                watcher=SharedPathWatcher(
+                    filepath, self.on_file_changed, watcher_class=PathWatcher
+                ),
                 module_name=module_name,
             )
         except PermissionError:
@@ -168,22 +173,73 @@ class LocalSourcesWatcher:
         if self._is_closed:
             return
 
-        if set(sys.modules) != self._cached_sys_modules:
-            modules_paths = {
-                name: self._exclude_blacklisted_paths(get_module_paths(module))
-                for name, module in dict(sys.modules).items()
-            }
-            self._cached_sys_modules = set(sys.modules)
-            self._register_necessary_watchers(modules_paths)
+        if sys.modules.keys() == self._cached_sys_modules:
+            return
+
+        modules = dict(sys.modules)
+
+        # Only modules imported since the last update need to be looked at. The
+        # watchers of the modules that were seen before are still registered,
+        # and modules that were unloaded are looked at again if they're
+        # re-imported.
+        new_module_names = modules.keys() - self._cached_sys_modules
+        self._cached_sys_modules = set(modules)
+
+        modules_paths = {
+            name: _module_paths_cache.get_paths(modules[name])
+            for name in new_module_names
+        }
+        self._register_necessary_watchers(modules_paths)
 
     def _register_necessary_watchers(self, module_paths: dict[str, set[str]]) -> None:
         for name, paths in module_paths.items():
             for path in paths:
-                if self._file_should_be_watched(path):
+                # Matching the blacklist globs is the slowest check, and most
+                # modules are already ruled out by _file_should_be_watched.
+                if not self._file_should_be_watched(path):
+                    continue
+                if not self._folder_black_list.is_blacklisted(path):
+                    # Only the paths that are watched are resolved, since
+                    # resolving touches the filesystem.
                     self._register_watcher(str(Path(path).resolve()), name)
 
-    def _exclude_blacklisted_paths(self, paths: set[str]) -> set[str]:
-        return {p for p in paths if not self._folder_black_list.is_blacklisted(p)}
+
+class _ModulePathsCache:
+    """Caches the paths of imported modules for all LocalSourcesWatchers in
+    the process.
+
+    Finding a module's paths takes several filesystem calls, and the watchers
+    of all sessions need them for the same modules. Entries are keyed by the
+    module object, so a module that is re-imported is looked at again, and
+    entries go away with the modules they belong to.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._paths: weakref.WeakKeyDictionary[Any, set[str]] = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def get_paths(self, module: ModuleType) -> set[str]:
+        """Return the module's absolute paths (see get_module_paths)."""
+        try:
+            with self._lock:
+                paths = self._paths.get(module)
+        except TypeError:
+            # sys.modules may contain objects that can't be weakly referenced.
+            return get_module_paths(module)
+
+        if paths is None:
+            # Computed outside of the lock, since it touches the filesystem.
+            # Two threads may both compute the paths of a new module, which is
+            # harmless.
+            paths = get_module_paths(module)
+            with self._lock:
+                self._paths[module] = paths
+        return paths
+
+
+_module_paths_cache: Final = _ModulePathsCache()
 
 
 def get_module_paths(module: ModuleType) -> set[str]:
@@ -16,8 +16,8 @@
 
 from __future__ import annotations
 
+import threading
 import time
-from concurrent.futures import ThreadPoolExecutor
 from typing import Callable, Final
 
 from streamlit.logger import get_logger
@@ -26,15 +26,83 @@ from streamlit.watcher import util
 
 _LOGGER: Final = get_logger(__name__)
 
-_MAX_WORKERS: Final = 4
 _POLLING_PERIOD_SECS: Final = 0.2
 
+# Watchers are spread over the slots of a timer wheel, and each tick of the
+# poller thread checks the watchers of one slot. So each path is checked once
+# per polling period, but the checks of many paths don't all happen at once.
+_NUM_WHEEL_SLOTS: Final = 8
+_TICK_SECS: Final = _POLLING_PERIOD_SECS / _NUM_WHEEL_SLOTS
+
+
+class _Poller:
+    """Checks the paths of all PollingPathWatchers from a single thread.
+
+    The thread is started when the first watcher is added, and exits once no
+    watchers are left.
+    """
+
+    def __init__(self) -> None:
+        # Used for mutation of _wheel and _thread.
+        self._lock = threading.Lock()
+        self._wheel: list[set[PollingPathWatcher]] = [
+            set() for _ in range(_NUM_WHEEL_SLOTS)
+        ]
+        self._current_slot = 0
+        self._thread: threading.Thread | None = None
+
+    def __repr__(self) -> str:
+        return repr_(self)
+
+    def add(self, watcher: PollingPathWatcher) -> None:
+        with self._lock:
+            min(self._wheel, key=len).add(watcher)
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="PollingPathWatcher", daemon=True
+                )
+                self._thread.start()
+
+    def remove(self, watcher: PollingPathWatcher) -> None:
+        with self._lock:
+            for slot in self._wheel:
+                slot.discard(watcher)
+
+    def tick(self) -> None:
+        """Check the watchers in the current slot, and move on to the next."""
+        with self._lock:
+            watchers = list(self._wheel[self._current_slot])
+            self._current_slot = (self._current_slot + 1) % _NUM_WHEEL_SLOTS
+
+        for watcher in watchers:
+            try:
+                watcher._check_if_path_changed()
+            except Exception:
+                # E.g. the path was deleted. Like before there was a shared
+                # poller, the path is no longer watched.
+                _LOGGER.debug(
+                    "Stopped watching %s, since checking it failed.",
+                    watcher._path,
+                    exc_info=True,
+                )
+                watcher.close()
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(_TICK_SECS)
+            with self._lock:
+                if not any(self._wheel):
+                    self._thread = None
+                    return
+            self.tick()
+
+
+_poller: Final = _Poller()
+
 
 class PollingPathWatcher:
     """Watches a path on disk via a polling loop."""
 
-    _executor = ThreadPoolExecutor(max_workers=_MAX_WORKERS)
-
     @staticmethod
     def close_all() -> None:
         """Close top-level watcher object.
@@ -55,7 +123,7 @@ class PollingPathWatcher:
         """Constructor.
 
         You do not need to retain a reference to a PollingPathWatcher to
-        prevent it from being garbage collected. (The global _executor object
+        prevent it from being garbage collected. (The global _poller object
         retains references to all active instances.)
         """
         # TODO(vdonato): Modernize this by switching to pathlib.
@@ -75,21 +143,13 @@ class PollingPathWatcher:
             glob_pattern=self._glob_pattern,
             allow_nonexistent=self._allow_nonexistent,
         )
-        self._schedule()
+        _poller.add(self)
 
     def __repr__(self) -> str:
         return repr_(self)
 
-    def _schedule(self) -> None:
-        def task():
-            time.sleep(_POLLING_PERIOD_SECS)
-            self._check_if_path_changed()
-
-        PollingPathWatcher._executor.submit(task)
-
     def _check_if_path_changed(self) -> None:
         if not self._active:
-            # Don't call self._schedule()
             return
 
         modification_time = util.path_modification_time(
@@ -98,7 +158,6 @@ class PollingPathWatcher:
         # We add modification_time != 0.0 check since on some file systems (s3fs/fuse)
         # modification_time is always 0.0 because of file system limitations.
         if modification_time != 0.0 and modification_time <= self._modification_time:
-            self._schedule()
             return
 
         self._modification_time = modification_time
@@ -109,7 +168,6 @@ class PollingPathWatcher:
             allow_nonexistent=self._allow_nonexistent,
         )
         if md5 == self._md5:
-            self._schedule()
             return
 
         self._md5 = md5
@@ -117,8 +175,7 @@ class PollingPathWatcher:
         _LOGGER.debug("Change detected: %s", self._path)
         self._on_changed(self._path)
 
-        self._schedule()
-
     def close(self) -> None:
         """Stop watching the file system."""
         self._active = False
+        _poller.remove(self)
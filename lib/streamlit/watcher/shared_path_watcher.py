@@ -0,0 +1,152 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Lets all sessions share a single PathWatcher per watched path."""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Final, NamedTuple
+
+from streamlit.logger import get_logger
+from streamlit.util import repr_
+
+if TYPE_CHECKING:
+    from streamlit.watcher.path_watcher import PathWatcherType
+
+_LOGGER: Final = get_logger(__name__)
+
+
+class _WatchKey(NamedTuple):
+    watcher_class: PathWatcherType
+    path: str
+    glob_pattern: str | None
+    allow_nonexistent: bool
+
+
+class _SharedWatch:
+    """A PathWatcher and the SharedPathWatchers subscribed to it."""
+
+    def __init__(self) -> None:
+        self.watcher: Any = None
+        # Replaced rather than mutated, so that dispatch() can iterate over it
+        # without holding the registry lock.
+        self.subscribers: tuple[SharedPathWatcher, ...] = ()
+
+    def dispatch(self, changed_path: str) -> None:
+        for subscriber in self.subscribers:
+            if subscriber._is_closed:
+                # It was closed since the dispatch started.
+                continue
+            try:
+                subscriber.on_changed(changed_path)
+            except Exception:
+                _LOGGER.exception("Path change callback raised: %s", changed_path)
+
+
+# Used for mutation of _shared_watches and of their subscribers.
+_lock: Final = threading.Lock()
+_shared_watches: dict[_WatchKey, _SharedWatch] = {}
+
+
+class SharedPathWatcher:
+    """Subscribes to changes of a path, sharing its PathWatcher with all other
+    SharedPathWatchers of that path.
+
+    Every session's LocalSourcesWatcher watches the same source files. Rather
+    than each of them creating PathWatchers of their own, which would each check
+    (and hash) a file when it changes, the first subscription to a path creates
+    a PathWatcher for it and the last one to be closed closes it. A change is
+    checked once and then dispatched to all subscribers.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        on_changed: Callable[[str], None],
+        *,  # keyword-only arguments:
+        watcher_class: PathWatcherType,
+        glob_pattern: str | None = None,
+        allow_nonexistent: bool = False,
+    ) -> None:
+        """Constructor.
+
+        Parameters
+        ----------
+        path
+            The path to watch.
+        on_changed
+            Called with the path when it changes.
+        watcher_class
+            The PathWatcher class to watch the path with, if it isn't being
+            watched yet.
+        glob_pattern
+            Passed on to the PathWatcher.
+        allow_nonexistent
+            Passed on to the PathWatcher.
+        """
+        self.on_changed = on_changed
+        self._key = _WatchKey(watcher_class, path, glob_pattern, allow_nonexistent)
+        self._is_closed = False
+
+        with _lock:
+            shared_watch = _shared_watches.get(self._key)
+            if shared_watch is not None:
+                shared_watch.subscribers = (*shared_watch.subscribers, self)
+                return
+
+        # Creating a PathWatcher may be slow (e.g. the polling one hashes the
+        # file), so it happens without holding the lock. This may raise, e.g. a
+        # PermissionError, in which case nothing has been registered.
+        new_watch = _SharedWatch()
+        new_watch.watcher = watcher_class(
+            path,
+            new_watch.dispatch,
+            glob_pattern=glob_pattern,
+            allow_nonexistent=allow_nonexistent,
+        )
+
+        with _lock:
+            shared_watch = _shared_watches.setdefault(self._key, new_watch)
+            shared_watch.subscribers = (*shared_watch.subscribers, self)
+
+        if shared_watch is not new_watch:
+            # Another thread registered the path in the meantime.
+            new_watch.watcher.close()
+
+    def __repr__(self) -> str:
+        return repr_(self)
+
+    def close(self) -> None:
+        """Unsubscribe, and stop watching the path if this was its last
+        subscription.
+        """
+        with _lock:
+            if self._is_closed:
+                return
+            self._is_closed = True
+
+            shared_watch = _shared_watches.get(self._key)
+            if shared_watch is None:
+                return
+
+            shared_watch.subscribers = tuple(
+                s for s in shared_watch.subscribers if s is not self
+            )
+            if shared_watch.subscribers:
+                return
+
+            del _shared_watches[self._key]
+
+        shared_watch.watcher.close()
@@ -22,9 +22,14 @@ from __future__ import annotations
 
 import hashlib
 import os
+import threading
 import time
 from pathlib import Path
+from typing import Final, NamedTuple
 
+from cachetools import LRUCache
+
+from streamlit import config
 from streamlit.util import HASHLIB_KWARGS
 
 # How many times to try to grab the MD5 hash.
@@ -33,6 +38,38 @@ _MAX_RETRIES = 5
 # How long to wait between retries.
 _RETRY_WAIT_SECS = 0.1
 
+# Files are hashed in chunks of this size, so they're never read into memory
+# all at once.
+_HASH_CHUNK_SIZE: Final = 1024 * 1024
+
+# A file modified this shortly before it was hashed may have been modified
+# again since without its modification time changing, on file systems with a
+# coarse timestamp resolution (e.g. 2s for FAT). Hashes of such files aren't
+# reused.
+_RACY_MTIME_WINDOW_NS: Final = 2_000_000_000
+
+# The max number of file hashes that are kept for reuse. Watchers of a file may
+# come and go (e.g. when sessions disconnect), so hashes are kept for the most
+# recently hashed files rather than only for currently watched ones.
+_MAX_FILE_HASHES: Final = 10_000
+
+
+class _FileSignature(NamedTuple):
+    mtime_ns: int
+    size: int
+    inode: int
+
+
+class _FileHash(NamedTuple):
+    signature: _FileSignature
+    md5: str
+    hashed_at_ns: int
+
+
+# The last hash of each recently hashed file, by path.
+_file_hashes: LRUCache[str, _FileHash] = LRUCache(maxsize=_MAX_FILE_HASHES)
+_file_hashes_lock: Final = threading.Lock()
+
 
 def calc_md5_with_blocking_retries(
     path: str,
@@ -56,7 +93,7 @@ def calc_md5_with_blocking_retries(
         glob_pattern = glob_pattern or "*"
         content = _stable_dir_identifier(path, glob_pattern).encode("UTF-8")
     else:
-        content = _get_file_content_with_blocking_retries(path)
+        return _calc_file_md5_with_blocking_retries(path)
 
     md5 = hashlib.md5(**HASHLIB_KWARGS)
     md5.update(content)
@@ -65,6 +102,50 @@ def calc_md5_with_blocking_retries(
     return md5.hexdigest()
 
 
+def _calc_file_md5_with_blocking_retries(file_path: str) -> str:
+    """Calculate the MD5 checksum of a file, without reading it if possible.
+
+    A file's modification time, size and inode are compared first, and the
+    file is only hashed again if they changed since its last hash. Files larger
+    than server.fileWatcherMaxHashSize are never read. Their checksum is
+    calculated from these stats instead.
+    """
+    signature = _get_file_signature(file_path)
+    if signature is None:
+        # The file can't be stat'ed, e.g. because it's being replaced. Just
+        # try to hash it.
+        return _hash_file_with_blocking_retries(file_path)
+
+    max_hash_size = config.get_option("server.fileWatcherMaxHashSize") * 1024 * 1024
+    if signature.size > max_hash_size:
+        md5 = hashlib.md5(**HASHLIB_KWARGS)
+        md5.update(f"{file_path}+{signature}".encode())
+        return md5.hexdigest()
+
+    with _file_hashes_lock:
+        file_hash: _FileHash | None = _file_hashes.get(file_path)
+    if (
+        file_hash is not None
+        and file_hash.signature == signature
+        and signature.mtime_ns + _RACY_MTIME_WINDOW_NS < file_hash.hashed_at_ns
+    ):
+        return file_hash.md5
+
+    hashed_at_ns = time.time_ns()
+    md5_hexdigest = _hash_file_with_blocking_retries(file_path)
+    with _file_hashes_lock:
+        _file_hashes[file_path] = _FileHash(signature, md5_hexdigest, hashed_at_ns)
+    return md5_hexdigest
+
+
+def _get_file_signature(file_path: str) -> _FileSignature | None:
+    try:
+        stat = os.stat(file_path)
+    except OSError:
+        return None
+    return _FileSignature(stat.st_mtime_ns, stat.st_size, stat.st_ino)
+
+
 def path_modification_time(path: str, allow_nonexistent: bool = False) -> float:
     """Return the modification time of a path (file or directory).
 
@@ -84,21 +165,22 @@ def path_modification_time(path: str, allow_nonexistent: bool = False) -> float:
     return os.stat(path).st_mtime
 
 
-def _get_file_content_with_blocking_retries(file_path: str) -> bytes:
-    content = b""
+def _hash_file_with_blocking_retries(file_path: str) -> str:
     # There's a race condition where sometimes file_path no longer exists when
     # we try to read it (since the file is in the process of being written).
     # So here we retry a few times using this loop. See issue #186.
     for i in range(_MAX_RETRIES):
+        md5 = hashlib.md5(**HASHLIB_KWARGS)
         try:
             with open(file_path, "rb") as f:
-                content = f.read()
+                while chunk := f.read(_HASH_CHUNK_SIZE):
+                    md5.update(chunk)
                 break
         except FileNotFoundError as e:
             if i >= _MAX_RETRIES - 1:
                 raise e
             time.sleep(_RETRY_WAIT_SECS)
-    return content
+    return md5.hexdigest()
 
 
 def _dirfiles(dir_path: str, glob_pattern: str) -> str:
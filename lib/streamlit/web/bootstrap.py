@@ -14,19 +14,37 @@
 
 from __future__ import annotations
 
+import ast
 import asyncio
+import importlib
 import os
 import signal
 import sys
-from typing import Any, Final
-
-from streamlit import cli_util, config, env_util, file_util, net_util, secrets
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from timeit import default_timer as timer
+from typing import TYPE_CHECKING, Any, Final
+
+from streamlit import (
+    cli_util,
+    config,
+    env_util,
+    file_util,
+    net_util,
+    runtime,
+    secrets,
+    source_util,
+)
 from streamlit.config import CONFIG_FILENAMES
 from streamlit.git_util import MIN_GIT_VERSION, GitRepo
 from streamlit.logger import get_logger
+from streamlit.vendor.ipython.modified_sys_path import modified_sys_path
 from streamlit.watcher import report_watchdog_availability, watch_file
 from streamlit.web.server import Server, server_address_is_unix_socket, server_util
 
+if TYPE_CHECKING:
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
 _LOGGER: Final = get_logger(__name__)
 
 
@@ -115,6 +133,15 @@ def _on_server_start(server: Server) -> None:
     except Exception as ex:
         _LOGGER.error("Failed to load secrets.toml file", exc_info=ex)
 
+    if config.get_option("runner.preloadScripts"):
+        threading.Thread(
+            target=_preload_page_scripts,
+            args=(server.main_script_path, runtime.get_instance().script_cache),
+            kwargs={"preload_imports": config.get_option("runner.preloadImports")},
+            name="ScriptPreloader",
+            daemon=True,
+        ).start()
+
     def maybe_open_browser():
         if config.get_option("server.headless"):
             # Don't open browser when in headless mode.
@@ -136,6 +163,89 @@ def _on_server_start(server: Server) -> None:
     asyncio.get_running_loop().call_soon(maybe_open_browser)
 
 
+def _get_top_level_imports(source: str) -> list[str]:
+    """Return the names of the modules that the given source imports at its top
+    level. Relative imports and imports inside functions, classes or
+    conditionals are skipped.
+    """
+    module_names: list[str] = []
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.Import):
+            module_names.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            module_names.append(node.module)
+    return module_names
+
+
+def _preload_page_scripts(
+    main_script_path: str, script_cache: ScriptCache, preload_imports: bool
+) -> None:
+    """Compile the app's known page scripts (the main script and the scripts
+    in its pages/ directory), so that the first visit of each page doesn't have
+    to. Optionally, also import the modules that the scripts import at their
+    top level.
+
+    Errors are logged and don't stop the other scripts from being preloaded.
+    """
+    start_time = timer()
+    script_paths = [
+        page["script_path"] for page in source_util.get_pages(main_script_path).values()
+    ]
+    find_time = timer() - start_time
+
+    def compile_script(script_path: str) -> float:
+        compile_start_time = timer()
+        try:
+            script_cache.get_bytecode(script_path)
+        except Exception as ex:
+            _LOGGER.debug("Failed to preload %s: %s", script_path, ex)
+        return timer() - compile_start_time
+
+    compile_start_time = timer()
+    with ThreadPoolExecutor(
+        max_workers=min(len(script_paths), os.cpu_count() or 1),
+        thread_name_prefix="ScriptPreloader.compile",
+    ) as executor:
+        compile_times = dict(
+            zip(script_paths, executor.map(compile_script, script_paths))
+        )
+    compile_time = timer() - compile_start_time
+
+    import_time = 0.0
+    if preload_imports:
+        import_start_time = timer()
+        module_names: dict[str, None] = {}
+        for script_path in script_paths:
+            try:
+                with source_util.open_python_file(script_path) as f:
+                    source = f.read()
+                module_names.update(dict.fromkeys(_get_top_level_imports(source)))
+            except Exception as ex:
+                _LOGGER.warning("Failed to find imports of %s: %s", script_path, ex)
+
+        # Like when the scripts run, modules next to the main script can be
+        # imported.
+        with modified_sys_path(os.path.dirname(main_script_path)):
+            for module_name in module_names:
+                try:
+                    importlib.import_module(module_name)
+                except Exception as ex:
+                    _LOGGER.warning("Failed to preload module %s: %s", module_name, ex)
+        import_time = timer() - import_start_time
+
+    _LOGGER.info(
+        "Preloaded %d page scripts in %.1f ms (finding pages: %.1f ms, "
+        "compiling: %.1f ms, importing: %.1f ms)",
+        len(script_paths),
+        (timer() - start_time) * 1000,
+        find_time * 1000,
+        compile_time * 1000,
+        import_time * 1000,
+    )
+    for script_path, script_compile_time in compile_times.items():
+        _LOGGER.debug("Compiled %s in %.1f ms", script_path, script_compile_time * 1000)
+
+
 def _fix_pydeck_mapbox_api_warning() -> None:
     """Sets MAPBOX_API_KEY environment variable needed for PyDeck otherwise it will throw an exception"""
 
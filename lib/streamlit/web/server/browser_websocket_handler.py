@@ -20,24 +20,39 @@ import json
 from typing import TYPE_CHECKING, Any, Awaitable, Final
 
 import tornado.concurrent
+import tornado.ioloop
 import tornado.locks
 import tornado.netutil
 import tornado.web
 import tornado.websocket
-from tornado.websocket import WebSocketHandler
+from tornado.websocket import WebSocketHandler, WebSocketProtocol, WebSocketProtocol13
 
 from streamlit import config
 from streamlit.logger import get_logger
 from streamlit.proto.BackMsg_pb2 import BackMsg
 from streamlit.runtime import Runtime, SessionClient, SessionClientDisconnectedError
-from streamlit.runtime.runtime_util import serialize_forward_msg
+from streamlit.runtime.runtime_util import (
+    pack_forward_msg_batch,
+    serialize_forward_msg,
+)
 from streamlit.web.server.server_util import is_url_from_allowed_origins
+from streamlit.web.server.websocket_compression import (
+    CompressingWebSocketProtocol,
+    WebSocketCompressionStats,
+)
 
 if TYPE_CHECKING:
+    from asyncio import Future
+
     from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 
 _LOGGER: Final = get_logger(__name__)
 
+# The subprotocol a client selects (as the first value of the Sec-WebSocket-Protocol
+# header) to receive ForwardMsgs in batch frames rather than one frame per message.
+# See `runtime_util.pack_forward_msg_batch` for the frame layout.
+BATCH_SUBPROTOCOL: Final = "streamlit-batch"
+
 
 class BrowserWebSocketHandler(WebSocketHandler, SessionClient):
     """Handles a WebSocket connection from the browser"""
@@ -45,6 +60,21 @@ class BrowserWebSocketHandler(WebSocketHandler, SessionClient):
     def initialize(self, runtime: Runtime) -> None:
         self._runtime = runtime
         self._session_id: str | None = None
+        # Serialized ForwardMsgs waiting to be sent in the next batch frame. This
+        # is only used if the client negotiated BATCH_SUBPROTOCOL.
+        self._batch_msgs: list[bytes] = []
+        self._batch_flush_scheduled = False
+        # Outbound byte accounting used to apply backpressure to clients that
+        # don't keep up with the data we're sending them.
+        self._buffered_bytes = 0
+        self._is_write_buffer_full = False
+        self._write_buffer_high_watermark = int(
+            config.get_option("server.websocketWriteBufferHighWatermark") * 1e6
+        )
+        self._write_buffer_low_watermark = int(
+            config.get_option("server.websocketWriteBufferLowWatermark") * 1e6
+        )
+        self._slow_client_timeout_handle: object | None = None
         # The XSRF cookie is normally set when xsrf_form_html is used, but in a
         # pure-Javascript application that does not use any regular forms we just
         # need to read the self.xsrf_token manually to set the cookie as a side
@@ -57,12 +87,130 @@ class BrowserWebSocketHandler(WebSocketHandler, SessionClient):
         """Set up CORS."""
         return super().check_origin(origin) or is_url_from_allowed_origins(origin)
 
+    @property
+    def is_batching_enabled(self) -> bool:
+        """True if the client negotiated receiving ForwardMsgs in batch frames."""
+        return self.selected_subprotocol == BATCH_SUBPROTOCOL
+
+    @property
+    def is_write_buffer_full(self) -> bool:
+        """True if the client isn't reading data as fast as we're writing it.
+
+        This becomes True once more than `server.websocketWriteBufferHighWatermark`
+        megabytes are waiting to be flushed to the socket, and stays True until
+        that amount drops to `server.websocketWriteBufferLowWatermark` megabytes.
+        """
+        return self._is_write_buffer_full
+
+    @property
+    def buffered_bytes(self) -> int:
+        """The number of bytes written to the websocket that haven't been flushed
+        to the socket yet.
+        """
+        return self._buffered_bytes
+
+    def _write_binary_message(self, data: bytes) -> None:
+        """Write a binary websocket message and account for its size until it's
+        flushed to the socket.
+        """
+        future = self.write_message(data, binary=True)
+
+        num_bytes = len(data)
+        self._buffered_bytes += num_bytes
+        if (
+            not self._is_write_buffer_full
+            and self._buffered_bytes > self._write_buffer_high_watermark
+        ):
+            _LOGGER.debug(
+                "Websocket write buffer above high watermark (%s bytes), "
+                "pausing ForwardMsgs for session %s",
+                self._buffered_bytes,
+                self._session_id,
+            )
+            self._is_write_buffer_full = True
+            self._slow_client_timeout_handle = (
+                tornado.ioloop.IOLoop.current().call_later(
+                    config.get_option("server.websocketSlowClientTimeout"),
+                    self._close_slow_client,
+                )
+            )
+
+        future.add_done_callback(lambda f: self._on_write_done(f, num_bytes))
+
+    def _on_write_done(self, future: Future[None], num_bytes: int) -> None:
+        if not future.cancelled():
+            # Retrieve the exception (if any) so that it isn't logged as
+            # unhandled. A failed write means the websocket was closed, which is
+            # handled by `on_close`.
+            future.exception()
+
+        self._buffered_bytes -= num_bytes
+        if (
+            self._is_write_buffer_full
+            and self._buffered_bytes <= self._write_buffer_low_watermark
+        ):
+            self._is_write_buffer_full = False
+            self._cancel_slow_client_timeout()
+            self._runtime.notify_write_buffer_drained()
+
+    def _close_slow_client(self) -> None:
+        """Close the websocket of a client that stayed above the high watermark
+        for too long.
+        """
+        self._slow_client_timeout_handle = None
+        _LOGGER.warning(
+            "Closing websocket for session %s: %s bytes weren't read by the client "
+            "within %s seconds.",
+            self._session_id,
+            self._buffered_bytes,
+            config.get_option("server.websocketSlowClientTimeout"),
+        )
+        self.close()
+
+    def _cancel_slow_client_timeout(self) -> None:
+        if self._slow_client_timeout_handle is not None:
+            tornado.ioloop.IOLoop.current().remove_timeout(
+                self._slow_client_timeout_handle
+            )
+            self._slow_client_timeout_handle = None
+
     def write_forward_msg(self, msg: ForwardMsg) -> None:
-        """Send a ForwardMsg to the browser."""
+        """Send a ForwardMsg to the browser.
+
+        If the client negotiated batch framing, the message is buffered, and all
+        messages written during the current eventloop iteration (i.e. during one
+        flush of the session's ForwardMsgQueue) are sent together in a single
+        frame.
+        """
+        if not self.is_batching_enabled:
+            try:
+                self._write_binary_message(serialize_forward_msg(msg))
+            except tornado.websocket.WebSocketClosedError as e:
+                raise SessionClientDisconnectedError from e
+            return
+
+        if self.ws_connection is None or self.ws_connection.is_closing():
+            raise SessionClientDisconnectedError
+
+        self._batch_msgs.append(serialize_forward_msg(msg))
+        if not self._batch_flush_scheduled:
+            self._batch_flush_scheduled = True
+            tornado.ioloop.IOLoop.current().add_callback(self._flush_batch)
+
+    def _flush_batch(self) -> None:
+        """Send all buffered ForwardMsgs to the browser in a single frame."""
+        self._batch_flush_scheduled = False
+        batch_msgs = self._batch_msgs
+        self._batch_msgs = []
+        if not batch_msgs:
+            return
+
         try:
-            self.write_message(serialize_forward_msg(msg), binary=True)
-        except tornado.websocket.WebSocketClosedError as e:
-            raise SessionClientDisconnectedError from e
+            self._write_binary_message(pack_forward_msg_batch(batch_msgs))
+        except tornado.websocket.WebSocketClosedError:
+            # The session is disconnected via `on_close`, which Tornado calls
+            # once the connection is closed, so we just drop the batch here.
+            _LOGGER.debug("Dropping ForwardMsg batch for closed websocket.")
 
     def select_subprotocol(self, subprotocols: list[str]) -> str | None:
         """Return the first subprotocol in the given list.
@@ -84,6 +232,9 @@ class BrowserWebSocketHandler(WebSocketHandler, SessionClient):
             protocol to "streamlit" and select that.
           - the second protocol in the list is reserved in some deployment environments
             for an auth token that we currently don't use
+
+        A client that wants to receive ForwardMsgs in batch frames sets the first
+        protocol to BATCH_SUBPROTOCOL instead of "streamlit".
         """
         if subprotocols:
             return subprotocols[0]
@@ -131,6 +282,20 @@ class BrowserWebSocketHandler(WebSocketHandler, SessionClient):
         return None
 
     def on_close(self) -> None:
+        self._batch_msgs = []
+        self._cancel_slow_client_timeout()
+        stats = self.compression_stats
+        if stats is not None and stats.compressed_msgs:
+            _LOGGER.debug(
+                "Websocket compression for session %s: %s messages compressed "
+                "from %s to %s bytes in %.1f ms, %s messages sent uncompressed.",
+                self._session_id,
+                stats.compressed_msgs,
+                stats.raw_bytes,
+                stats.wire_bytes,
+                stats.compression_time * 1000,
+                stats.uncompressed_msgs,
+            )
         if not self._session_id:
             return
         self._runtime.disconnect_session(self._session_id)
@@ -139,13 +304,47 @@ class BrowserWebSocketHandler(WebSocketHandler, SessionClient):
     def get_compression_options(self) -> dict[Any, Any] | None:
         """Enable WebSocket compression.
 
-        Returning an empty dict enables websocket compression. Returning
-        None disables it.
+        Returning a dict enables websocket compression with the given options.
+        Returning None disables it.
 
         (See the docstring in the parent class.)
         """
         if config.get_option("server.enableWebsocketCompression"):
-            return {}
+            return {
+                "compression_level": config.get_option(
+                    "server.websocketCompressionLevel"
+                ),
+                "mem_level": config.get_option("server.websocketCompressionMemLevel"),
+            }
+        return None
+
+    def get_websocket_protocol(self) -> WebSocketProtocol | None:
+        """Use a protocol that only compresses large enough messages, if
+        compression is enabled.
+        """
+        protocol = super().get_websocket_protocol()
+        if (
+            # Only WebSocketProtocol13 has the params that our protocol needs.
+            not isinstance(protocol, WebSocketProtocol13)
+            or self.get_compression_options() is None
+        ):
+            return protocol
+
+        return CompressingWebSocketProtocol(
+            self,
+            protocol.params,
+            min_compressed_size=config.get_option("server.websocketCompressionMinSize"),
+            offload_size=int(
+                config.get_option("server.websocketCompressionOffloadSize") * 1e6
+            ),
+            window_bits=config.get_option("server.websocketCompressionWindowBits"),
+        )
+
+    @property
+    def compression_stats(self) -> WebSocketCompressionStats | None:
+        """Outbound compression counters, or None if compression isn't used."""
+        if isinstance(self.ws_connection, CompressingWebSocketProtocol):
+            return self.ws_connection.compression_stats
         return None
 
     def on_message(self, payload: str | bytes) -> None:
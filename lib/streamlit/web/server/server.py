@@ -37,6 +37,11 @@ from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
 from streamlit.runtime.memory_session_storage import MemorySessionStorage
 from streamlit.runtime.memory_uploaded_file_manager import MemoryUploadedFileManager
 from streamlit.runtime.runtime_util import get_max_message_size_bytes
+from streamlit.runtime.session_state_storage import (
+    SessionStateStorage,
+    SessionStateStorageError,
+)
+from streamlit.runtime.sqlite_session_state_storage import SQLiteSessionStateStorage
 from streamlit.web.cache_storage_manager_config import (
     create_default_cache_storage_manager,
 )
@@ -242,6 +247,14 @@ class Server:
 
         uploaded_file_mgr = MemoryUploadedFileManager(UPLOAD_FILE_ENDPOINT)
 
+        max_session_memory_mb = config.get_option("server.disconnectedSessionMaxMemory")
+        session_storage = MemorySessionStorage(
+            ttl_seconds=config.get_option("server.disconnectedSessionTTL"),
+            max_memory_bytes=max_session_memory_mb * 1024 * 1024
+            if max_session_memory_mb > 0
+            else None,
+        )
+
         self._runtime = Runtime(
             RuntimeConfig(
                 script_path=main_script_path,
@@ -250,13 +263,13 @@ class Server:
                 uploaded_file_manager=uploaded_file_mgr,
                 cache_storage_manager=create_default_cache_storage_manager(),
                 is_hello=is_hello,
-                session_storage=MemorySessionStorage(
-                    ttl_seconds=config.get_option("server.disconnectedSessionTTL")
-                ),
+                session_storage=session_storage,
+                session_state_storage=_create_session_state_storage(),
             ),
         )
 
         self._runtime.stats_mgr.register_provider(media_file_storage)
+        self._runtime.stats_mgr.register_provider(session_storage)
 
     @classmethod
     def initialize_mimetypes(cls) -> None:
@@ -432,6 +445,28 @@ class Server:
         self._runtime.stop()
 
 
+def _create_session_state_storage() -> SessionStateStorage | None:
+    """Create the storage for persisting Session State, or return None if
+    Session State shouldn't be persisted.
+    """
+    path = config.get_option("server.sessionStatePersistencePath")
+    if not path:
+        return None
+
+    try:
+        return SQLiteSessionStateStorage(
+            path, ttl_seconds=config.get_option("server.sessionStatePersistenceTTL")
+        )
+    except SessionStateStorageError:
+        _LOGGER.error(
+            "Session State won't be persisted, because its storage at %s can't "
+            "be opened.",
+            path,
+            exc_info=True,
+        )
+        return None
+
+
 def _set_tornado_log_levels() -> None:
     if not config.get_option("global.developmentMode"):
         # Hide logs unless they're super important.
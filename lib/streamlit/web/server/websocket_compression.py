@@ -0,0 +1,172 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+import tornado.escape
+from tornado.iostream import StreamClosedError
+from tornado.websocket import WebSocketClosedError, WebSocketProtocol13
+
+if TYPE_CHECKING:
+    from tornado.websocket import WebSocketHandler
+
+
+@dataclass
+class WebSocketCompressionStats:
+    """Counters describing the outbound compression of a websocket connection."""
+
+    # Number of messages sent compressed.
+    compressed_msgs: int = 0
+    # Number of messages sent uncompressed because they were below the minimum size.
+    uncompressed_msgs: int = 0
+    # Size of the compressed messages before compression.
+    raw_bytes: int = 0
+    # Size of the compressed messages on the wire.
+    wire_bytes: int = 0
+    # Total time spent compressing messages, in seconds.
+    compression_time: float = 0.0
+
+    @property
+    def saved_bytes(self) -> int:
+        return self.raw_bytes - self.wire_bytes
+
+
+class CompressingWebSocketProtocol(WebSocketProtocol13):
+    """A WebSocketProtocol13 that decides per message whether to compress it.
+
+    permessage-deflate allows sending some messages uncompressed, so messages
+    smaller than `min_compressed_size` are sent as-is: compressing them costs more
+    CPU than it saves bandwidth. Messages of at least `offload_size` bytes are
+    compressed on a worker thread so that they don't block the eventloop.
+
+    The compressor is stateful, so messages are still compressed and written one
+    at a time and in order: while a message is being compressed on a worker
+    thread, all messages written after it wait for it.
+    """
+
+    def __init__(
+        self,
+        handler: WebSocketHandler,
+        params: Any,
+        min_compressed_size: int,
+        offload_size: int,
+        window_bits: int,
+    ) -> None:
+        super().__init__(handler, mask_outgoing=False, params=params)
+        self._min_compressed_size = min_compressed_size
+        self._offload_size = offload_size
+        self._window_bits = window_bits
+        # Resolved once the last message passed to write_message has been handed
+        # to the stream. None if no write is waiting for a worker thread.
+        self._last_write_queued: asyncio.Future[None] | None = None
+        self.compression_stats = WebSocketCompressionStats()
+
+    def _get_compressor_options(
+        self,
+        side: str,
+        agreed_parameters: dict[str, Any],
+        compression_options: dict[str, Any] | None = None,
+    ) -> dict[str, Any]:
+        options = super()._get_compressor_options(
+            side, agreed_parameters, compression_options
+        )
+        if side == "server":
+            # A smaller window than the negotiated one can always be decompressed
+            # by the client, so we don't need to negotiate it.
+            options["max_wbits"] = min(options["max_wbits"], self._window_bits)
+        return options
+
+    def write_message(
+        self, message: str | bytes | dict[str, Any], binary: bool = False
+    ) -> asyncio.Future[None]:
+        if isinstance(message, dict):
+            message = tornado.escape.json_encode(message)
+        message = tornado.escape.utf8(message)
+
+        if self._last_write_queued is None and not self._should_offload(message):
+            payload, flags = self._compress(message)
+            return self._write_payload(message, payload, flags, binary)
+
+        previous = self._last_write_queued
+        queued = asyncio.get_running_loop().create_future()
+        self._last_write_queued = queued
+        return asyncio.ensure_future(
+            self._write_message_after(previous, queued, message, binary)
+        )
+
+    async def _write_message_after(
+        self,
+        previous: asyncio.Future[None] | None,
+        queued: asyncio.Future[None],
+        message: bytes,
+        binary: bool,
+    ) -> None:
+        try:
+            if previous is not None:
+                await previous
+            if self._should_offload(message):
+                payload, flags = await asyncio.get_running_loop().run_in_executor(
+                    None, self._compress, message
+                )
+            else:
+                payload, flags = self._compress(message)
+            written = self._write_payload(message, payload, flags, binary)
+        finally:
+            queued.set_result(None)
+            if self._last_write_queued is queued:
+                self._last_write_queued = None
+        await written
+
+    def _should_offload(self, message: bytes) -> bool:
+        return self._compressor is not None and len(message) >= self._offload_size
+
+    def _compress(self, message: bytes) -> tuple[bytes, int]:
+        """Return the payload and frame flags to send the given message with."""
+        if self._compressor is None:
+            return message, 0
+        if len(message) < self._min_compressed_size:
+            self.compression_stats.uncompressed_msgs += 1
+            return message, 0
+
+        start = time.perf_counter()
+        payload = self._compressor.compress(message)
+        stats = self.compression_stats
+        stats.compression_time += time.perf_counter() - start
+        stats.compressed_msgs += 1
+        stats.raw_bytes += len(message)
+        stats.wire_bytes += len(payload)
+        return payload, self.RSV1
+
+    def _write_payload(
+        self, message: bytes, payload: bytes, flags: int, binary: bool
+    ) -> asyncio.Future[None]:
+        # This mirrors the second half of WebSocketProtocol13.write_message.
+        self._message_bytes_out += len(message)
+        try:
+            fut = self._write_frame(True, 0x2 if binary else 0x1, payload, flags=flags)
+        except StreamClosedError:
+            raise WebSocketClosedError()
+
+        async def wrapper() -> None:
+            try:
+                await fut
+            except StreamClosedError:
+                raise WebSocketClosedError()
+
+        return asyncio.ensure_future(wrapper())
@@ -409,6 +409,15 @@ class ConfigTest(unittest.TestCase):
                 "runner.enforceSerializableSessionState",
                 "runner.magicEnabled",
                 "runner.postScriptGC",
+                "runner.preloadScripts",
+                "runner.preloadImports",
+                "runner.persistBytecodeCache",
+                "runner.maxConcurrentScriptRuns",
+                "runner.admissionMaxRunningSessions",
+                "runner.admissionQueueTimeout",
+                "runner.rerunDebounceMs",
+                "runner.numScriptProcesses",
+                "runner.interruptCheckIntervalMs",
                 "runner.fastReruns",
                 "runner.enumCoercion",
                 "magic.displayRootDocString",
@@ -420,8 +429,14 @@ class ConfigTest(unittest.TestCase):
                 "server.cookieSecret",
                 "server.scriptHealthCheckEnabled",
                 "server.enableWebsocketCompression",
+                "server.websocketCompressionMinSize",
+                "server.websocketCompressionLevel",
+                "server.websocketCompressionMemLevel",
+                "server.websocketCompressionWindowBits",
+                "server.websocketCompressionOffloadSize",
                 "server.enableXsrfProtection",
                 "server.fileWatcherType",
+                "server.fileWatcherMaxHashSize",
                 "server.folderWatchBlacklist",
                 "server.headless",
                 "server.address",
@@ -431,10 +446,21 @@ class ConfigTest(unittest.TestCase):
                 "server.maxUploadSize",
                 "server.maxMessageSize",
                 "server.enableStaticServing",
+                "server.flushByteBudgetPerSession",
+                "server.flushCoalesceWindowMs",
+                "server.flushTimeBudgetMs",
                 "server.enableArrowTruncation",
                 "server.sslCertFile",
                 "server.sslKeyFile",
                 "server.disconnectedSessionTTL",
+                "server.disconnectedSessionMaxMemory",
+                "server.disconnectedSessionHibernationDelay",
+                "server.sessionStatePersistencePath",
+                "server.sessionStatePersistenceCodec",
+                "server.sessionStatePersistenceTTL",
+                "server.websocketSlowClientTimeout",
+                "server.websocketWriteBufferHighWatermark",
+                "server.websocketWriteBufferLowWatermark",
                 "ui.hideTopBar",
             ]
         )
@@ -64,6 +64,27 @@ class TestCheckAndConvertToIndices:
         with pytest.raises(StreamlitAPIException):
             check_and_convert_to_indices(["a", "b"], "c")
 
+    def test_check_and_convert_to_indices_many_defaults(self):
+        """Many default values are looked up through an index map, which gives
+        the same result as scanning the options."""
+        opt = [f"option_{i}" for i in range(100)] + ["option_5"]
+        default = [f"option_{i}" for i in range(0, 100, 5)]
+
+        res = check_and_convert_to_indices(opt, default)
+        assert res == list(range(0, 100, 5))
+
+        with pytest.raises(StreamlitAPIException):
+            check_and_convert_to_indices(opt, [*default, "option_100"])
+
+    def test_check_and_convert_to_indices_many_defaults_unhashable(self):
+        opt = [[i] for i in range(20)]
+        res = check_and_convert_to_indices(opt, [[i] for i in range(10)])
+        assert res == list(range(10))
+
+        opt = list(range(20))
+        with pytest.raises(StreamlitAPIException):
+            check_and_convert_to_indices(opt, [*range(10), [3]])
+
 
 class TestTransformOptions:
     def test_transform_options(self):
@@ -122,6 +122,13 @@ class SelectboxTest(DeltaGeneratorTestCase):
         self.assertEqual(c.default, 0)
         self.assertEqual(c.options, proto_options)
 
+    def test_format_function_called_once_per_option(self):
+        format_func = MagicMock(side_effect=str)
+
+        st.selectbox("the label", ["a", "b", "c"], format_func=format_func)
+
+        self.assertEqual(3, format_func.call_count)
+
     @parameterized.expand([((),), ([],), (np.array([]),), (pd.Series(np.array([])),)])
     def test_no_options(self, options):
         """Test that it handles no options."""
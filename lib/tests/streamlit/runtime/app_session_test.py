@@ -33,7 +33,11 @@ from streamlit.proto.ClientState_pb2 import ClientState
 from streamlit.proto.Common_pb2 import FileURLs, FileURLsRequest, FileURLsResponse
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.runtime import Runtime
-from streamlit.runtime.app_session import AppSession, AppSessionState
+from streamlit.runtime.app_session import (
+    AppSession,
+    AppSessionState,
+    HibernationResult,
+)
 from streamlit.runtime.caching.storage.dummy_cache_storage import (
     MemoryCacheStorageManager,
 )
@@ -43,6 +47,7 @@ from streamlit.runtime.media_file_manager import MediaFileManager
 from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
 from streamlit.runtime.pages_manager import PagesManager
 from streamlit.runtime.script_data import ScriptData
+from streamlit.runtime.script_run_admission import ScriptRunAdmissionController
 from streamlit.runtime.scriptrunner import (
     RerunData,
     ScriptRunContext,
@@ -98,6 +103,9 @@ class AppSessionTest(unittest.TestCase):
             MemoryMediaFileStorage("/mock/media")
         )
         mock_runtime.cache_storage_manager = MemoryCacheStorageManager()
+        mock_runtime.script_runner_pool = None
+        mock_runtime.script_run_admission_controller = None
+        mock_runtime.script_process_pool = None
         Runtime._instance = mock_runtime
 
     def tearDown(self) -> None:
@@ -297,6 +305,69 @@ class AppSessionTest(unittest.TestCase):
         # And a new ScriptRunner should *not* be created.
         mock_create_scriptrunner.assert_not_called()
 
+    def test_hibernate(self):
+        """A hibernating session releases its fragments and compresses its
+        Session State until it's woken up by a BackMsg.
+        """
+        session = _create_test_session()
+        session._session_state["foo"] = "bar"
+        session._fragment_storage.set("my_fragment_id", MagicMock())
+
+        assert session.hibernate() == HibernationResult.HIBERNATED
+
+        assert not session._fragment_storage.contains("my_fragment_id")
+        assert session._session_state._hibernated_state is not None
+
+        session.handle_backmsg(BackMsg(app_heartbeat=True))
+        assert session._session_state._hibernated_state is None
+        assert session._session_state["foo"] == "bar"
+
+    @patch("streamlit.runtime.app_session.AppSession._create_scriptrunner")
+    def test_rerun_after_hibernation_is_full_rerun(
+        self, mock_create_scriptrunner: MagicMock
+    ):
+        """The fragments released by hibernating are recreated by a full rerun."""
+        session = _create_test_session()
+        session.hibernate()
+        session.register_file_watchers()
+
+        session.request_rerun(ClientState(fragment_id="my_fragment_id"))
+        session.request_rerun(ClientState(fragment_id="my_fragment_id"))
+
+        rerun_data = [call.args[0] for call in mock_create_scriptrunner.call_args_list]
+        assert [data.fragment_id for data in rerun_data] == [None, "my_fragment_id"]
+
+    def test_no_hibernation_while_script_runs(self):
+        session = _create_test_session()
+        session._scriptrunner = MagicMock(spec=ScriptRunner)
+
+        assert session.hibernate() == HibernationResult.BUSY
+        assert session._session_state._hibernated_state is None
+
+    def test_no_hibernation_with_unpicklable_state(self):
+        """A session whose Session State can't be compressed stays awake."""
+        session = _create_test_session()
+        session._session_state["foo"] = lambda: None
+        session._fragment_storage.set("my_fragment_id", MagicMock())
+
+        assert session.hibernate() == HibernationResult.FAILED
+        assert session._fragment_storage.contains("my_fragment_id")
+        assert not session._hibernated
+        assert not session._fragments_released
+
+    @patch("streamlit.runtime.app_session.AppSession._create_scriptrunner")
+    def test_rerun_wakes_session(self, mock_create_scriptrunner: MagicMock):
+        """A rerun that reaches a hibernating session runs with its values."""
+        session = _create_test_session()
+        session._session_state["foo"] = "bar"
+        session.hibernate()
+
+        session._rerun(RerunData())
+
+        assert not session._hibernated
+        assert session._session_state["foo"] == "bar"
+        mock_create_scriptrunner.assert_called_once()
+
     @patch("streamlit.runtime.app_session.ScriptRunner")
     def test_create_scriptrunner(self, mock_scriptrunner: MagicMock):
         """Test that _create_scriptrunner does what it should."""
@@ -316,6 +387,7 @@ class AppSessionTest(unittest.TestCase):
             user_info={"email": "test@example.com"},
             fragment_storage=session._fragment_storage,
             pages_manager=session._pages_manager,
+            worker_pool=Runtime.instance().script_runner_pool,
         )
 
         assert session._scriptrunner is not None
@@ -993,6 +1065,154 @@ class AppSessionScriptEventTest(IsolatedAsyncioTestCase):
             handle_backmsg_exception.assert_not_called()
             patched_logger.warning.assert_not_called()
 
+    def _set_admission_controller(self, controller: ScriptRunAdmissionController):
+        mock_runtime = MagicMock(spec=Runtime)
+        mock_runtime.script_run_admission_controller = controller
+        mock_runtime.script_process_pool = None
+        Runtime._instance = mock_runtime
+        self.addCleanup(setattr, Runtime, "_instance", None)
+
+    async def test_reruns_wait_for_admission(self):
+        """A rerun waits until the admission controller admits the session."""
+        self._set_admission_controller(
+            ScriptRunAdmissionController(max_running=1, queue_timeout=10)
+        )
+        session1 = _create_test_session(asyncio.get_running_loop())
+        session2 = _create_test_session(asyncio.get_running_loop())
+        session1._create_scriptrunner = MagicMock()
+        session2._create_scriptrunner = MagicMock()
+
+        session1.request_rerun(None)
+        session2.request_rerun(None)
+        session1._create_scriptrunner.assert_called_once()
+        session2._create_scriptrunner.assert_not_called()
+
+        # session1's script stops, so session2 is admitted.
+        mock_scriptrunner = MagicMock(spec=ScriptRunner)
+        session1._scriptrunner = mock_scriptrunner
+        session1._on_scriptrunner_event(
+            sender=mock_scriptrunner,
+            event=ScriptRunnerEvent.SHUTDOWN,
+            client_state=ClientState(),
+        )
+        await asyncio.sleep(0)
+
+        session2._create_scriptrunner.assert_called_once()
+
+    async def test_rerun_after_shutdown_doesnt_leak_admission(self):
+        """A rerun requested from another thread before the session shut down
+        neither takes nor keeps an admission slot.
+        """
+        controller = ScriptRunAdmissionController(max_running=1, queue_timeout=10)
+        self._set_admission_controller(controller)
+        session = _create_test_session(asyncio.get_running_loop())
+        session._create_scriptrunner = MagicMock()
+
+        with patch.object(session, "_is_on_event_loop_thread", return_value=False):
+            session.request_rerun(None)
+        session.shutdown()
+        await asyncio.sleep(0)
+
+        session._create_scriptrunner.assert_not_called()
+        self.assertEqual(0, controller.stats.num_running)
+
+        # A rerun that is admitted after the session shut down releases its
+        # admission right away.
+        controller._running.add(session.id)
+        session._rerun(RerunData())
+        self.assertEqual(0, controller.stats.num_running)
+
+    async def test_shed_rerun_tells_browser_to_retry(self):
+        """A rerun that waits for too long is dropped, and the browser is told
+        to retry later.
+        """
+        self._set_admission_controller(
+            ScriptRunAdmissionController(max_running=1, queue_timeout=0.01)
+        )
+        session1 = _create_test_session(asyncio.get_running_loop())
+        session2 = _create_test_session(asyncio.get_running_loop())
+        session1._create_scriptrunner = MagicMock()
+        session2._create_scriptrunner = MagicMock()
+
+        session1.request_rerun(None)
+        session2.request_rerun(None)
+        await asyncio.sleep(0.05)
+
+        session2._create_scriptrunner.assert_not_called()
+        sent_messages = session2._browser_queue._queue
+        self.assertEqual(1, len(sent_messages))
+        self.assertAlmostEqual(
+            0.01, sent_messages[0].session_event.rerun_rejected.retry_after
+        )
+
+    async def test_debounces_reruns(self):
+        """Reruns requested within the debounce window are merged into one
+        rerun that runs when the window ends.
+        """
+        with patch_config_options({"runner.rerunDebounceMs": 10}):
+            session = _create_test_session(asyncio.get_running_loop())
+        session._create_scriptrunner = MagicMock()
+
+        for page_name in ("page1", "page2", "page3"):
+            session.request_rerun(ClientState(page_name=page_name))
+        session._create_scriptrunner.assert_called_once()
+        self.assertEqual(
+            "page1", session._create_scriptrunner.call_args[0][0].page_name
+        )
+
+        await asyncio.sleep(0.05)
+        self.assertEqual(2, session._create_scriptrunner.call_count)
+        self.assertEqual(
+            "page3", session._create_scriptrunner.call_args[0][0].page_name
+        )
+        self.assertEqual(1, session._rerun_debouncer.stats.num_coalesced)
+
+    async def test_no_hibernation_with_pending_rerun(self):
+        """A session doesn't hibernate while a rerun is held back by the
+        debouncer or waits for admission.
+        """
+        with patch_config_options({"runner.rerunDebounceMs": 10}):
+            session = _create_test_session(asyncio.get_running_loop())
+        session._create_scriptrunner = MagicMock()
+        session.request_rerun(None)
+        session.request_rerun(None)
+
+        self.assertEqual(HibernationResult.BUSY, session.hibernate())
+        await asyncio.sleep(0.05)
+        self.assertEqual(HibernationResult.HIBERNATED, session.hibernate())
+
+        self._set_admission_controller(
+            ScriptRunAdmissionController(max_running=1, queue_timeout=10)
+        )
+        session1 = _create_test_session(asyncio.get_running_loop())
+        session2 = _create_test_session(asyncio.get_running_loop())
+        session1._create_scriptrunner = MagicMock()
+        session2._create_scriptrunner = MagicMock()
+        session1.request_rerun(None)
+        session2.request_rerun(None)
+
+        self.assertEqual(HibernationResult.BUSY, session2.hibernate())
+
+    async def test_rejected_process_rerun_starts_new_scriptrunner(self):
+        """A rerun that a worker process rejects after the fact is run by a new
+        ScriptRunner, unless a later rerun already replaced the runner.
+        """
+        session = _create_test_session(asyncio.get_running_loop())
+        session._create_scriptrunner = MagicMock()
+        rejecting_runner = MagicMock()
+        session._scriptrunner = rejecting_runner
+
+        rerun_data = RerunData(page_name="page")
+        session._on_rerun_rejected(rejecting_runner, rerun_data)
+        await asyncio.sleep(0)
+        session._create_scriptrunner.assert_called_once_with(rerun_data)
+
+        session._create_scriptrunner.reset_mock()
+        session._scriptrunner = MagicMock()
+        session._on_rerun_rejected(rejecting_runner, rerun_data)
+        await asyncio.sleep(0)
+        session._create_scriptrunner.assert_not_called()
+
 
 class PopulateCustomThemeMsgTest(unittest.TestCase):
     @patch("streamlit.runtime.app_session.config")
@@ -0,0 +1,156 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for ForwardMsgScheduler."""
+
+from __future__ import annotations
+
+import unittest
+
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.runtime.forward_msg_scheduler import ForwardMsgScheduler
+from streamlit.runtime.stats import CacheStat
+
+
+def _create_text_msg(size: int) -> ForwardMsg:
+    msg = ForwardMsg()
+    msg.delta.new_element.text.body = "x" * size
+    return msg
+
+
+def _create_script_finished_msg() -> ForwardMsg:
+    msg = ForwardMsg()
+    msg.script_finished = ForwardMsg.FINISHED_SUCCESSFULLY
+    return msg
+
+
+class ForwardMsgSchedulerTest(unittest.TestCase):
+    def test_sends_everything_within_budget(self):
+        """A session's messages are all sent in one round if they fit the budget."""
+        scheduler = ForwardMsgScheduler(byte_budget_per_session=1000, time_budget=10)
+        msgs = [_create_text_msg(10) for _ in range(5)]
+        scheduler.enqueue("session", msgs)
+
+        self.assertEqual([("session", msgs)], list(scheduler.next_round()))
+        self.assertFalse(scheduler.has_pending())
+
+    def test_round_robin_under_byte_budget(self):
+        """A session that exceeds its byte budget doesn't block other sessions."""
+        scheduler = ForwardMsgScheduler(byte_budget_per_session=100, time_budget=10)
+        big_msgs = [_create_text_msg(80) for _ in range(3)]
+        small_msg = _create_text_msg(1)
+        scheduler.enqueue("big", big_msgs)
+        scheduler.enqueue("small", [small_msg])
+
+        self.assertEqual(
+            [("big", big_msgs[:1]), ("small", [small_msg])],
+            list(scheduler.next_round()),
+        )
+        self.assertEqual(
+            (2, sum(m.ByteSize() for m in big_msgs[1:])), scheduler.queue_depth("big")
+        )
+        self.assertEqual((0, 0), scheduler.queue_depth("small"))
+
+        self.assertEqual([("big", big_msgs[1:2])], list(scheduler.next_round()))
+        self.assertEqual([("big", big_msgs[2:])], list(scheduler.next_round()))
+        self.assertFalse(scheduler.has_pending())
+
+    def test_message_larger_than_budget_is_sent(self):
+        """A single message larger than the budget is still sent."""
+        scheduler = ForwardMsgScheduler(byte_budget_per_session=10, time_budget=10)
+        msg = _create_text_msg(100)
+        scheduler.enqueue("session", [msg])
+
+        self.assertEqual([("session", [msg])], list(scheduler.next_round()))
+
+    def test_lifecycle_msgs_are_not_budgeted(self):
+        """Lifecycle messages don't count against the budget, and sessions with
+        pending lifecycle messages are served first.
+        """
+        scheduler = ForwardMsgScheduler(byte_budget_per_session=100, time_budget=10)
+        other_msgs = [_create_text_msg(80)]
+        scheduler.enqueue("other", other_msgs)
+
+        finishing_msgs = [
+            _create_text_msg(80),
+            _create_script_finished_msg(),
+            _create_text_msg(80),
+        ]
+        scheduler.enqueue("finishing", finishing_msgs)
+
+        self.assertEqual(
+            [("finishing", finishing_msgs[:2]), ("other", other_msgs)],
+            list(scheduler.next_round()),
+        )
+        self.assertEqual(
+            [("finishing", finishing_msgs[2:])], list(scheduler.next_round())
+        )
+
+    def test_time_budget(self):
+        """A round ends once the time budget is used up, and the next round starts
+        with the sessions that weren't served.
+        """
+        now = [0.0]
+
+        def timer():
+            now[0] += 1
+            return now[0]
+
+        scheduler = ForwardMsgScheduler(
+            byte_budget_per_session=1000, time_budget=0.5, timer=timer
+        )
+        for session_id in ("a", "b", "c"):
+            scheduler.enqueue(session_id, [_create_text_msg(1)])
+        self.assertEqual(["a"], [s for s, _ in scheduler.next_round()])
+        self.assertEqual(["b"], [s for s, _ in scheduler.next_round()])
+        self.assertEqual(["c"], [s for s, _ in scheduler.next_round()])
+
+    def test_skips_sessions_that_cant_send(self):
+        """Sessions for which can_send returns False keep their messages."""
+        scheduler = ForwardMsgScheduler(byte_budget_per_session=1000, time_budget=10)
+        msgs = [_create_text_msg(1)]
+        scheduler.enqueue("slow", msgs)
+
+        self.assertEqual([], list(scheduler.next_round(lambda _: False)))
+        self.assertTrue(scheduler.has_pending())
+        self.assertFalse(scheduler.has_pending(lambda _: False))
+        self.assertEqual([("slow", msgs)], list(scheduler.next_round(lambda _: True)))
+
+    def test_remove_session(self):
+        """remove_session drops the session's pending messages."""
+        scheduler = ForwardMsgScheduler(byte_budget_per_session=1000, time_budget=10)
+        scheduler.enqueue("session", [_create_text_msg(1)])
+        scheduler.remove_session("session")
+
+        self.assertFalse(scheduler.has_pending())
+        self.assertEqual([], list(scheduler.next_round()))
+
+    def test_get_stats(self):
+        """get_stats reports the total bytes of pending messages."""
+        scheduler = ForwardMsgScheduler(byte_budget_per_session=1000, time_budget=10)
+        msg1 = _create_text_msg(10)
+        msg2 = _create_text_msg(20)
+        scheduler.enqueue("session1", [msg1])
+        scheduler.enqueue("session2", [msg2])
+
+        self.assertEqual(
+            [
+                CacheStat(
+                    category_name="ForwardMessageQueue",
+                    cache_name="",
+                    byte_length=msg1.ByteSize() + msg2.ByteSize(),
+                )
+            ],
+            scheduler.get_stats(),
+        )
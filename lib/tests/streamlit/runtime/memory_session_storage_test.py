@@ -14,12 +14,19 @@
 
 from __future__ import annotations
 
+import asyncio
+import threading
 import unittest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 from cachetools import TTLCache
 
-from streamlit.runtime.memory_session_storage import MemorySessionStorage
+from streamlit.runtime.memory_session_storage import (
+    _SESSION_OVERHEAD_BYTES,
+    MemorySessionStorage,
+    SessionStorageStats,
+)
+from streamlit.runtime.stats import CacheStat
 
 
 class MemorySessionStorageTest(unittest.TestCase):
@@ -69,3 +76,150 @@ class MemorySessionStorageTest(unittest.TestCase):
         store._cache["baz"] = "qux"
 
         self.assertEqual(store.list(), ["bar", "qux"])
+
+    def test_memory_budget(self):
+        """With max_memory_bytes set, the least recently used sessions are
+        evicted to keep the estimated size of all sessions within the budget.
+        """
+        store = MemorySessionStorage(
+            maxsize=1, max_memory_bytes=3 * _SESSION_OVERHEAD_BYTES
+        )
+        for session_id in ["a", "b", "c", "d"]:
+            store.save(_create_session_info(session_id))
+
+        self.assertEqual(["b", "c", "d"], [s.session.id for s in store.list()])
+        self.assertEqual(1, store.stats.evictions)
+        self.assertEqual(
+            [CacheStat("session_storage", "", 3 * _SESSION_OVERHEAD_BYTES)],
+            store.get_stats(),
+        )
+
+    def test_memory_budget_counts_session_state(self):
+        store = MemorySessionStorage(max_memory_bytes=3 * _SESSION_OVERHEAD_BYTES)
+        store.save(_create_session_info("a"))
+        store.save(_create_session_info("b", 2 * _SESSION_OVERHEAD_BYTES))
+
+        self.assertEqual(["b"], [s.session.id for s in store.list()])
+        self.assertEqual(1, store.stats.evictions)
+
+    def test_session_larger_than_memory_budget(self):
+        store = MemorySessionStorage(max_memory_bytes=_SESSION_OVERHEAD_BYTES)
+        store.save(_create_session_info("a", 1))
+
+        self.assertEqual([], store.list())
+        self.assertEqual(1, store.stats.evictions)
+
+    def test_stats(self):
+        store = MemorySessionStorage()
+        store.save(_create_session_info("a"))
+
+        self.assertEqual(SessionStorageStats(evictions=0), store.stats)
+        self.assertEqual(
+            [CacheStat("session_storage", "", _SESSION_OVERHEAD_BYTES)],
+            store.get_stats(),
+        )
+
+    def test_no_size_estimate_without_memory_budget(self):
+        store = MemorySessionStorage()
+        session_info = _create_session_info("a", _SESSION_OVERHEAD_BYTES)
+        store.save(session_info)
+
+        session_info.session.session_state.get_stats.assert_not_called()
+
+
+class MemorySessionStorageSizeEstimateTest(unittest.IsolatedAsyncioTestCase):
+    async def test_estimates_size_off_eventloop_thread(self):
+        """Sessions saved on the eventloop thread are sized on another thread,
+        and get_stats reuses the estimated size.
+        """
+        store = MemorySessionStorage(max_memory_bytes=10 * _SESSION_OVERHEAD_BYTES)
+        session_info = _create_session_info("a", _SESSION_OVERHEAD_BYTES)
+        estimate_threads = []
+
+        def get_stats():
+            estimate_threads.append(threading.current_thread())
+            return [CacheStat("st_session_state", "", _SESSION_OVERHEAD_BYTES)]
+
+        session_info.session.session_state.get_stats.side_effect = get_stats
+
+        store.save(session_info)
+        self.assertEqual(
+            [CacheStat("session_storage", "", _SESSION_OVERHEAD_BYTES)],
+            store.get_stats(),
+        )
+
+        for _ in range(100):
+            if store._session_sizes:
+                break
+            await asyncio.sleep(0.01)
+
+        self.assertEqual(1, len(estimate_threads))
+        self.assertIsNot(threading.main_thread(), estimate_threads[0])
+        self.assertEqual(
+            [CacheStat("session_storage", "", 2 * _SESSION_OVERHEAD_BYTES)],
+            store.get_stats(),
+        )
+        self.assertEqual(1, len(estimate_threads))
+
+    async def test_size_of_deleted_session_dropped(self):
+        store = MemorySessionStorage(max_memory_bytes=10 * _SESSION_OVERHEAD_BYTES)
+        store.save(_create_session_info("a"))
+        store.delete("a")
+        await asyncio.sleep(0.05)
+
+        self.assertEqual({}, store._session_sizes)
+        self.assertEqual([CacheStat("session_storage", "", 0)], store.get_stats())
+
+    @patch(
+        "streamlit.runtime.memory_session_storage._SIZE_ESTIMATE_RETRY_DELAY_SECONDS",
+        0,
+    )
+    async def test_failed_size_estimate_retried(self):
+        """An estimate that fails, e.g. because the session's script is still
+        changing its Session State, is retried.
+        """
+        store = MemorySessionStorage(max_memory_bytes=10 * _SESSION_OVERHEAD_BYTES)
+        session_info = _create_session_info("a")
+        session_info.session.session_state.get_stats.side_effect = [
+            RuntimeError("dictionary changed size during iteration"),
+            [CacheStat("st_session_state", "", _SESSION_OVERHEAD_BYTES)],
+        ]
+
+        store.save(session_info)
+        for _ in range(100):
+            if store._session_sizes:
+                break
+            await asyncio.sleep(0.01)
+
+        self.assertEqual({"a": 2 * _SESSION_OVERHEAD_BYTES}, store._session_sizes)
+
+    @patch(
+        "streamlit.runtime.memory_session_storage._SIZE_ESTIMATE_RETRY_DELAY_SECONDS",
+        0,
+    )
+    async def test_failed_size_estimate_logged(self):
+        store = MemorySessionStorage(max_memory_bytes=10 * _SESSION_OVERHEAD_BYTES)
+        session_info = _create_session_info("a")
+        session_info.session.session_state.get_stats.side_effect = RuntimeError()
+
+        with self.assertLogs(
+            "streamlit.runtime.memory_session_storage", level="WARNING"
+        ):
+            store.save(session_info)
+            for _ in range(100):
+                if session_info.session.session_state.get_stats.call_count == 3:
+                    break
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.05)
+
+        self.assertEqual(3, session_info.session.session_state.get_stats.call_count)
+        self.assertEqual({}, store._session_sizes)
+
+
+def _create_session_info(session_id: str, session_state_size: int = 0) -> MagicMock:
+    session_info = MagicMock()
+    session_info.session.id = session_id
+    session_info.session.session_state.get_stats.return_value = [
+        CacheStat("st_session_state", "", session_state_size)
+    ]
+    return session_info
@@ -0,0 +1,95 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for RerunDebouncer."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+
+from streamlit.proto.WidgetStates_pb2 import WidgetStates
+from streamlit.runtime.rerun_debouncer import RerunDebouncer, RerunDebouncerStats
+from streamlit.runtime.scriptrunner_utils.script_requests import RerunData
+
+
+def _widget_states(**values: float | bool) -> WidgetStates:
+    states = WidgetStates()
+    for widget_id, value in values.items():
+        state = states.widgets.add()
+        state.id = widget_id
+        if isinstance(value, bool):
+            state.trigger_value = value
+        else:
+            state.double_value = value
+    return states
+
+
+class RerunDebouncerTest(IsolatedAsyncioTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.runs: list[RerunData] = []
+
+    async def test_invalid_window(self):
+        with self.assertRaises(ValueError):
+            RerunDebouncer(0, self.runs.append)
+
+    async def test_first_rerun_runs_right_away(self):
+        debouncer = RerunDebouncer(10, self.runs.append)
+        rerun_data = RerunData(page_name="page")
+        debouncer.request_rerun(rerun_data)
+        self.assertEqual([rerun_data], self.runs)
+
+    async def test_merges_reruns_within_window(self):
+        """Reruns within the window are merged into one that runs when the
+        window ends, with the latest widget states and all trigger values.
+        """
+        debouncer = RerunDebouncer(0.01, self.runs.append)
+        debouncer.request_rerun(RerunData(widget_states=_widget_states(slider=1)))
+        debouncer.request_rerun(
+            RerunData(widget_states=_widget_states(slider=2, button=True))
+        )
+        debouncer.request_rerun(RerunData(widget_states=_widget_states(slider=3)))
+        self.assertEqual(1, len(self.runs))
+
+        await asyncio.sleep(0.05)
+        self.assertEqual(2, len(self.runs))
+        merged = {w.id: w for w in self.runs[1].widget_states.widgets}
+        self.assertEqual(3, merged["slider"].double_value)
+        self.assertTrue(merged["button"].trigger_value)
+        self.assertEqual(
+            RerunDebouncerStats(num_requests=3, num_runs=2, num_coalesced=1),
+            debouncer.stats,
+        )
+
+    async def test_fragment_rerun_flushes_held_rerun(self):
+        """Fragment reruns run right away, after the held full-script rerun."""
+        debouncer = RerunDebouncer(10, self.runs.append)
+        debouncer.request_rerun(RerunData(page_name="first"))
+        debouncer.request_rerun(RerunData(page_name="held"))
+        debouncer.request_rerun(RerunData(fragment_id="fragment"))
+
+        self.assertEqual(
+            ["first", "held", ""], [rerun_data.page_name for rerun_data in self.runs]
+        )
+        self.assertEqual("fragment", self.runs[2].fragment_id)
+
+    async def test_cancel_drops_held_rerun(self):
+        debouncer = RerunDebouncer(0.01, self.runs.append)
+        debouncer.request_rerun(RerunData())
+        debouncer.request_rerun(RerunData())
+        debouncer.cancel()
+
+        await asyncio.sleep(0.05)
+        self.assertEqual(1, len(self.runs))
@@ -36,10 +36,12 @@ from streamlit.runtime.caching.storage.local_disk_cache_storage import (
     LocalDiskCacheStorageManager,
 )
 from streamlit.runtime.forward_msg_cache import populate_hash_if_needed
+from streamlit.runtime.forward_msg_scheduler import ForwardMsgScheduler
 from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
 from streamlit.runtime.memory_session_storage import MemorySessionStorage
 from streamlit.runtime.memory_uploaded_file_manager import MemoryUploadedFileManager
 from streamlit.runtime.runtime import AsyncObjects, RuntimeStoppedError
+from streamlit.runtime.stats import CacheStat
 from streamlit.runtime.websocket_session_manager import WebsocketSessionManager
 from streamlit.watcher import event_based_path_watcher
 from tests.streamlit.message_mocks import (
@@ -60,6 +62,15 @@ class MockSessionClient(SessionClient):
         self.forward_msgs.append(msg)
 
 
+class MockFlowControlledSessionClient(MockSessionClient):
+    """A MockSessionClient whose write buffer can be marked as full."""
+
+    def __init__(self):
+        super().__init__()
+        self.is_write_buffer_full = False
+        self.buffered_bytes = 0
+
+
 class RuntimeConfigTests(unittest.TestCase):
     def test_runtime_config_defaults(self):
         config = RuntimeConfig(
@@ -74,6 +85,7 @@ class RuntimeConfigTests(unittest.TestCase):
         )
         self.assertIs(config.session_manager_class, WebsocketSessionManager)
         self.assertIsInstance(config.session_storage, MemorySessionStorage)
+        self.assertIsNone(config.session_state_storage)
 
 
 class RuntimeSingletonTest(unittest.TestCase):
@@ -175,6 +187,33 @@ class RuntimeTest(RuntimeTestCase):
                 session_id_override=None,
             )
 
+    async def test_connect_session_restores_persisted_session_state(self):
+        """A new session for a client whose previous session is gone gets the
+        previous session's persisted Session State.
+        """
+        await self.runtime.start()
+        persister = MagicMock()
+        self.runtime._session_state_persister = persister
+
+        session_id = self.runtime.connect_session(
+            client=MockSessionClient(),
+            user_info=MagicMock(),
+            existing_session_id="gone_session_id",
+        )
+
+        persister.schedule_restore.assert_called_once_with(
+            "gone_session_id", session_id
+        )
+        persister.restore.assert_not_called()
+
+        persister.reset_mock()
+        self.runtime.connect_session(client=MockSessionClient(), user_info=MagicMock())
+        persister.schedule_restore.assert_not_called()
+
+        # A restore that hasn't happened yet is cancelled with the session.
+        self.runtime.close_session(session_id)
+        persister.cancel_restore.assert_called_once_with(session_id)
+
     async def test_connect_session_session_id_override_plumbing(self):
         """The session_id_override parameter is plumbed to _session_mgr.connect_session."""
         await self.runtime.start()
@@ -450,6 +489,137 @@ class RuntimeTest(RuntimeTestCase):
         raise_disconnected_error.assert_called_once()
         self.assertFalse(self.runtime.is_active_session(session_id))
 
+    async def test_holds_back_messages_while_write_buffer_full(self):
+        """Messages for a client whose write buffer is full are held back until it
+        can accept them again, without blocking other sessions.
+        """
+        await self.runtime.start()
+
+        slow_client = MockFlowControlledSessionClient()
+        slow_session_id = self.runtime.connect_session(slow_client, MagicMock())
+        fast_client = MockSessionClient()
+        fast_session_id = self.runtime.connect_session(fast_client, MagicMock())
+
+        slow_client.is_write_buffer_full = True
+        self.enqueue_forward_msg(slow_session_id, create_dataframe_msg([1, 2, 3]))
+        self.enqueue_forward_msg(fast_session_id, create_dataframe_msg([1, 2, 3]))
+        await self.tick_runtime_loop()
+
+        self.assertEqual([], slow_client.forward_msgs)
+        self.assertEqual(1, len(fast_client.forward_msgs))
+
+        # Blocked clients don't keep the loop busy.
+        self.assertFalse(self.runtime._get_async_objs().need_send_data.is_set())
+
+        slow_client.is_write_buffer_full = False
+        self.runtime.notify_write_buffer_drained()
+        await self.tick_runtime_loop()
+
+        self.assertEqual(1, len(slow_client.forward_msgs))
+        self.assertFalse(self.runtime._msg_scheduler.has_pending())
+
+    async def test_coalesces_superseded_deltas_while_write_buffer_full(self):
+        """While a client's write buffer is full, newer Deltas replace the ones
+        they supersede instead of piling up.
+        """
+        await self.runtime.start()
+
+        client = MockFlowControlledSessionClient()
+        session_id = self.runtime.connect_session(client, MagicMock())
+
+        client.is_write_buffer_full = True
+        for i in range(5):
+            self.enqueue_forward_msg(session_id, create_dataframe_msg([i]))
+            await self.tick_runtime_loop()
+
+        self.assertEqual([], client.forward_msgs)
+
+        client.is_write_buffer_full = False
+        self.runtime.notify_write_buffer_drained()
+        await self.tick_runtime_loop()
+
+        self.assertEqual(1, len(client.forward_msgs))
+        self.assertEqual(create_dataframe_msg([4]).delta, client.forward_msgs[0].delta)
+
+    async def test_reports_buffered_bytes_stats(self):
+        """The Runtime's StatsManager reports each flow-controlled client's
+        buffered bytes.
+        """
+        await self.runtime.start()
+
+        client = MockFlowControlledSessionClient()
+        client.buffered_bytes = 1234
+        session_id = self.runtime.connect_session(client, MagicMock())
+        self.runtime.connect_session(MockSessionClient(), MagicMock())
+
+        stats = [
+            stat
+            for stat in self.runtime.stats_mgr.get_stats()
+            if stat.category_name == "websocket_write_buffer"
+        ]
+        self.assertEqual([CacheStat("websocket_write_buffer", session_id, 1234)], stats)
+
+    async def test_flushes_immediately_when_idle(self):
+        """The Runtime doesn't wait for the coalescing window if no new messages
+        were enqueued while it was flushing.
+        """
+        with patch_config_options({"server.flushCoalesceWindowMs": 10000}):
+            await self.runtime.start()
+
+        client = MockSessionClient()
+        session_id = self.runtime.connect_session(client=client, user_info=MagicMock())
+
+        for i in range(3):
+            self.enqueue_forward_msg(session_id, create_dataframe_msg([i]))
+            await self.tick_runtime_loop()
+            self.assertEqual(i + 1, len(client.forward_msgs))
+
+    async def test_coalesces_messages_under_load(self):
+        """If messages are enqueued while the Runtime is flushing, it waits for
+        the coalescing window before flushing again.
+        """
+        with patch_config_options({"server.flushCoalesceWindowMs": 1000}):
+            await self.runtime.start()
+
+        session_id = None
+
+        class EnqueueingClient(MockSessionClient):
+            def write_forward_msg(client, msg: ForwardMsg) -> None:
+                super().write_forward_msg(msg)
+                self.enqueue_forward_msg(session_id, create_dataframe_msg([4, 5, 6]))
+
+        client = EnqueueingClient()
+        session_id = self.runtime.connect_session(client=client, user_info=MagicMock())
+
+        self.enqueue_forward_msg(session_id, create_dataframe_msg([1, 2, 3]))
+        await self.tick_runtime_loop()
+
+        self.assertEqual(1, len(client.forward_msgs))
+
+    @patch("streamlit.runtime.runtime._MIN_HELD_BACK_FLUSH_DELAY", 1)
+    async def test_waits_between_budget_limited_rounds(self):
+        """Messages held back by the flush budgets are sent in rounds with a
+        real wait in between, even without a coalescing window.
+        """
+        self.runtime._msg_scheduler = ForwardMsgScheduler(
+            byte_budget_per_session=1, time_budget=10
+        )
+        with patch_config_options({"server.flushCoalesceWindowMs": 0}):
+            await self.runtime.start()
+
+        client = MockSessionClient()
+        session_id = self.runtime.connect_session(client=client, user_info=MagicMock())
+
+        msgs = [create_dataframe_msg([i], id=i) for i in range(3)]
+        for msg in msgs:
+            self.enqueue_forward_msg(session_id, msg)
+        await self.tick_runtime_loop()
+
+        # One message is sent per round, and the next round waits for the
+        # (patched) min delay.
+        self.assertEqual(1, len(client.forward_msgs))
+        self.assertTrue(self.runtime._msg_scheduler.has_pending())
+
     async def test_stable_number_of_async_tasks(self):
         """Test that the number of async tasks remains stable.
 
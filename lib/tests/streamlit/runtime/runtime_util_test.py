@@ -20,7 +20,12 @@ import unittest
 
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.runtime import runtime_util
-from streamlit.runtime.runtime_util import is_cacheable_msg, serialize_forward_msg
+from streamlit.runtime.runtime_util import (
+    is_cacheable_msg,
+    pack_forward_msg_batch,
+    serialize_forward_msg,
+    unpack_forward_msg_batch,
+)
 from tests.streamlit.message_mocks import create_dataframe_msg
 from tests.testutil import patch_config_options
 
@@ -57,3 +62,24 @@ class RuntimeUtilTest(unittest.TestCase):
                 "exceeds the message size limit"
                 in deserialized_msg.delta.new_element.exception.message
             )
+
+    def test_forward_msg_batch_roundtrip(self):
+        """Test that pack_forward_msg_batch and unpack_forward_msg_batch are
+        inverses of each other."""
+        serialized_msgs = [
+            serialize_forward_msg(create_dataframe_msg([1, 2, 3])),
+            b"",
+            serialize_forward_msg(create_dataframe_msg([4, 5, 6])),
+        ]
+
+        frame = pack_forward_msg_batch(serialized_msgs)
+
+        self.assertEqual(len(frame), sum(len(msg) for msg in serialized_msgs) + 4 * 3)
+        self.assertEqual(serialized_msgs, unpack_forward_msg_batch(frame))
+
+    def test_unpack_truncated_forward_msg_batch(self):
+        """Test that unpacking a truncated batch frame raises an error."""
+        frame = pack_forward_msg_batch([b"some serialized message"])
+
+        with self.assertRaises(ValueError):
+            unpack_forward_msg_batch(frame[:-1])
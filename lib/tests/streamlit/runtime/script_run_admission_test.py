@@ -0,0 +1,121 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for ScriptRunAdmissionController."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest import IsolatedAsyncioTestCase
+from unittest.mock import MagicMock
+
+from streamlit.runtime.script_run_admission import (
+    ScriptRunAdmissionController,
+    ScriptRunAdmissionStats,
+)
+
+
+class ScriptRunAdmissionControllerTest(IsolatedAsyncioTestCase):
+    async def test_invalid_max_running(self):
+        with self.assertRaises(ValueError):
+            ScriptRunAdmissionController(max_running=0, queue_timeout=1)
+
+    async def test_admits_up_to_max_running(self):
+        """Sessions are admitted right away until max_running is reached, and
+        then queued.
+        """
+        controller = ScriptRunAdmissionController(max_running=2, queue_timeout=10)
+        callbacks = {name: MagicMock() for name in ("a", "b", "c")}
+        for session_id, on_admitted in callbacks.items():
+            controller.request_run(session_id, on_admitted, MagicMock())
+
+        callbacks["a"].assert_called_once()
+        callbacks["b"].assert_called_once()
+        callbacks["c"].assert_not_called()
+        self.assertEqual(
+            ScriptRunAdmissionStats(num_running=2, num_queued=1, num_shed=0),
+            controller.stats,
+        )
+
+        controller.release("a")
+        callbacks["c"].assert_called_once()
+        self.assertEqual(
+            ScriptRunAdmissionStats(num_running=2, num_queued=0, num_shed=0),
+            controller.stats,
+        )
+
+    async def test_running_session_is_not_queued(self):
+        """A session that is already running is admitted again right away."""
+        controller = ScriptRunAdmissionController(max_running=1, queue_timeout=10)
+        controller.request_run("a", MagicMock(), MagicMock())
+        controller.request_run("b", MagicMock(), MagicMock())
+
+        on_admitted = MagicMock()
+        controller.request_run("a", on_admitted, MagicMock())
+        on_admitted.assert_called_once()
+
+    async def test_coalesces_queued_requests(self):
+        """Only the latest queued request of a session is admitted, and it keeps
+        the session's place in the queue.
+        """
+        controller = ScriptRunAdmissionController(max_running=1, queue_timeout=10)
+        controller.request_run("running", MagicMock(), MagicMock())
+
+        order = []
+        controller.request_run("a", lambda: order.append("a1"), MagicMock())
+        controller.request_run("b", lambda: order.append("b1"), MagicMock())
+        controller.request_run("a", lambda: order.append("a2"), MagicMock())
+        self.assertEqual(2, controller.stats.num_queued)
+
+        controller.release("running")
+        controller.release("a")
+        self.assertEqual(["a2", "b1"], order)
+
+    async def test_sheds_requests_after_timeout(self):
+        """A request that waits for longer than the queue timeout is dropped."""
+        controller = ScriptRunAdmissionController(max_running=1, queue_timeout=0.01)
+        controller.request_run("running", MagicMock(), MagicMock())
+
+        on_admitted = MagicMock()
+        on_shed = MagicMock()
+        controller.request_run("a", on_admitted, on_shed)
+
+        await asyncio.sleep(0.05)
+        on_shed.assert_called_once()
+        self.assertEqual(
+            ScriptRunAdmissionStats(num_running=1, num_queued=0, num_shed=1),
+            controller.stats,
+        )
+
+        controller.release("running")
+        on_admitted.assert_not_called()
+
+    async def test_release_drops_queued_request(self):
+        """Releasing a queued session drops its request without shedding it."""
+        controller = ScriptRunAdmissionController(max_running=1, queue_timeout=0.01)
+        controller.request_run("running", MagicMock(), MagicMock())
+
+        on_admitted = MagicMock()
+        on_shed = MagicMock()
+        controller.request_run("a", on_admitted, on_shed)
+        controller.release("a")
+
+        await asyncio.sleep(0.05)
+        controller.release("running")
+        on_admitted.assert_not_called()
+        on_shed.assert_not_called()
+        self.assertEqual(
+            ScriptRunAdmissionStats(num_running=0, num_queued=0, num_shed=0),
+            controller.stats,
+        )
@@ -13,12 +13,15 @@
 # limitations under the License.
 
 import os.path
+import tempfile
 import unittest
 from unittest import mock
 from unittest.mock import Mock
 
 from streamlit import source_util
+from streamlit.runtime.scriptrunner import magic
 from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from tests.testutil import patch_config_options
 
 
 def _get_script_path(name: str) -> str:
@@ -59,6 +62,18 @@ class ScriptCacheTest(unittest.TestCase):
         cache.clear()
         self.assertEqual(0, len(cache._cache))
 
+    def test_clear_script(self):
+        """`clear` with a script path only removes that script's entry."""
+        cache = ScriptCache()
+        cache.get_bytecode(_get_script_path("good_script.py"))
+        cache.get_bytecode(_get_script_path("good_script2.py"))
+
+        cache.clear(_get_script_path("good_script.py"))
+        self.assertEqual(
+            [os.path.abspath(_get_script_path("good_script2.py"))],
+            list(cache._cache),
+        )
+
     def test_file_not_found_error(self):
         """An exception is thrown when a script file doesn't exist."""
         cache = ScriptCache()
@@ -70,3 +85,99 @@ class ScriptCacheTest(unittest.TestCase):
         cache = ScriptCache()
         with self.assertRaises(SyntaxError):
             cache.get_bytecode(_get_script_path("compile_error.py.txt"))
+
+
+class PersistentScriptCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        config_patcher = patch_config_options({"runner.persistBytecodeCache": True})
+        config_patcher.__enter__()
+        self.addCleanup(config_patcher.__exit__, None, None, None)
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "bytecode_cache")
+        patcher = mock.patch(
+            "streamlit.runtime.scriptrunner.script_cache.get_bytecode_cache_folder_path",
+            return_value=self.cache_dir,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.script_path = os.path.join(self.temp_dir.name, "script.py")
+        self._write_script("x = 1")
+
+    def tearDown(self) -> None:
+        self.temp_dir.cleanup()
+        super().tearDown()
+
+    def _write_script(self, source: str) -> None:
+        with open(self.script_path, "w") as f:
+            f.write(source)
+
+    def _exec_script(self, cache: ScriptCache) -> dict:
+        namespace: dict = {}
+        exec(cache.get_bytecode(self.script_path), namespace)
+        return namespace
+
+    @mock.patch(
+        "streamlit.runtime.scriptrunner.script_cache.magic.add_magic",
+        side_effect=magic.add_magic,
+    )
+    def test_loads_bytecode_from_disk(self, mock_add_magic: Mock):
+        """A new ScriptCache loads the bytecode from disk instead of compiling
+        the script again.
+        """
+        self.assertEqual(1, self._exec_script(ScriptCache())["x"])
+        self.assertEqual(1, len(os.listdir(self.cache_dir)))
+        mock_add_magic.assert_called_once()
+
+        mock_add_magic.reset_mock()
+        self.assertEqual(1, self._exec_script(ScriptCache())["x"])
+        mock_add_magic.assert_not_called()
+
+    def test_replaces_stale_files(self):
+        """A changed script is compiled again, and its stale file is removed."""
+        self._exec_script(ScriptCache())
+        self._write_script("x = 2")
+
+        self.assertEqual(2, self._exec_script(ScriptCache())["x"])
+        self.assertEqual(1, len(os.listdir(self.cache_dir)))
+
+    def test_key_includes_magic_flag(self):
+        """Bytecode compiled with magic isn't used when magic is disabled."""
+        self._write_script("'magic string'")
+        self._exec_script(ScriptCache())
+
+        with patch_config_options({"runner.magicEnabled": False}), mock.patch(
+            "streamlit.runtime.scriptrunner.script_cache.magic.add_magic"
+        ) as mock_add_magic:
+            ScriptCache().get_bytecode(self.script_path)
+            mock_add_magic.assert_not_called()
+        self.assertEqual(1, len(os.listdir(self.cache_dir)))
+
+    def test_key_includes_magic_options(self):
+        """Bytecode compiled with other magic options isn't used."""
+        self._write_script("'magic string'")
+        self._exec_script(ScriptCache())
+
+        for option in ["displayLastExprIfNoSemicolon", "displayRootDocString"]:
+            with patch_config_options({f"magic.{option}": True}), mock.patch(
+                "streamlit.runtime.scriptrunner.script_cache.magic.add_magic",
+                side_effect=magic.add_magic,
+            ) as mock_add_magic:
+                ScriptCache().get_bytecode(self.script_path)
+                mock_add_magic.assert_called_once()
+
+    def test_key_includes_streamlit_version(self):
+        """Bytecode compiled by another Streamlit version isn't used."""
+        self._exec_script(ScriptCache())
+
+        with mock.patch(
+            "streamlit.runtime.scriptrunner.script_cache.STREAMLIT_VERSION_STRING",
+            "0.0.0",
+        ), mock.patch(
+            "streamlit.runtime.scriptrunner.script_cache.magic.add_magic",
+            side_effect=magic.add_magic,
+        ) as mock_add_magic:
+            ScriptCache().get_bytecode(self.script_path)
+            mock_add_magic.assert_called_once()
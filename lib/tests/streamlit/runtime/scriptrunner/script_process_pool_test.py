@@ -0,0 +1,341 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for ScriptProcessPool."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import threading
+import types
+import unittest
+from unittest.mock import MagicMock, patch
+
+from streamlit.proto.ClientState_pb2 import ClientState
+from streamlit.proto.WidgetStates_pb2 import WidgetStates
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.memory_uploaded_file_manager import MemoryUploadedFileManager
+from streamlit.runtime.scriptrunner.script_process_pool import (
+    ProcessScriptRunner,
+    ScriptProcessPool,
+    _ForwardingMediaFileStorage,
+    _get_uploaded_files,
+    _picklable_event_kwargs,
+    _Worker,
+)
+from streamlit.runtime.scriptrunner.script_runner import ScriptRunnerEvent
+from streamlit.runtime.scriptrunner_utils.script_requests import RerunData
+from streamlit.runtime.uploaded_file_manager import UploadedFileRec
+
+
+class _Unpicklable(Exception):
+    def __reduce__(self):
+        raise TypeError("can't pickle")
+
+
+class ScriptProcessPoolHelpersTest(unittest.TestCase):
+    def test_get_uploaded_files(self):
+        """Only the files that file_uploader widgets refer to are returned."""
+        mgr = MemoryUploadedFileManager("/mock/upload")
+        file1 = UploadedFileRec("file1", "a.txt", "text/plain", b"a")
+        file2 = UploadedFileRec("file2", "b.txt", "text/plain", b"b")
+        mgr.add_file("session", file1)
+        mgr.add_file("session", file2)
+
+        widget_states = WidgetStates()
+        widget = widget_states.widgets.add()
+        widget.id = "uploader"
+        widget.file_uploader_state_value.uploaded_file_info.add(file_id="file2")
+        other_widget = widget_states.widgets.add()
+        other_widget.id = "checkbox"
+        other_widget.bool_value = True
+
+        self.assertEqual(
+            [file2],
+            _get_uploaded_files(mgr, "session", RerunData(widget_states=widget_states)),
+        )
+        self.assertEqual([], _get_uploaded_files(mgr, "session", RerunData()))
+
+    def test_forwards_media_files_once(self):
+        """Worker media files are forwarded when they're first added and when
+        they're deleted.
+        """
+        send = MagicMock()
+        storage = _ForwardingMediaFileStorage("/media", send)
+
+        file_id = storage.load_and_get_id(b"data", "image/png", "media")
+        storage.load_and_get_id(b"data", "image/png", "media")
+        send.assert_called_once_with(
+            ("media_added", b"data", "image/png", "media", None)
+        )
+
+        send.reset_mock()
+        storage.delete_file(file_id)
+        storage.delete_file(file_id)
+        send.assert_called_once_with(("media_deleted", file_id))
+
+    def test_picklable_event_kwargs(self):
+        """Exceptions that can't be pickled are replaced."""
+        exception = ValueError("oh no")
+        self.assertIs(
+            exception, _picklable_event_kwargs({"exception": exception})["exception"]
+        )
+
+        replaced = _picklable_event_kwargs({"exception": _Unpicklable("oh no")})
+        self.assertIsInstance(replaced["exception"], RuntimeError)
+        self.assertEqual("oh no", str(replaced["exception"]))
+
+    def test_mirrors_media_files_by_reference_count(self):
+        """A media file mirrored from several workers is only deleted from the
+        server's storage once all of them have deleted it.
+        """
+        storage = MemoryMediaFileStorage("/media")
+        pool = ScriptProcessPool(
+            2, "/mock/script.py", storage, MemoryUploadedFileManager("/upload")
+        )
+
+        pool._on_media_file_added(b"data", "image/png", "media", None)
+        pool._on_media_file_added(b"data", "image/png", "media", None)
+        (file_id,) = storage._files_by_id
+
+        pool._on_media_file_deleted(file_id)
+        self.assertIn(file_id, storage._files_by_id)
+        pool._on_media_file_deleted(file_id)
+        self.assertNotIn(file_id, storage._files_by_id)
+
+    def test_invalid_num_processes(self):
+        with self.assertRaises(ValueError):
+            ScriptProcessPool(
+                0,
+                "/mock/script.py",
+                MemoryMediaFileStorage("/media"),
+                MemoryUploadedFileManager("/upload"),
+            )
+
+
+class ProcessScriptRunnerTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.worker = MagicMock()
+        self.worker.request_rerun.return_value = True
+        self.runner = ProcessScriptRunner(self.worker, 0, "session", RerunData(), {})
+        self.events: list[ScriptRunnerEvent] = []
+        self.rejected: list[RerunData] = []
+        self.runner.on_event.connect(
+            lambda sender, event, **kwargs: self.events.append(event), weak=False
+        )
+        self.runner.on_rerun_rejected.connect(
+            lambda sender, rerun_data: self.rejected.append(rerun_data), weak=False
+        )
+
+    def test_request_rerun_doesnt_wait_for_ack(self):
+        self.assertTrue(self.runner.request_rerun(RerunData()))
+        self.worker.request_rerun.assert_called_once()
+        self.runner._on_rerun_ack(True)
+        self.assertEqual([], self.rejected)
+
+    def test_rejected_rerun_reported_once(self):
+        """The latest rerun is reported when the worker rejects a request, and
+        later requests are refused right away.
+        """
+        self.runner.request_rerun(RerunData(page_name="page1"))
+        self.runner.request_rerun(RerunData(page_name="page2"))
+
+        self.runner._on_rerun_ack(False)
+        self.runner._on_rerun_ack(False)
+        self.assertFalse(self.runner.request_rerun(RerunData()))
+
+        self.runner._on_worker_event(
+            ScriptRunnerEvent.SHUTDOWN, {"client_state": ClientState()}
+        )
+        self.assertEqual(
+            ["page2"], [rerun_data.page_name for rerun_data in self.rejected]
+        )
+
+    def test_rejected_rerun_reported_after_script_stopped(self):
+        """A rejected rerun is only reported once the worker's ScriptRunner
+        shut down, so that it doesn't run concurrently with the current run.
+        """
+        self.runner.request_rerun(RerunData())
+        self.runner._on_rerun_ack(False)
+        self.runner._on_worker_event(ScriptRunnerEvent.SCRIPT_STOPPED_WITH_SUCCESS, {})
+        self.assertEqual([], self.rejected)
+
+        self.runner._on_worker_event(
+            ScriptRunnerEvent.SHUTDOWN, {"client_state": ClientState()}
+        )
+        self.assertEqual(1, len(self.rejected))
+        self.assertEqual(
+            [
+                ScriptRunnerEvent.SCRIPT_STOPPED_WITH_SUCCESS,
+                ScriptRunnerEvent.SHUTDOWN,
+            ],
+            self.events,
+        )
+
+    def test_shutdown_waits_for_pending_reruns(self):
+        """SHUTDOWN is only emitted once the pending rerun requests are
+        acknowledged, so that a rejected rerun is reported first.
+        """
+        self.runner.request_rerun(RerunData())
+        self.runner._on_worker_event(
+            ScriptRunnerEvent.SHUTDOWN, {"client_state": ClientState()}
+        )
+        self.assertEqual([], self.events)
+
+        self.runner._on_rerun_ack(False)
+        self.assertEqual(1, len(self.rejected))
+        self.assertEqual([ScriptRunnerEvent.SHUTDOWN], self.events)
+
+    def test_request_rerun_on_dead_worker(self):
+        self.worker.request_rerun.return_value = False
+        self.assertFalse(self.runner.request_rerun(RerunData()))
+
+
+class WorkerTest(unittest.TestCase):
+    @patch(
+        "streamlit.runtime.scriptrunner.script_process_pool._RERUN_ACK_POLL_INTERVAL",
+        0.01,
+    )
+    @patch("streamlit.runtime.scriptrunner.script_process_pool._RERUN_ACK_TIMEOUT", 0)
+    def test_unacknowledged_rerun_rejected(self):
+        """A rerun request the worker doesn't acknowledge in time is rejected
+        on the reader thread, and the worker's runner is stopped.
+        """
+        parent_conn, child_conn = multiprocessing.Pipe()
+        self.addCleanup(child_conn.close)
+        pool = MagicMock()
+        pool._get_uploaded_files.return_value = []
+        worker = _Worker(pool, MagicMock(), parent_conn)
+        runner = MagicMock(_runner_id=0, _session_id="session")
+        rejected = threading.Event()
+        runner._on_rerun_ack.side_effect = lambda accepted: rejected.set()
+
+        self.assertTrue(worker.request_rerun(runner, RerunData()))
+        self.assertTrue(rejected.wait(10))
+        runner._on_rerun_ack.assert_called_once_with(False)
+        runner.request_stop.assert_called_once()
+        self.assertEqual("rerun", child_conn.recv()[0])
+
+
+class ScriptProcessPoolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        fd, self.script_path = tempfile.mkstemp(suffix=".py")
+        with os.fdopen(fd, "w") as f:
+            f.write("import os\nimport streamlit as st\nst.text(os.getpid())\n")
+
+        # Spawned workers re-import the __main__ module, which other tests may
+        # have replaced with a script that no longer exists.
+        main_patcher = patch.dict(
+            sys.modules, {"__main__": types.ModuleType("__main__")}
+        )
+        main_patcher.start()
+        self.addCleanup(main_patcher.stop)
+
+        self.pool = ScriptProcessPool(
+            1,
+            self.script_path,
+            MemoryMediaFileStorage("/media"),
+            MemoryUploadedFileManager("/upload"),
+        )
+
+    def tearDown(self) -> None:
+        self.pool.shutdown()
+        os.remove(self.script_path)
+        super().tearDown()
+
+    def _run_script(self, session_id: str) -> list[tuple[ScriptRunnerEvent, dict]]:
+        events: list[tuple[ScriptRunnerEvent, dict]] = []
+        shutdown = threading.Event()
+
+        def on_event(sender, event, **kwargs):
+            events.append((event, kwargs))
+            if event == ScriptRunnerEvent.SHUTDOWN:
+                shutdown.set()
+
+        runner = self.pool.create_runner(session_id, RerunData(), {})
+        runner.on_event.connect(on_event, weak=False)
+        runner.start()
+        self.assertTrue(shutdown.wait(60))
+        return events
+
+    def test_runs_script_in_worker_process(self):
+        """Scripts run in a worker process, and their events are re-emitted in
+        the server process. Sessions share the worker.
+        """
+        for session_id in ("session1", "session2"):
+            events = self._run_script(session_id)
+
+            self.assertEqual(
+                [
+                    ScriptRunnerEvent.SCRIPT_STARTED,
+                    ScriptRunnerEvent.ENQUEUE_FORWARD_MSG,
+                    ScriptRunnerEvent.SCRIPT_STOPPED_WITH_SUCCESS,
+                    ScriptRunnerEvent.SHUTDOWN,
+                ],
+                [event for event, _ in events],
+            )
+            forward_msg = events[1][1]["forward_msg"]
+            worker_pid = int(forward_msg.delta.new_element.text.body)
+            self.assertNotEqual(os.getpid(), worker_pid)
+
+        self.assertEqual(1, len(self.pool._workers))
+
+    @patch(
+        "streamlit.runtime.scriptrunner.script_process_pool._RERUN_ACK_POLL_INTERVAL",
+        0.01,
+    )
+    @patch("streamlit.runtime.scriptrunner.script_process_pool._RERUN_ACK_TIMEOUT", 0)
+    def test_rerun_ack_timeout_waits_for_script_to_stop(self):
+        """When a slow script's worker doesn't acknowledge a rerun in time, the
+        rerun is only rejected once the script stopped running.
+        """
+        with open(self.script_path, "w") as f:
+            f.write("import time\nimport streamlit as st\ntime.sleep(1)\nst.text(1)\n")
+
+        events: list[str] = []
+        shutdown = threading.Event()
+
+        def on_event(sender, event, **kwargs):
+            events.append(event.name)
+            if event == ScriptRunnerEvent.SCRIPT_STARTED:
+                self.assertTrue(runner.request_rerun(RerunData()))
+            elif event == ScriptRunnerEvent.SHUTDOWN:
+                shutdown.set()
+
+        runner = self.pool.create_runner("session", RerunData(), {})
+        runner.on_event.connect(on_event, weak=False)
+        runner.on_rerun_rejected.connect(
+            lambda sender, rerun_data: events.append("rerun_rejected"), weak=False
+        )
+
+        # Rerun acks are dropped, as if the worker were too busy to send them.
+        handle_message = _Worker._handle_message
+        with patch.object(
+            _Worker,
+            "_handle_message",
+            lambda worker, msg: None
+            if msg[0] == "rerun_ack"
+            else handle_message(worker, msg),
+        ):
+            runner.start()
+            self.assertTrue(shutdown.wait(60))
+
+        self.assertEqual("SCRIPT_STARTED", events[0])
+        self.assertEqual(["rerun_rejected", "SHUTDOWN"], events[-2:])
+        self.assertEqual(1, events.count("rerun_rejected"))
@@ -0,0 +1,146 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for ScriptRunnerPool."""
+
+from __future__ import annotations
+
+import threading
+import time
+import unittest
+
+from streamlit.runtime.scriptrunner.script_runner_pool import ScriptRunnerPool
+
+
+def _wait_for(condition, timeout: float = 5) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("Timed out waiting for condition")
+        time.sleep(0.005)
+
+
+class ScriptRunnerPoolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.pools: list[ScriptRunnerPool] = []
+
+    def tearDown(self) -> None:
+        for pool in self.pools:
+            pool.shutdown()
+        super().tearDown()
+
+    def _create_pool(self, max_workers: int) -> ScriptRunnerPool:
+        pool = ScriptRunnerPool(max_workers)
+        self.pools.append(pool)
+        return pool
+
+    def test_invalid_max_workers(self):
+        with self.assertRaises(ValueError):
+            ScriptRunnerPool(0)
+
+    def test_runs_jobs_on_reused_workers(self):
+        """Jobs run on worker threads, which are reused for later jobs."""
+        pool = self._create_pool(2)
+        threads: list[threading.Thread] = []
+
+        for i in range(3):
+            pool.submit("session", lambda: threads.append(threading.current_thread()))
+            _wait_for(lambda i=i: pool.stats.num_completed_jobs == i + 1)
+
+        self.assertEqual(3, len(threads))
+        self.assertEqual(1, len(set(threads)))
+        self.assertNotEqual(threading.current_thread(), threads[0])
+        self.assertEqual(1, pool.stats.num_workers)
+
+    def test_limits_concurrency(self):
+        """No more than max_workers jobs run at the same time."""
+        pool = self._create_pool(2)
+        release = threading.Event()
+        lock = threading.Lock()
+        running = [0]
+        max_running = [0]
+
+        def job():
+            with lock:
+                running[0] += 1
+                max_running[0] = max(max_running[0], running[0])
+            release.wait()
+            with lock:
+                running[0] -= 1
+
+        for i in range(5):
+            pool.submit(f"session{i}", job)
+
+        _wait_for(lambda: pool.stats.num_busy_workers == 2)
+        self.assertEqual(3, pool.stats.num_queued_jobs)
+
+        release.set()
+        _wait_for(lambda: pool.stats.num_completed_jobs == 5)
+        self.assertEqual(2, max_running[0])
+        self.assertEqual(2, pool.stats.num_workers)
+
+    def test_round_robin_by_session(self):
+        """Queued jobs are taken round-robin by session."""
+        pool = self._create_pool(1)
+        release = threading.Event()
+        order: list[str] = []
+
+        pool.submit("blocker", release.wait)
+        _wait_for(lambda: pool.stats.num_busy_workers == 1)
+
+        for name in ("a1", "a2", "a3"):
+            pool.submit("a", lambda name=name: order.append(name))
+        pool.submit("b", lambda: order.append("b1"))
+
+        release.set()
+        _wait_for(lambda: pool.stats.num_completed_jobs == 5)
+        self.assertEqual(["a1", "b1", "a2", "a3"], order)
+
+    def test_records_wait_and_run_time(self):
+        """Stats separate the time jobs waited for a worker from their run time."""
+        pool = self._create_pool(1)
+        pool.submit("a", lambda: time.sleep(0.05))
+        pool.submit("b", lambda: None)
+        _wait_for(lambda: pool.stats.num_completed_jobs == 2)
+
+        stats = pool.stats
+        self.assertGreaterEqual(stats.total_run_time, 0.05)
+        self.assertGreaterEqual(stats.max_wait_time, 0.04)
+        self.assertGreaterEqual(stats.total_wait_time, stats.max_wait_time)
+
+    def test_job_exception_doesnt_kill_worker(self):
+        """A job that raises doesn't stop its worker from running later jobs."""
+        pool = self._create_pool(1)
+        done = threading.Event()
+
+        def failing_job():
+            raise RuntimeError("oh no")
+
+        pool.submit("session", failing_job)
+        pool.submit("session", done.set)
+
+        self.assertTrue(done.wait(5))
+        self.assertEqual(1, pool.stats.num_workers)
+
+    def test_shutdown(self):
+        """After shutdown, workers exit and new jobs are rejected."""
+        pool = self._create_pool(1)
+        pool.submit("session", lambda: None)
+        _wait_for(lambda: pool.stats.num_completed_jobs == 1)
+
+        pool.shutdown()
+        _wait_for(lambda: pool.stats.num_workers == 0)
+        with self.assertRaises(RuntimeError):
+            pool.submit("session", lambda: None)
@@ -18,6 +18,7 @@ from __future__ import annotations
 
 import os
 import sys
+import threading
 import time
 from typing import TYPE_CHECKING, Any
 from unittest.mock import MagicMock, call, patch
@@ -46,11 +47,15 @@ from streamlit.runtime.scriptrunner import (
     StopException,
 )
 from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+from streamlit.runtime.scriptrunner.script_runner_pool import ScriptRunnerPool
 from streamlit.runtime.scriptrunner_utils.script_requests import (
     ScriptRequest,
     ScriptRequests,
     ScriptRequestType,
 )
+from streamlit.runtime.scriptrunner_utils.script_run_context import (
+    SCRIPT_RUN_CONTEXT_ATTR_NAME,
+)
 from streamlit.runtime.state.session_state import SessionState
 from tests import testutil
 
@@ -234,6 +239,51 @@ class ScriptRunnerTest(AsyncTestCase):
         self._assert_no_exceptions(scriptrunner)
         self.assertEqual(3, run_script_mock.call_count)
 
+    def test_run_script_in_worker_pool(self):
+        """A ScriptRunner with a worker pool runs on one of the pool's threads,
+        and detaches its ScriptRunContext from it when done.
+        """
+        pool = ScriptRunnerPool(1)
+        self.addCleanup(pool.shutdown)
+        scriptrunner = TestScriptRunner("good_script.py", worker_pool=pool)
+        scriptrunner._fragment_storage = MagicMock()
+
+        script_threads = []
+        original_run_script = scriptrunner._run_script
+
+        def run_script(rerun_data):
+            script_threads.append(threading.current_thread())
+            original_run_script(rerun_data)
+
+        scriptrunner._run_script = run_script
+        scriptrunner.request_rerun(RerunData())
+        scriptrunner.start()
+
+        deadline = time.monotonic() + 5
+        while pool.stats.num_completed_jobs == 0 and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+        self._assert_no_exceptions(scriptrunner)
+        self._assert_control_events(
+            scriptrunner,
+            [
+                ScriptRunnerEvent.SCRIPT_STARTED,
+                ScriptRunnerEvent.SCRIPT_STOPPED_WITH_SUCCESS,
+                ScriptRunnerEvent.SHUTDOWN,
+            ],
+        )
+        self._assert_text_deltas(scriptrunner, [text_utf])
+
+        self.assertEqual(1, len(script_threads))
+        self.assertNotEqual(threading.current_thread(), script_threads[0])
+        self.assertIsNone(
+            getattr(script_threads[0], SCRIPT_RUN_CONTEXT_ATTR_NAME, None)
+        )
+        self.assertIsNone(scriptrunner._script_thread)
+
+        with self.assertRaisesRegex(Exception, "already started"):
+            scriptrunner.start()
+
     @parameterized.expand(
         [
             ("good_script.py", text_utf),
@@ -275,6 +325,28 @@ class ScriptRunnerTest(AsyncTestCase):
 
         Runtime._instance.media_file_mgr.clear_session_refs.assert_called_once()
 
+    def test_restores_persisted_session_state(self):
+        """A Session State restore scheduled for the session is done on the
+        script thread, before the script runs.
+        """
+        persister = MagicMock()
+        Runtime._instance.session_state_persister = persister
+        restore_threads = []
+        persister.restore_pending.side_effect = lambda *args: restore_threads.append(
+            threading.current_thread()
+        )
+
+        scriptrunner = TestScriptRunner("good_script.py")
+        scriptrunner.request_rerun(RerunData())
+        scriptrunner.start()
+        scriptrunner.join()
+
+        self._assert_no_exceptions(scriptrunner)
+        persister.restore_pending.assert_called_once_with(
+            scriptrunner._session_id, scriptrunner._session_state
+        )
+        self.assertEqual([scriptrunner._script_thread], restore_threads)
+
     @patch("streamlit.elements.exception._exception")
     def test_run_nonexistent_fragment(self, mocked_st_exception):
         """Tests that we raise an exception when trying to run a nonexistent fragment."""
@@ -761,6 +833,48 @@ class ScriptRunnerTest(AsyncTestCase):
         )
         self._assert_text_deltas(scriptrunner, ["loop_forever"])
 
+    @pytest.mark.skipif(
+        sys.gettrace() is not None, reason="Interrupting requires sys.settrace"
+    )
+    def test_interrupt_pure_python_loop(self):
+        """With runner.interruptCheckIntervalMs, a stop request interrupts a
+        loop that doesn't call Streamlit.
+        """
+        with testutil.patch_config_options({"runner.interruptCheckIntervalMs": 1}):
+            scriptrunner = TestScriptRunner("pure_python_loop.py")
+        scriptrunner.request_rerun(RerunData())
+        scriptrunner.start()
+
+        time.sleep(0.1)
+        scriptrunner.request_stop()
+        scriptrunner._script_thread.join(timeout=5)
+        self.assertFalse(scriptrunner._script_thread.is_alive())
+
+        self._assert_no_exceptions(scriptrunner)
+        self._assert_control_events(
+            scriptrunner,
+            [
+                ScriptRunnerEvent.SCRIPT_STARTED,
+                ScriptRunnerEvent.SCRIPT_STOPPED_WITH_SUCCESS,
+                ScriptRunnerEvent.SHUTDOWN,
+            ],
+        )
+        self._assert_text_deltas(scriptrunner, ["looping"])
+        self.assertIsNone(sys.gettrace())
+
+    def test_cancellation_token(self):
+        """The ScriptRunContext's cancellation token is cancelled by a stop
+        request.
+        """
+        scriptrunner = TestScriptRunner("good_script.py")
+        token = scriptrunner._cancellation_token
+        # Take the initial rerun request, as the script thread does.
+        scriptrunner._requests.on_scriptrunner_ready()
+        self.assertFalse(token.is_cancelled)
+
+        scriptrunner.request_stop()
+        self.assertTrue(token.is_cancelled)
+
     def test_widgets(self):
         """Tests that widget values behave as expected."""
         scriptrunner = TestScriptRunner("widgets_script.py")
@@ -1204,7 +1318,7 @@ class TestScriptRunner(ScriptRunner):
     # To prevent PytestCollectionWarning we set __test__ property to False
     __test__ = False
 
-    def __init__(self, script_name: str):
+    def __init__(self, script_name: str, worker_pool: ScriptRunnerPool | None = None):
         """Initializes the ScriptRunner for the given script_name"""
         # DeltaGenerator deltas will be enqueued into self.forward_msg_queue.
         self.forward_msg_queue = ForwardMsgQueue()
@@ -1223,6 +1337,7 @@ class TestScriptRunner(ScriptRunner):
             user_info={"email": "test@example.com"},
             fragment_storage=MemoryFragmentStorage(),
             pages_manager=PagesManager(main_script_path),
+            worker_pool=worker_pool,
         )
 
         # Accumulates uncaught exceptions thrown by our run thread.
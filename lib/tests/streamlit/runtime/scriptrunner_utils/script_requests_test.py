@@ -15,6 +15,7 @@
 from __future__ import annotations
 
 import unittest
+from unittest.mock import MagicMock
 
 from streamlit.proto.WidgetStates_pb2 import WidgetState, WidgetStates
 from streamlit.runtime.scriptrunner_utils.script_requests import (
@@ -22,6 +23,7 @@ from streamlit.runtime.scriptrunner_utils.script_requests import (
     ScriptRequest,
     ScriptRequests,
     ScriptRequestType,
+    ScriptRunCancellationToken,
 )
 
 
@@ -266,6 +268,40 @@ class ScriptRequestsTest(unittest.TestCase):
         self.assertEqual(ScriptRequest(ScriptRequestType.RERUN, RerunData()), result)
         self.assertEqual(ScriptRequestType.CONTINUE, reqs._state)
 
+    def test_has_interrupt_request(self):
+        """Stop requests and preempting rerun requests are interrupt requests,
+        but fragment reruns that don't preempt the script aren't.
+        """
+        reqs = ScriptRequests()
+        self.assertFalse(reqs.has_interrupt_request)
+
+        reqs.request_rerun(RerunData(fragment_id_queue=["my_fragment_id"]))
+        self.assertFalse(reqs.has_interrupt_request)
+
+        reqs.request_rerun(RerunData())
+        self.assertTrue(reqs.has_interrupt_request)
+
+        reqs.on_scriptrunner_yield()
+        self.assertFalse(reqs.has_interrupt_request)
+
+        reqs.request_stop()
+        self.assertTrue(reqs.has_interrupt_request)
+
+    def test_cancellation_token(self):
+        """The token only yields to the ScriptRunner once it's cancelled."""
+        reqs = ScriptRequests()
+        yield_callback = MagicMock()
+        token = ScriptRunCancellationToken(reqs, yield_callback)
+
+        token.raise_if_cancelled()
+        self.assertFalse(token.is_cancelled)
+        yield_callback.assert_not_called()
+
+        reqs.request_rerun(RerunData())
+        token.raise_if_cancelled()
+        self.assertTrue(token.is_cancelled)
+        yield_callback.assert_called_once()
+
     def test_on_script_complete_with_no_request(self):
         """Return STOP; transition to the STOP state."""
         reqs = ScriptRequests()
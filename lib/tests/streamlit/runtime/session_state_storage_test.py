@@ -0,0 +1,188 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for SessionStatePersister."""
+
+from __future__ import annotations
+
+import unittest
+from typing import Collection, Mapping
+from unittest.mock import patch
+
+from parameterized import parameterized
+
+from streamlit.runtime.session_state_storage import (
+    SessionStatePersister,
+    SessionStateStorage,
+    SessionStateStorageError,
+)
+from streamlit.runtime.state import SafeSessionState, SessionState
+from streamlit.runtime.state.common import GENERATED_ELEMENT_ID_PREFIX
+
+
+class _DictSessionStateStorage(SessionStateStorage):
+    """A SessionStateStorage that records the calls to save."""
+
+    def __init__(self) -> None:
+        self.sessions: dict[str, dict[str, bytes]] = {}
+        self.saves: list[tuple[set[str], set[str]]] = []
+
+    def load(self, session_id: str) -> dict[str, bytes]:
+        return dict(self.sessions.get(session_id, {}))
+
+    def save(
+        self,
+        session_id: str,
+        changed_values: Mapping[str, bytes],
+        removed_keys: Collection[str],
+    ) -> None:
+        self.saves.append((set(changed_values), set(removed_keys)))
+        values = self.sessions.setdefault(session_id, {})
+        values.update(changed_values)
+        for key in removed_keys:
+            values.pop(key, None)
+
+    def delete(self, session_id: str) -> None:
+        self.sessions.pop(session_id, None)
+
+
+class SessionStatePersisterTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.storage = _DictSessionStateStorage()
+        self.persister = SessionStatePersister(self.storage)
+        self.state = SessionState()
+        self.safe_state = SafeSessionState(self.state, lambda: None)
+
+    def _snapshot(self) -> tuple[set[str], set[str]] | None:
+        """Take a snapshot and return the keys it saved and removed, or None
+        if it didn't save anything.
+        """
+        num_saves = len(self.storage.saves)
+        self.persister.snapshot("session", self.safe_state)
+        self.assertLessEqual(len(self.storage.saves), num_saves + 1)
+        return self.storage.saves[-1] if len(self.storage.saves) > num_saves else None
+
+    def test_snapshot_is_incremental(self):
+        self.state["a"] = 1
+        self.state["b"] = [1]
+        self.assertEqual(({"a", "b"}, set()), self._snapshot())
+        self.assertIsNone(self._snapshot())
+
+        self.state["a"] = 2
+        self.assertEqual(({"a"}, set()), self._snapshot())
+
+        # Values that are only read aren't written again.
+        self.state["b"]
+        self.assertIsNone(self._snapshot())
+
+        del self.state["a"]
+        self.assertEqual((set(), {"a"}), self._snapshot())
+        self.assertIsNone(self._snapshot())
+
+    def test_snapshot_excludes_widgets_and_internal_keys(self):
+        self.state["a"] = 1
+        self.state[f"{GENERATED_ELEMENT_ID_PREFIX}-widget"] = 2
+        self.state["$$STREAMLIT_INTERNAL_KEY_foo"] = 3
+
+        self.assertEqual(({"a"}, set()), self._snapshot())
+
+    def test_unencodable_values_removed(self):
+        self.state["a"] = 1
+        self._snapshot()
+
+        self.state["a"] = lambda: None
+        self.assertEqual((set(), {"a"}), self._snapshot())
+        # It isn't tried again until it changes.
+        self.assertIsNone(self._snapshot())
+
+    @patch("streamlit.runtime.session_state_storage._LOGGER")
+    def test_failed_snapshot_retried(self, patched_logger):
+        self.state["a"] = 1
+        with patch.object(
+            self.storage, "save", side_effect=SessionStateStorageError("oh no")
+        ):
+            self.persister.snapshot("session", self.safe_state)
+        patched_logger.warning.assert_called_once()
+
+        self.assertEqual(({"a"}, set()), self._snapshot())
+
+    @parameterized.expand(["pickle", "zlib"])
+    def test_restore(self, codec):
+        persister = SessionStatePersister(self.storage, codec)
+        self.state["a"] = {"nested": [1, 2]}
+        persister.snapshot("old_session", self.safe_state)
+
+        new_state = SessionState()
+        self.assertTrue(
+            persister.restore(
+                "old_session", "new_session", SafeSessionState(new_state, lambda: None)
+            )
+        )
+
+        self.assertEqual({"nested": [1, 2]}, new_state["a"])
+        self.assertNotIn("old_session", self.storage.sessions)
+        self.assertEqual(["a"], list(self.storage.sessions["new_session"]))
+
+    def test_restored_values_not_saved_again(self):
+        self.storage.sessions["old_session"] = {
+            "a": self.persister._encode(1),
+            "b": self.persister._encode(2),
+        }
+        self.persister.restore("old_session", "session", self.safe_state)
+        self.assertIsNone(self._snapshot())
+
+        self.state["b"] = 3
+        self.assertEqual(({"b"}, set()), self._snapshot())
+
+    def test_undecodable_values_removed(self):
+        self.storage.sessions["old_session"] = {
+            "a": self.persister._encode(1),
+            "b": b"not a pickle",
+        }
+        self.assertTrue(
+            self.persister.restore("old_session", "session", self.safe_state)
+        )
+        self.assertEqual((set(), {"b"}), self._snapshot())
+
+        self.assertEqual(1, self.state["a"])
+        self.assertNotIn("b", self.state)
+
+    def test_restore_unknown_session(self):
+        self.assertFalse(self.persister.restore("unknown", "session", self.safe_state))
+        self.assertEqual({}, self.state.filtered_state)
+
+    def test_restore_pending(self):
+        """A scheduled restore is done once, by the new session's first call to
+        restore_pending.
+        """
+        self.storage.sessions["old_session"] = {"a": self.persister._encode(1)}
+        self.persister.schedule_restore("old_session", "session")
+
+        self.assertFalse(self.persister.restore_pending("other", self.safe_state))
+        self.assertTrue(self.persister.restore_pending("session", self.safe_state))
+        self.assertEqual(1, self.state["a"])
+        self.assertFalse(self.persister.restore_pending("session", self.safe_state))
+
+    def test_cancel_restore(self):
+        self.storage.sessions["old_session"] = {"a": self.persister._encode(1)}
+        self.persister.schedule_restore("old_session", "session")
+        self.persister.cancel_restore("session")
+
+        self.assertFalse(self.persister.restore_pending("session", self.safe_state))
+        self.assertIn("old_session", self.storage.sessions)
+
+    def test_unknown_codec(self):
+        with self.assertRaises(ValueError):
+            SessionStatePersister(self.storage, "unknown")
@@ -0,0 +1,89 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for SQLiteSessionStateStorage."""
+
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from streamlit.runtime.session_state_storage import SessionStateStorageError
+from streamlit.runtime.sqlite_session_state_storage import SQLiteSessionStateStorage
+
+
+class SQLiteSessionStateStorageTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(tempdir.cleanup)
+        self.tempdir = tempdir.name
+        self.path = os.path.join(self.tempdir, "state", "session_state.db")
+
+    def _create_storage(self, **kwargs) -> SQLiteSessionStateStorage:
+        storage = SQLiteSessionStateStorage(self.path, **kwargs)
+        self.addCleanup(storage.close)
+        return storage
+
+    def test_save_and_load(self):
+        storage = self._create_storage()
+        storage.save("session1", {"a": b"1", "b": b"2"}, ())
+        storage.save("session1", {"b": b"3"}, ["a"])
+        storage.save("session2", {"a": b"4"}, ())
+
+        self.assertEqual({"b": b"3"}, storage.load("session1"))
+        self.assertEqual({"a": b"4"}, storage.load("session2"))
+        self.assertEqual({}, storage.load("unknown_session"))
+
+    def test_delete(self):
+        storage = self._create_storage()
+        storage.save("session1", {"a": b"1"}, ())
+        storage.save("session2", {"a": b"2"}, ())
+
+        storage.delete("session1")
+
+        self.assertEqual({}, storage.load("session1"))
+        self.assertEqual({"a": b"2"}, storage.load("session2"))
+
+    def test_values_outlive_storage(self):
+        """Values are still there when the database is opened again, e.g.
+        after a server restart.
+        """
+        storage = SQLiteSessionStateStorage(self.path)
+        storage.save("session1", {"a": b"1"}, ())
+        storage.close()
+
+        self.assertEqual({"a": b"1"}, self._create_storage().load("session1"))
+
+    @patch("streamlit.runtime.sqlite_session_state_storage.time.time")
+    def test_expired_values_removed(self, patched_time):
+        patched_time.return_value = 1000
+        storage = self._create_storage(ttl_seconds=60)
+        storage.save("session1", {"a": b"1"}, ())
+        patched_time.return_value = 1030
+        storage.save("session2", {"a": b"2"}, ())
+
+        patched_time.return_value = 1070
+        self.assertEqual({}, storage.load("session1"))
+        self.assertEqual({"a": b"2"}, storage.load("session2"))
+
+    def test_open_error(self):
+        not_a_dir = os.path.join(self.tempdir, "file.txt")
+        with open(not_a_dir, "w"):
+            pass
+
+        with self.assertRaises(SessionStateStorageError):
+            SQLiteSessionStateStorage(os.path.join(not_a_dir, "session_state.db"))
@@ -16,6 +16,7 @@
 
 from __future__ import annotations
 
+import pickle
 import unittest
 from copy import deepcopy
 from datetime import date, datetime, timedelta
@@ -34,10 +35,12 @@ from streamlit.errors import (
 )
 from streamlit.proto.Common_pb2 import FileURLs as FileURLsProto
 from streamlit.proto.WidgetStates_pb2 import WidgetState as WidgetStateProto
+from streamlit.proto.WidgetStates_pb2 import WidgetStates as WidgetStatesProto
 from streamlit.runtime.scriptrunner import get_script_run_ctx
 from streamlit.runtime.state import SessionState, get_session_state
 from streamlit.runtime.state.common import GENERATED_ELEMENT_ID_PREFIX
 from streamlit.runtime.state.session_state import (
+    STREAMLIT_INTERNAL_KEY_PREFIX,
     KeyIdMapper,
     Serialized,
     Value,
@@ -148,6 +151,27 @@ class WStateTests(unittest.TestCase):
         assert "widget_id_1" in self.wstates
         assert "widget_id_2" not in self.wstates
 
+    def test_remove_stale_widgets_no_metadata(self):
+        """Active widgets are stale anyway if they have no metadata."""
+        del self.wstates.widget_metadata["widget_id_1"]
+        self.wstates.remove_stale_widgets({"widget_id_1", "widget_id_2"}, None)
+        assert self.wstates.keys() == {"widget_id_2"}
+
+    def test_clear_does_not_deserialize(self):
+        deserializer = MagicMock()
+        self.wstates.set_widget_metadata(
+            WidgetMetadata(
+                id="widget_id_1",
+                deserializer=deserializer,
+                serializer=identity,
+                value_type="string_value",
+            )
+        )
+
+        self.wstates.clear()
+        assert len(self.wstates) == 0
+        deserializer.assert_not_called()
+
     def test_remove_stale_widgets_fragment_run(self):
         widget_data = [
             ("widget_id_1", "my_fragment_id"),
@@ -631,6 +655,29 @@ class SessionStateMethodTests(unittest.TestCase):
             "corge": "grault",
         }
 
+    def test_filtered_value_lookups_match_filtered_state(self):
+        keyed_widget_id = f"{GENERATED_ELEMENT_ID_PREFIX}-keyed-widget"
+        self.session_state._new_widget_state.set_from_value(keyed_widget_id, "value")
+        self.session_state._set_key_widget_mapping(keyed_widget_id, "keyed")
+        internal_key = f"{STREAMLIT_INTERNAL_KEY_PREFIX}_test"
+        self.session_state._new_session_state[internal_key] = "internal"
+
+        filtered_state = self.session_state.filtered_state
+        assert filtered_state["keyed"] == "value"
+
+        for key in [
+            *filtered_state,
+            *self.session_state._keys(),
+            internal_key,
+            "missing",
+        ]:
+            assert self.session_state.has_filtered_key(key) == (key in filtered_state)
+            if key in filtered_state:
+                assert self.session_state.get_filtered_value(key) == filtered_state[key]
+            else:
+                with pytest.raises(KeyError):
+                    self.session_state.get_filtered_value(key)
+
     def is_new_state_value(self):
         assert self.session_state.is_new_state_value("foo")
         assert not self.session_state.is_new_state_value("corge")
@@ -692,6 +739,47 @@ class SessionStateMethodTests(unittest.TestCase):
         self.session_state._new_widget_state.set_from_value("foo", "bar")
         assert not self.session_state._widget_changed("foo")
 
+    def test_widget_values_deserialized_on_demand(self):
+        """Widget values received from the frontend are only deserialized
+        right away for widgets with callbacks. Others are deserialized with
+        their current metadata once they're registered again.
+        """
+        deserializers = {}
+        for widget_id, callback in [("cb_widget", MagicMock()), ("widget", None)]:
+            deserializers[widget_id] = MagicMock(side_effect=lambda v, _: v)
+            self.session_state._set_widget_metadata(
+                WidgetMetadata(
+                    id=widget_id,
+                    deserializer=deserializers[widget_id],
+                    serializer=identity,
+                    value_type="int_value",
+                    callback=callback,
+                )
+            )
+
+        widget_states = WidgetStatesProto()
+        for widget_id in deserializers:
+            widget_state = widget_states.widgets.add()
+            widget_state.id = widget_id
+            widget_state.int_value = 5
+        self.session_state.on_script_will_rerun(widget_states)
+
+        deserializers["cb_widget"].assert_called_once()
+        deserializers["widget"].assert_not_called()
+
+        new_deserializer = MagicMock()
+        self.session_state._set_widget_metadata(
+            WidgetMetadata(
+                id="widget",
+                deserializer=new_deserializer,
+                serializer=identity,
+                value_type="int_value",
+            )
+        )
+        deserializers["widget"].assert_called_once_with(5, "widget")
+        new_deserializer.assert_not_called()
+        assert self.session_state["widget"] == 5
+
     def test_remove_stale_widgets(self):
         existing_widget_key = f"{GENERATED_ELEMENT_ID_PREFIX}-existing_widget"
         generated_widget_key = f"{GENERATED_ELEMENT_ID_PREFIX}-removed_widget"
@@ -760,6 +848,46 @@ class SessionStateMethodTests(unittest.TestCase):
         with pytest.raises(UnserializableSessionStateError):
             self.session_state._check_serializable()
 
+    @patch("streamlit.runtime.state.session_state.pickle.dumps", wraps=pickle.dumps)
+    def test_serializable_check_skips_unchanged_values(self, dumps):
+        self.session_state["list"] = [1, 2]
+        self.session_state._check_serializable()
+        dumps.assert_called_once_with([1, 2])
+
+        dumps.reset_mock()
+        self.session_state._check_serializable()
+        dumps.assert_not_called()
+
+        self.session_state["list"] = [3]
+        self.session_state._check_serializable()
+        dumps.assert_called_once_with([3])
+
+    def test_serializable_check_detects_mutated_values(self):
+        self.session_state["list"] = [1, 2]
+        self.session_state._check_serializable()
+
+        self.session_state["list"].append(lambda x: x)
+        with pytest.raises(UnserializableSessionStateError):
+            self.session_state._check_serializable()
+
+    def test_hibernate_and_wake(self):
+        expected_state = self.session_state.filtered_state
+
+        assert self.session_state.hibernate()
+        assert self.session_state._old_state == {}
+        assert self.session_state._hibernated_state is not None
+
+        self.session_state.wake()
+        assert self.session_state._hibernated_state is None
+        assert self.session_state.filtered_state == expected_state
+
+    def test_hibernate_unpicklable_values(self):
+        self.session_state["func"] = lambda x: x
+
+        assert not self.session_state.hibernate()
+        assert self.session_state._hibernated_state is None
+        assert callable(self.session_state["func"])
+
 
 @given(state=stst.session_state())
 @settings(deadline=400)
@@ -30,7 +30,7 @@ from streamlit.elements.lib.utils import (
 )
 from streamlit.proto.Common_pb2 import StringTriggerValue as StringTriggerValueProto
 from streamlit.proto.WidgetStates_pb2 import WidgetState, WidgetStates
-from streamlit.runtime.scriptrunner_utils.script_requests import _coalesce_widget_states
+from streamlit.runtime.scriptrunner_utils.script_requests import coalesce_widget_states
 from streamlit.runtime.scriptrunner_utils.script_run_context import get_script_run_ctx
 from streamlit.runtime.state.common import (
     GENERATED_ELEMENT_ID_PREFIX,
@@ -305,7 +305,7 @@ class WidgetManagerTests(unittest.TestCase):
         )
 
         session_state.set_widgets_from_proto(
-            _coalesce_widget_states(old_states, new_states)
+            coalesce_widget_states(old_states, new_states)
         )
 
         self.assertRaises(KeyError, lambda: session_state["old_unset_trigger"])
@@ -329,15 +329,15 @@ class WidgetManagerTests(unittest.TestCase):
         self.assertEqual(3, session_state["shape_changing_trigger"])
 
     def coalesce_widget_states_returns_None_if_both_inputs_None(self):
-        assert _coalesce_widget_states(None, None) is None
+        assert coalesce_widget_states(None, None) is None
 
     def coalesce_widget_states_returns_old_states_if_new_states_None(self):
         old_states = WidgetStates()
-        assert _coalesce_widget_states(old_states, None) is old_states
+        assert coalesce_widget_states(old_states, None) is old_states
 
     def coalesce_widget_states_returns_new_states_if_old_states_None(self):
         new_states = WidgetStates()
-        assert _coalesce_widget_states(None, new_states) is new_states
+        assert coalesce_widget_states(None, new_states) is new_states
 
 
 class WidgetHelperTests(unittest.TestCase):
@@ -14,14 +14,21 @@
 
 from __future__ import annotations
 
+import gc
 import unittest
+import weakref
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from streamlit.runtime.app_session import HibernationResult
 from streamlit.runtime.script_data import ScriptData
 from streamlit.runtime.session_manager import SessionStorage
-from streamlit.runtime.websocket_session_manager import WebsocketSessionManager
+from streamlit.runtime.websocket_session_manager import (
+    ReconnectStats,
+    WebsocketSessionManager,
+)
+from tests.testutil import patch_config_options
 
 
 class MockSessionStorage(SessionStorage):
@@ -169,6 +176,82 @@ class WebsocketSessionManagerTests(unittest.TestCase):
         # reconnect.
         assert reconnected_session_info.session.register_file_watchers.call_count == 2
 
+    @patch(
+        "streamlit.runtime.app_session.AppSession.register_file_watchers",
+        new=MagicMock(),
+    )
+    @patch_config_options({"server.disconnectedSessionHibernationDelay": 5})
+    def test_disconnected_session_hibernates(self):
+        session_id = self.connect_session()
+        session = self.session_mgr.get_session_info(session_id).session
+
+        # Patched here rather than with a decorator, which the class-level patch
+        # of the same asyncio function would override.
+        with patch(
+            "streamlit.runtime.websocket_session_manager.asyncio.get_running_loop"
+        ) as patched_get_running_loop, patch.object(
+            session, "hibernate", return_value=HibernationResult.BUSY
+        ) as hibernate:
+            loop = patched_get_running_loop.return_value
+            self.session_mgr.disconnect_session(session_id)
+            loop.call_later.assert_called_once()
+            delay, callback, *args = loop.call_later.call_args.args
+            self.assertEqual(5, delay)
+
+            # The session's script is still stopping, so hibernating is retried.
+            callback(*args)
+            hibernate.assert_called_once()
+            self.assertEqual(2, loop.call_later.call_count)
+
+        # Reconnecting cancels the hibernation.
+        self.connect_session(existing_session_id=session_id)
+        loop.call_later.return_value.cancel.assert_called_once()
+        self.assertEqual({}, self.session_mgr._hibernation_timers)
+
+    @patch(
+        "streamlit.runtime.app_session.AppSession.register_file_watchers",
+        new=MagicMock(),
+    )
+    @patch_config_options({"server.disconnectedSessionHibernationDelay": 5})
+    def test_failed_hibernation_isnt_retried(self):
+        """A session whose Session State can't be compressed isn't hibernated
+        again, and the hibernation timer doesn't keep the session alive.
+        """
+        session_id = self.connect_session()
+        session = self.session_mgr.get_session_info(session_id).session
+        session.session_state["foo"] = lambda: None
+
+        with patch(
+            "streamlit.runtime.websocket_session_manager.asyncio.get_running_loop"
+        ) as patched_get_running_loop:
+            loop = patched_get_running_loop.return_value
+            self.session_mgr.disconnect_session(session_id)
+            _, callback, *args = loop.call_later.call_args.args
+
+            callback(*args)
+            loop.call_later.assert_called_once()
+            self.assertEqual({}, self.session_mgr._hibernation_timers)
+
+        session_ref = weakref.ref(session)
+        self.session_mgr._session_storage.delete(session_id)
+        del session
+        gc.collect()
+        self.assertIsNone(session_ref())
+
+    def test_reconnect_stats(self):
+        """Only reconnects to disconnected sessions count as hits or misses."""
+        session_id = self.connect_session()
+        self.session_mgr.disconnect_session(session_id)
+        self.session_mgr.get_session_info(session_id)
+        self.session_mgr.get_session_info("nonexistent_session")
+
+        self.connect_session(existing_session_id=session_id)
+        self.connect_session(existing_session_id="nonexistent_session")
+
+        self.assertEqual(
+            ReconnectStats(hits=1, misses=1), self.session_mgr.reconnect_stats
+        )
+
     def test_disconnect_session_on_invalid_session_id(self):
         # Just check that no error is thrown.
         self.session_mgr.disconnect_session("nonexistent_session")
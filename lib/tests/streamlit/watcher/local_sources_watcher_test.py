@@ -321,6 +321,74 @@ class LocalSourcesWatcherTest(unittest.TestCase):
         lsw.update_watched_modules()
         register.assert_not_called()
 
+    @patch("streamlit.watcher.local_sources_watcher.PathWatcher")
+    def test_only_new_modules_are_scanned(self, _fob):
+        lsw = local_sources_watcher.LocalSourcesWatcher(PagesManager(SCRIPT_PATH))
+        lsw.update_watched_modules()
+
+        register = MagicMock()
+        lsw._register_necessary_watchers = register
+
+        sys.modules["DUMMY_MODULE_1"] = DUMMY_MODULE_1
+        sys.modules["DUMMY_MODULE_2"] = DUMMY_MODULE_2
+        lsw.update_watched_modules()
+
+        register.assert_called_once()
+        (modules_paths,), _ = register.call_args
+        self.assertEqual({"DUMMY_MODULE_1", "DUMMY_MODULE_2"}, set(modules_paths))
+        self.assertEqual({DUMMY_MODULE_1_FILE}, modules_paths["DUMMY_MODULE_1"])
+
+        # An unloaded module is scanned again when it's re-imported.
+        register.reset_mock()
+        del sys.modules["DUMMY_MODULE_1"]
+        lsw.update_watched_modules()
+        register.assert_called_once_with({})
+
+        register.reset_mock()
+        sys.modules["DUMMY_MODULE_1"] = DUMMY_MODULE_1
+        lsw.update_watched_modules()
+        (modules_paths,), _ = register.call_args
+        self.assertEqual({"DUMMY_MODULE_1"}, set(modules_paths))
+
+    @patch("streamlit.watcher.local_sources_watcher.PathWatcher")
+    def test_only_watched_paths_are_resolved(self, _fob):
+        """Paths of modules that aren't watched, e.g. of the standard library,
+        aren't resolved.
+        """
+        sys.modules["DUMMY_MODULE_1"] = DUMMY_MODULE_1
+        lsw = local_sources_watcher.LocalSourcesWatcher(PagesManager(SCRIPT_PATH))
+
+        with patch(
+            "streamlit.watcher.local_sources_watcher.Path.resolve",
+            autospec=True,
+            side_effect=lambda path: path,
+        ) as resolve:
+            lsw.update_watched_modules()
+
+        resolved_paths = {str(args[0]) for args, _ in resolve.call_args_list}
+        self.assertIn(DUMMY_MODULE_1_FILE, resolved_paths)
+        self.assertNotIn(os.__file__, resolved_paths)
+
+    @patch("streamlit.watcher.local_sources_watcher.PathWatcher")
+    def test_module_paths_are_shared_between_watchers(self, _fob):
+        """The paths of a module are only looked up once per process."""
+        sys.modules["DUMMY_MODULE_2"] = DUMMY_MODULE_2
+
+        with patch(
+            "streamlit.watcher.local_sources_watcher.get_module_paths",
+            wraps=local_sources_watcher.get_module_paths,
+        ) as get_module_paths:
+            for _ in range(2):
+                lsw = local_sources_watcher.LocalSourcesWatcher(
+                    PagesManager(SCRIPT_PATH)
+                )
+                lsw.update_watched_modules()
+
+            looked_up_modules = [args[0] for args, _ in get_module_paths.call_args_list]
+
+        self.assertLessEqual(looked_up_modules.count(DUMMY_MODULE_2), 1)
+        self.assertIn(DUMMY_MODULE_2_FILE, lsw._watched_modules)
+
     @patch(
         "streamlit.runtime.pages_manager.PagesManager.get_pages",
         MagicMock(
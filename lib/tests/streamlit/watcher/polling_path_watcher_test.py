@@ -14,6 +14,10 @@
 
 from __future__ import annotations
 
+import os
+import tempfile
+import threading
+import time
 import unittest
 from unittest import mock
 
@@ -28,39 +32,29 @@ class PollingPathWatcherTest(unittest.TestCase):
         self.util_patch = mock.patch("streamlit.watcher.polling_path_watcher.util")
         self.util_mock = self.util_patch.start()
 
-        # Patch PollingPathWatcher's thread pool executor. We want to do
-        # all of our test polling on the test thread, so we accumulate
-        # tasks here and run them manually via `_run_executor_tasks`.
-        self._executor_tasks = []
-        self.executor_patch = mock.patch(
-            "streamlit.watcher.polling_path_watcher.PollingPathWatcher._executor",
+        # Replace the poller with one whose thread is never started. We want
+        # to do all of our test polling on the test thread, so we run its
+        # ticks manually via `_run_poller`.
+        self.poller = polling_path_watcher._Poller()
+        self.poller_patch = mock.patch.object(
+            polling_path_watcher, "_poller", self.poller
         )
-        executor_mock = self.executor_patch.start()
-        executor_mock.submit = self._submit_executor_task
-
-        # Patch PollingPathWatcher's `time.sleep` to no-op, so that the tasks
-        # submitted to our mock executor don't block.
-        self.sleep_patch = mock.patch(
-            "streamlit.watcher.polling_path_watcher.time.sleep"
+        self.poller_patch.start()
+        self.thread_patch = mock.patch(
+            "streamlit.watcher.polling_path_watcher.threading.Thread"
         )
-        self.sleep_patch.start()
+        self.thread_patch.start()
 
     def tearDown(self):
         super().tearDown()
         self.util_patch.stop()
-        self.executor_patch.stop()
-        self.sleep_patch.stop()
-
-    def _submit_executor_task(self, task):
-        """Submit a new task to our mock executor."""
-        self._executor_tasks.append(task)
+        self.poller_patch.stop()
+        self.thread_patch.stop()
 
-    def _run_executor_tasks(self):
-        """Run all tasks that have been submitted to our mock executor."""
-        tasks = self._executor_tasks
-        self._executor_tasks = []
-        for task in tasks:
-            task()
+    def _run_poller(self):
+        """Check all watched paths once."""
+        for _ in range(polling_path_watcher._NUM_WHEEL_SLOTS):
+            self.poller.tick()
 
     def test_file_watch_and_callback(self):
         """Test that when a file is modified, the callback is called."""
@@ -73,13 +67,13 @@ class PollingPathWatcherTest(unittest.TestCase):
             "/this/is/my/file.py", callback
         )
 
-        self._run_executor_tasks()
+        self._run_poller()
         callback.assert_not_called()
 
         self.util_mock.path_modification_time = lambda *args: 102.0
         self.util_mock.calc_md5_with_blocking_retries = lambda _, **kwargs: "2"
 
-        self._run_executor_tasks()
+        self._run_poller()
         callback.assert_called_once()
 
         watcher.close()
@@ -95,14 +89,14 @@ class PollingPathWatcherTest(unittest.TestCase):
             "/this/is/my/file.py", callback
         )
 
-        self._run_executor_tasks()
+        self._run_poller()
         callback.assert_not_called()
 
         # Same mtime!
         self.util_mock.calc_md5_with_blocking_retries = lambda _, **kwargs: "2"
 
         # This is the test:
-        self._run_executor_tasks()
+        self._run_poller()
         callback.assert_not_called()
 
         watcher.close()
@@ -118,14 +112,14 @@ class PollingPathWatcherTest(unittest.TestCase):
             "/this/is/my/folder/", callback
         )
 
-        self._run_executor_tasks()
+        self._run_poller()
         callback.assert_not_called()
 
         # Same mtime!
         self.util_mock.calc_md5_with_blocking_retries = lambda _, **kwargs: "22"
 
         # This is the test:
-        self._run_executor_tasks()
+        self._run_poller()
         callback.assert_called()
 
         watcher.close()
@@ -141,14 +135,14 @@ class PollingPathWatcherTest(unittest.TestCase):
             "/this/is/my/file.py", callback
         )
 
-        self._run_executor_tasks()
+        self._run_poller()
         callback.assert_not_called()
 
         self.util_mock.path_modification_time = lambda *args: 102.0
         # Same MD5
 
         # This is the test:
-        self._run_executor_tasks()
+        self._run_poller()
         callback.assert_not_called()
 
         watcher.close()
@@ -175,7 +169,7 @@ class PollingPathWatcherTest(unittest.TestCase):
             allow_nonexistent=True,
         )
 
-        self._run_executor_tasks()
+        self._run_poller()
         callback.assert_not_called()
         _, kwargs = self.util_mock.calc_md5_with_blocking_retries.call_args
         assert kwargs == {"glob_pattern": "*.py", "allow_nonexistent": True}
@@ -183,7 +177,7 @@ class PollingPathWatcherTest(unittest.TestCase):
         self.util_mock.path_modification_time = lambda *args: 102.0
         self.util_mock.calc_md5_with_blocking_retries = mock.Mock(return_value="2")
 
-        self._run_executor_tasks()
+        self._run_poller()
         callback.assert_called_once()
         _, kwargs = self.util_mock.calc_md5_with_blocking_retries.call_args
         assert kwargs == {"glob_pattern": "*.py", "allow_nonexistent": True}
@@ -212,14 +206,14 @@ class PollingPathWatcherTest(unittest.TestCase):
         watcher1 = polling_path_watcher.PollingPathWatcher(filename, callback1)
         watcher2 = polling_path_watcher.PollingPathWatcher(filename, callback2)
 
-        self._run_executor_tasks()
+        self._run_poller()
 
         callback1.assert_not_called()
         callback2.assert_not_called()
 
         # "Modify" our file
         modify_mock_file()
-        self._run_executor_tasks()
+        self._run_poller()
 
         self.assertEqual(callback1.call_count, 1)
         self.assertEqual(callback2.call_count, 1)
@@ -229,7 +223,7 @@ class PollingPathWatcherTest(unittest.TestCase):
 
         # Modify our file again
         modify_mock_file()
-        self._run_executor_tasks()
+        self._run_poller()
 
         self.assertEqual(callback1.call_count, 1)
         self.assertEqual(callback2.call_count, 2)
@@ -238,8 +232,78 @@ class PollingPathWatcherTest(unittest.TestCase):
 
         # Modify our file a final time
         modify_mock_file()
+        self._run_poller()
 
         # Both watchers are now closed, so their callback counts
         # should not have increased.
         self.assertEqual(callback1.call_count, 1)
         self.assertEqual(callback2.call_count, 2)
+
+    def test_spreads_watchers_over_ticks(self):
+        """Each tick only checks the watchers in one slot of the wheel."""
+        self.util_mock.path_modification_time = lambda *args: 101.0
+        self.util_mock.calc_md5_with_blocking_retries = lambda _, **kwargs: "1"
+
+        watchers = [
+            polling_path_watcher.PollingPathWatcher(f"/file{i}.py", mock.Mock())
+            for i in range(polling_path_watcher._NUM_WHEEL_SLOTS * 2)
+        ]
+
+        self.util_mock.path_modification_time = mock.Mock(return_value=101.0)
+        self.poller.tick()
+        self.assertEqual(2, self.util_mock.path_modification_time.call_count)
+
+        for watcher in watchers:
+            watcher.close()
+        self.assertFalse(any(self.poller._wheel))
+
+    def test_failing_check_closes_watcher(self):
+        self.util_mock.path_modification_time = lambda *args: 101.0
+        self.util_mock.calc_md5_with_blocking_retries = lambda _, **kwargs: "1"
+
+        failing_callback = mock.Mock(side_effect=RuntimeError("oh no"))
+        callback = mock.Mock()
+        polling_path_watcher.PollingPathWatcher("/this/is/my/file.py", failing_callback)
+        watcher2 = polling_path_watcher.PollingPathWatcher(
+            "/this/is/my/file.py", callback
+        )
+
+        self.util_mock.path_modification_time = lambda *args: 102.0
+        self.util_mock.calc_md5_with_blocking_retries = lambda _, **kwargs: "2"
+        self._run_poller()
+
+        failing_callback.assert_called_once()
+        callback.assert_called_once()
+
+        # The watcher whose check failed is closed.
+        self.assertEqual({watcher2}, set().union(*self.poller._wheel))
+        watcher2.close()
+
+
+class PollerThreadTest(unittest.TestCase):
+    def test_detects_change_and_stops_when_idle(self):
+        """The poller thread reports changes, and exits once its last watcher
+        is closed.
+        """
+        fd, path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, path)
+        os.utime(path, (1000, 1000))
+
+        poller = polling_path_watcher._Poller()
+        poller_patch = mock.patch.object(polling_path_watcher, "_poller", poller)
+        poller_patch.start()
+        self.addCleanup(poller_patch.stop)
+
+        changed = threading.Event()
+        watcher = polling_path_watcher.PollingPathWatcher(path, lambda _: changed.set())
+
+        with open(path, "w") as f:
+            f.write("changed")
+        self.assertTrue(changed.wait(5))
+
+        watcher.close()
+        deadline = time.monotonic() + 5
+        while poller._thread is not None:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
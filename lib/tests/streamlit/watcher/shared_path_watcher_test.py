@@ -0,0 +1,145 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for SharedPathWatcher."""
+
+from __future__ import annotations
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from streamlit.watcher import shared_path_watcher
+from streamlit.watcher.shared_path_watcher import SharedPathWatcher
+
+
+class SharedPathWatcherTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        patcher = patch.object(shared_path_watcher, "_shared_watches", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.watcher_class = MagicMock()
+
+    def _dispatch(self, path: str) -> None:
+        """Simulate a change reported by the underlying PathWatcher."""
+        args, _ = self.watcher_class.call_args
+        args[1](path)
+
+    def test_shares_watcher(self):
+        """Subscriptions to the same path share a single PathWatcher, and each
+        change is dispatched to all of them.
+        """
+        callbacks = [MagicMock(), MagicMock()]
+        for callback in callbacks:
+            SharedPathWatcher("/a.py", callback, watcher_class=self.watcher_class)
+
+        self.watcher_class.assert_called_once()
+        self._dispatch("/a.py")
+        for callback in callbacks:
+            callback.assert_called_once_with("/a.py")
+
+    def test_separate_watchers_per_path_and_options(self):
+        SharedPathWatcher("/a.py", MagicMock(), watcher_class=self.watcher_class)
+        SharedPathWatcher("/b.py", MagicMock(), watcher_class=self.watcher_class)
+        SharedPathWatcher(
+            "/a.py",
+            MagicMock(),
+            watcher_class=self.watcher_class,
+            allow_nonexistent=True,
+        )
+        self.assertEqual(3, self.watcher_class.call_count)
+
+    def test_closes_watcher_with_last_subscription(self):
+        callback1 = MagicMock()
+        callback2 = MagicMock()
+        watcher1 = SharedPathWatcher(
+            "/a.py", callback1, watcher_class=self.watcher_class
+        )
+        watcher2 = SharedPathWatcher(
+            "/a.py", callback2, watcher_class=self.watcher_class
+        )
+        path_watcher = self.watcher_class.return_value
+
+        watcher1.close()
+        watcher1.close()
+        path_watcher.close.assert_not_called()
+
+        self._dispatch("/a.py")
+        callback1.assert_not_called()
+        callback2.assert_called_once_with("/a.py")
+
+        watcher2.close()
+        path_watcher.close.assert_called_once()
+        self.assertEqual({}, shared_path_watcher._shared_watches)
+
+    def test_failing_callback_does_not_stop_dispatch(self):
+        failing_callback = MagicMock(side_effect=RuntimeError("oh no"))
+        callback = MagicMock()
+        SharedPathWatcher("/a.py", failing_callback, watcher_class=self.watcher_class)
+        SharedPathWatcher("/a.py", callback, watcher_class=self.watcher_class)
+
+        self._dispatch("/a.py")
+        callback.assert_called_once_with("/a.py")
+
+    def test_closed_subscriber_skipped_during_dispatch(self):
+        """A subscription that's closed while a change is dispatched doesn't
+        get the change anymore.
+        """
+        callback = MagicMock()
+        SharedPathWatcher(
+            "/a.py",
+            lambda path: watcher.close(),
+            watcher_class=self.watcher_class,
+        )
+        watcher = SharedPathWatcher("/a.py", callback, watcher_class=self.watcher_class)
+
+        self._dispatch("/a.py")
+        callback.assert_not_called()
+
+    def test_watcher_creation_error(self):
+        """Nothing is registered if the PathWatcher can't be created."""
+        self.watcher_class.side_effect = PermissionError()
+        with self.assertRaises(PermissionError):
+            SharedPathWatcher("/a.py", MagicMock(), watcher_class=self.watcher_class)
+        self.assertEqual({}, shared_path_watcher._shared_watches)
+
+    def test_concurrent_creation_keeps_one_watcher(self):
+        """If another thread registers the path while a PathWatcher is being
+        created, the extra PathWatcher is closed and the registered one shared.
+        """
+        registered_watcher = MagicMock()
+        extra_watcher = MagicMock()
+        registered_callback = MagicMock()
+
+        def create_watcher(*args, **kwargs):
+            # Runs without the lock held, as another thread registering the
+            # same path would.
+            self.watcher_class.side_effect = None
+            self.watcher_class.return_value = registered_watcher
+            SharedPathWatcher(
+                "/a.py", registered_callback, watcher_class=self.watcher_class
+            )
+            return extra_watcher
+
+        self.watcher_class.side_effect = create_watcher
+        callback = MagicMock()
+        SharedPathWatcher("/a.py", callback, watcher_class=self.watcher_class)
+
+        extra_watcher.close.assert_called_once()
+        registered_watcher.close.assert_not_called()
+
+        self._dispatch("/a.py")
+        registered_callback.assert_called_once_with("/a.py")
+        callback.assert_called_once_with("/a.py")
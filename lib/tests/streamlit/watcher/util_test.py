@@ -14,11 +14,16 @@
 
 from __future__ import annotations
 
+import hashlib
+import os
 import tempfile
 import unittest
 from unittest.mock import MagicMock, mock_open, patch
 
+from cachetools import LRUCache
+
 from streamlit.watcher import util
+from tests.testutil import patch_config_options
 
 
 class UtilTest(unittest.TestCase):
@@ -58,6 +63,80 @@ class UtilTest(unittest.TestCase):
             m.assert_called_once_with("foo", "rb")
 
 
+class FileMd5Test(unittest.TestCase):
+    _unpatched_file_hashes = util._file_hashes
+
+    def setUp(self) -> None:
+        super().setUp()
+        fd, self.path = tempfile.mkstemp()
+        os.close(fd)
+        self.addCleanup(os.remove, self.path)
+
+        patcher = patch.object(util, "_file_hashes", {})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _write(self, content: bytes, mtime: float | None = None) -> None:
+        with open(self.path, "wb") as f:
+            f.write(content)
+        if mtime is not None:
+            os.utime(self.path, (mtime, mtime))
+
+    @patch("streamlit.watcher.util._HASH_CHUNK_SIZE", 3)
+    def test_hashes_file_in_chunks(self):
+        self._write(b"hello world")
+        self.assertEqual(
+            hashlib.md5(b"hello world").hexdigest(),
+            util.calc_md5_with_blocking_retries(self.path),
+        )
+
+    def test_reuses_hash_if_stats_unchanged(self):
+        self._write(b"hello", mtime=1000)
+        with patch(
+            "streamlit.watcher.util._hash_file_with_blocking_retries",
+            wraps=util._hash_file_with_blocking_retries,
+        ) as hash_file:
+            md5 = util.calc_md5_with_blocking_retries(self.path)
+            self.assertEqual(md5, util.calc_md5_with_blocking_retries(self.path))
+            hash_file.assert_called_once()
+
+            # The file is hashed again once its stats change.
+            self._write(b"world", mtime=2000)
+            self.assertNotEqual(md5, util.calc_md5_with_blocking_retries(self.path))
+            self.assertEqual(2, hash_file.call_count)
+
+    def test_rehashes_recently_modified_file(self):
+        """A file modified right before its last hash may have been modified
+        again without its stats changing, so it's always hashed again.
+        """
+        self._write(b"hello")
+        with patch(
+            "streamlit.watcher.util._hash_file_with_blocking_retries",
+            wraps=util._hash_file_with_blocking_retries,
+        ) as hash_file:
+            util.calc_md5_with_blocking_retries(self.path)
+            util.calc_md5_with_blocking_retries(self.path)
+            self.assertEqual(2, hash_file.call_count)
+
+    def test_file_hashes_are_bounded(self):
+        """Hashes of files that are no longer watched are eventually dropped."""
+        self.assertIsInstance(FileMd5Test._unpatched_file_hashes, LRUCache)
+        self.assertEqual(
+            util._MAX_FILE_HASHES, FileMd5Test._unpatched_file_hashes.maxsize
+        )
+
+    @patch_config_options({"server.fileWatcherMaxHashSize": 0})
+    def test_large_files_are_not_read(self):
+        self._write(b"hello", mtime=1000)
+        with patch("streamlit.watcher.util.open") as open_mock:
+            md5 = util.calc_md5_with_blocking_retries(self.path)
+            self.assertEqual(md5, util.calc_md5_with_blocking_retries(self.path))
+
+            self._write(b"world", mtime=2000)
+            self.assertNotEqual(md5, util.calc_md5_with_blocking_retries(self.path))
+            open_mock.assert_not_called()
+
+
 class FakeStat:
     """Emulates the output of os.stat()."""
 
@@ -16,11 +16,14 @@ from __future__ import annotations
 
 import os.path
 import sys
+import tempfile
+import unittest
 from io import StringIO
 from unittest import IsolatedAsyncioTestCase
 from unittest.mock import Mock, patch
 
-from streamlit import config
+from streamlit import config, source_util
+from streamlit.runtime.scriptrunner.script_cache import ScriptCache
 from streamlit.web import bootstrap
 from tests import testutil
 from tests.testutil import patch_config_options
@@ -406,3 +409,90 @@ class BootstrapPrintTest(IsolatedAsyncioTestCase):
                 "server.port": 8502,
             },
         )
+
+
+class PreloadPageScriptsTest(unittest.TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        # Don't use the pages of other tests' scripts.
+        pages_cache_patcher = patch.object(source_util, "_cached_pages", None)
+        pages_cache_patcher.start()
+        self.addCleanup(pages_cache_patcher.stop)
+
+        self.main_script_path = os.path.join(self.temp_dir.name, "app.py")
+        os.mkdir(os.path.join(self.temp_dir.name, "pages"))
+        self.page_script_path = os.path.join(self.temp_dir.name, "pages", "page.py")
+        with open(self.main_script_path, "w") as f:
+            f.write("import preload_test_module\n")
+        with open(self.page_script_path, "w") as f:
+            f.write("import os.path\n")
+        with open(os.path.join(self.temp_dir.name, "preload_test_module.py"), "w") as f:
+            f.write("")
+
+        self.addCleanup(sys.modules.pop, "preload_test_module", None)
+
+    def test_get_top_level_imports(self):
+        source = """
+import a, b.c
+from d import e
+from . import f
+from .g import h
+
+def fn():
+    import i
+
+if True:
+    import j
+"""
+        self.assertEqual(["a", "b.c", "d"], bootstrap._get_top_level_imports(source))
+
+    def test_compiles_page_scripts(self):
+        """The main script and the scripts in pages/ are compiled."""
+        script_cache = ScriptCache()
+        bootstrap._preload_page_scripts(
+            self.main_script_path, script_cache, preload_imports=False
+        )
+
+        self.assertEqual(
+            {
+                os.path.realpath(self.main_script_path),
+                os.path.realpath(self.page_script_path),
+            },
+            {os.path.realpath(path) for path in script_cache._cache},
+        )
+        self.assertNotIn("preload_test_module", sys.modules)
+
+    def test_preloads_imports(self):
+        """With preload_imports, top-level imports of the scripts are imported."""
+        bootstrap._preload_page_scripts(
+            self.main_script_path, ScriptCache(), preload_imports=True
+        )
+        self.assertIn("preload_test_module", sys.modules)
+        # The script's directory is only on sys.path while importing.
+        self.assertNotIn(self.temp_dir.name, sys.path)
+
+    def test_logs_failed_imports(self):
+        with open(self.main_script_path, "w") as f:
+            f.write("import nonexistent_preload_test_module\n")
+
+        with self.assertLogs("streamlit.web.bootstrap", level="WARNING") as logs:
+            bootstrap._preload_page_scripts(
+                self.main_script_path, ScriptCache(), preload_imports=True
+            )
+        self.assertIn("nonexistent_preload_test_module", logs.output[0])
+
+    def test_ignores_errors(self):
+        """A script that fails to compile doesn't stop the others."""
+        with open(self.main_script_path, "w") as f:
+            f.write("def (:\n")
+
+        script_cache = ScriptCache()
+        bootstrap._preload_page_scripts(
+            self.main_script_path, script_cache, preload_imports=True
+        )
+        self.assertEqual(
+            [os.path.realpath(self.page_script_path)],
+            [os.path.realpath(path) for path in script_cache._cache],
+        )
@@ -14,6 +14,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import ANY, MagicMock, patch
 
 import tornado.httpserver
@@ -24,6 +25,8 @@ import tornado.websocket
 from streamlit.proto.BackMsg_pb2 import BackMsg
 from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
 from streamlit.runtime import Runtime, SessionClientDisconnectedError
+from streamlit.runtime.runtime_util import unpack_forward_msg_batch
+from streamlit.web.server.browser_websocket_handler import BATCH_SUBPROTOCOL
 from streamlit.web.server.server import BrowserWebSocketHandler
 from tests.streamlit.web.server.server_test_case import ServerTestCase
 from tests.testutil import patch_config_options
@@ -94,6 +97,176 @@ class BrowserWebSocketHandlerTest(ServerTestCase):
 
                 write_message_mock.assert_called_once()
 
+    @tornado.testing.gen_test
+    async def test_write_forward_msg_without_batching(self):
+        """Without batch framing, each ForwardMsg is sent in its own frame."""
+        with self._patch_app_session():
+            await self.server.start()
+            ws_client = await self.ws_connect()
+
+            session_info = self.server._runtime._session_mgr.list_active_sessions()[0]
+            websocket_handler: BrowserWebSocketHandler = session_info.client
+            self.assertFalse(websocket_handler.is_batching_enabled)
+
+            for i in range(2):
+                msg = ForwardMsg()
+                msg.page_info_changed.query_string = f"index={i}"
+                websocket_handler.write_forward_msg(msg)
+
+            for i in range(2):
+                received = await self.read_forward_msg(ws_client)
+                self.assertEqual(f"index={i}", received.page_info_changed.query_string)
+
+    @tornado.testing.gen_test
+    async def test_write_forward_msg_with_batching(self):
+        """If the client negotiated batch framing, ForwardMsgs written during the
+        same eventloop iteration are sent in a single frame.
+        """
+        with self._patch_app_session():
+            await self.server.start()
+            ws_client = await tornado.websocket.websocket_connect(
+                self.get_ws_url("/_stcore/stream"),
+                subprotocols=[BATCH_SUBPROTOCOL, "PLACEHOLDER_AUTH_TOKEN"],
+            )
+            self.assertEqual(BATCH_SUBPROTOCOL, ws_client.selected_subprotocol)
+
+            session_info = self.server._runtime._session_mgr.list_active_sessions()[0]
+            websocket_handler: BrowserWebSocketHandler = session_info.client
+            self.assertTrue(websocket_handler.is_batching_enabled)
+
+            for i in range(3):
+                msg = ForwardMsg()
+                msg.page_info_changed.query_string = f"index={i}"
+                websocket_handler.write_forward_msg(msg)
+
+            frame = await ws_client.read_message()
+            serialized_msgs = unpack_forward_msg_batch(frame)
+            self.assertEqual(3, len(serialized_msgs))
+            for i, serialized_msg in enumerate(serialized_msgs):
+                received = ForwardMsg()
+                received.ParseFromString(serialized_msg)
+                self.assertEqual(f"index={i}", received.page_info_changed.query_string)
+
+    @patch_config_options(
+        {
+            "server.websocketWriteBufferHighWatermark": 2,
+            "server.websocketWriteBufferLowWatermark": 1,
+        }
+    )
+    @tornado.testing.gen_test
+    async def test_write_buffer_watermarks(self):
+        """The write buffer is reported as full once the unflushed bytes exceed
+        the high watermark, until they drop to the low watermark.
+        """
+        with self._patch_app_session():
+            await self.server.start()
+            await self.ws_connect()
+
+            session_info = self.server._runtime._session_mgr.list_active_sessions()[0]
+            websocket_handler: BrowserWebSocketHandler = session_info.client
+
+            write_futures: list[asyncio.Future[None]] = []
+
+            def write_message(*args, **kwargs):
+                future: asyncio.Future[None] = asyncio.Future()
+                write_futures.append(future)
+                return future
+
+            msg = ForwardMsg()
+            msg.delta.new_element.markdown.body = "X" * 900_000
+
+            with patch.object(
+                websocket_handler, "write_message", side_effect=write_message
+            ), patch.object(
+                self.server._runtime, "notify_write_buffer_drained"
+            ) as notify_write_buffer_drained:
+                for _ in range(3):
+                    self.assertFalse(websocket_handler.is_write_buffer_full)
+                    websocket_handler.write_forward_msg(msg)
+
+                self.assertTrue(websocket_handler.is_write_buffer_full)
+                self.assertGreater(websocket_handler.buffered_bytes, 2_000_000)
+
+                # Flushing one message leaves us between the watermarks.
+                write_futures[0].set_result(None)
+                await asyncio.sleep(0)
+                self.assertTrue(websocket_handler.is_write_buffer_full)
+                notify_write_buffer_drained.assert_not_called()
+
+                # Flushing another one gets us below the low watermark, and the
+                # Runtime is told to send the messages it held back.
+                write_futures[1].set_result(None)
+                await asyncio.sleep(0)
+                self.assertFalse(websocket_handler.is_write_buffer_full)
+                notify_write_buffer_drained.assert_called_once()
+
+                write_futures[2].set_result(None)
+                await asyncio.sleep(0)
+                self.assertEqual(0, websocket_handler.buffered_bytes)
+
+    @patch_config_options(
+        {
+            "server.websocketWriteBufferHighWatermark": 0,
+            "server.websocketWriteBufferLowWatermark": 0,
+            "server.websocketSlowClientTimeout": 0,
+        }
+    )
+    @tornado.testing.gen_test
+    async def test_closes_slow_client(self):
+        """A client whose write buffer stays full for too long is disconnected."""
+        with self._patch_app_session():
+            await self.server.start()
+            await self.ws_connect()
+
+            session_info = self.server._runtime._session_mgr.list_active_sessions()[0]
+            websocket_handler: BrowserWebSocketHandler = session_info.client
+
+            with patch.object(
+                websocket_handler,
+                "write_message",
+                return_value=asyncio.Future(),
+            ), patch.object(websocket_handler, "close") as patched_close:
+                websocket_handler.write_forward_msg(ForwardMsg())
+                self.assertTrue(websocket_handler.is_write_buffer_full)
+
+                await asyncio.sleep(0.01)
+                patched_close.assert_called_once()
+
+    @patch_config_options(
+        {
+            "server.enableWebsocketCompression": True,
+            "server.websocketCompressionMinSize": 1000,
+        }
+    )
+    @tornado.testing.gen_test
+    async def test_compresses_large_messages(self):
+        """With compression enabled, only messages of at least the min size are
+        compressed.
+        """
+        with self._patch_app_session():
+            await self.server.start()
+            ws_client = await tornado.websocket.websocket_connect(
+                self.get_ws_url("/_stcore/stream"), compression_options={}
+            )
+
+            session_info = self.server._runtime._session_mgr.list_active_sessions()[0]
+            websocket_handler: BrowserWebSocketHandler = session_info.client
+
+            small_msg = ForwardMsg()
+            small_msg.delta.new_element.markdown.body = "small"
+            large_msg = ForwardMsg()
+            large_msg.delta.new_element.markdown.body = "X" * 10_000
+            websocket_handler.write_forward_msg(small_msg)
+            websocket_handler.write_forward_msg(large_msg)
+
+            self.assertEqual(small_msg, await self.read_forward_msg(ws_client))
+            self.assertEqual(large_msg, await self.read_forward_msg(ws_client))
+
+            stats = websocket_handler.compression_stats
+            self.assertEqual(1, stats.uncompressed_msgs)
+            self.assertEqual(1, stats.compressed_msgs)
+            self.assertGreater(stats.saved_bytes, 9_000)
+
     @tornado.testing.gen_test
     async def test_backmsg_deserialization_exception(self):
         """If BackMsg deserialization raises an Exception, we should call the Runtime's
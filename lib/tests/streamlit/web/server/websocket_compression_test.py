@@ -0,0 +1,120 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Unit tests for CompressingWebSocketProtocol."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import tornado.testing
+import tornado.web
+import tornado.websocket
+
+from streamlit.web.server.websocket_compression import CompressingWebSocketProtocol
+
+
+class _Handler(tornado.websocket.WebSocketHandler):
+    instances: list[_Handler] = []
+
+    def get_compression_options(self):
+        return {}
+
+    def get_websocket_protocol(self):
+        protocol = super().get_websocket_protocol()
+        return CompressingWebSocketProtocol(
+            self,
+            protocol.params,
+            min_compressed_size=100,
+            offload_size=10_000,
+            window_bits=10,
+        )
+
+    def open(self):
+        _Handler.instances.append(self)
+
+
+class CompressingWebSocketProtocolTest(tornado.testing.AsyncHTTPTestCase):
+    def get_app(self):
+        _Handler.instances = []
+        return tornado.web.Application([("/ws", _Handler)])
+
+    async def _connect(self):
+        ws_client = await tornado.websocket.websocket_connect(
+            self.get_url("/ws").replace("http", "ws"), compression_options={}
+        )
+        while not _Handler.instances:
+            await asyncio.sleep(0.01)
+        return ws_client, _Handler.instances[0]
+
+    @tornado.testing.gen_test
+    async def test_only_compresses_large_messages(self):
+        """Messages below the min size are sent uncompressed, and both kinds of
+        messages are received correctly.
+        """
+        ws_client, handler = await self._connect()
+
+        await handler.write_message(b"small", binary=True)
+        await handler.write_message(b"x" * 1000, binary=True)
+
+        self.assertEqual(b"small", await ws_client.read_message())
+        self.assertEqual(b"x" * 1000, await ws_client.read_message())
+
+        stats = handler.ws_connection.compression_stats
+        self.assertEqual(1, stats.uncompressed_msgs)
+        self.assertEqual(1, stats.compressed_msgs)
+        self.assertEqual(1000, stats.raw_bytes)
+        self.assertLess(stats.wire_bytes, 100)
+        self.assertEqual(stats.raw_bytes - stats.wire_bytes, stats.saved_bytes)
+
+    @tornado.testing.gen_test
+    async def test_offloads_large_messages_in_order(self):
+        """Large messages are compressed on a worker thread, and messages written
+        after them are still sent after them.
+        """
+        ws_client, handler = await self._connect()
+        protocol = handler.ws_connection
+
+        compress_threads = []
+        original_compress = protocol._compress
+
+        def compress(message):
+            compress_threads.append(threading.current_thread())
+            return original_compress(message)
+
+        protocol._compress = compress
+
+        large_msg = b"y" * 20_000
+        futures = [
+            handler.write_message(large_msg, binary=True),
+            handler.write_message(b"z" * 1000, binary=True),
+            handler.write_message(b"small", binary=True),
+        ]
+        await asyncio.gather(*futures)
+
+        self.assertEqual(large_msg, await ws_client.read_message())
+        self.assertEqual(b"z" * 1000, await ws_client.read_message())
+        self.assertEqual(b"small", await ws_client.read_message())
+
+        self.assertNotEqual(threading.main_thread(), compress_threads[0])
+        self.assertEqual(threading.main_thread(), compress_threads[1])
+        self.assertIsNone(protocol._last_write_queued)
+
+    @tornado.testing.gen_test
+    async def test_limits_window_bits(self):
+        """The server compresses with at most the configured window size."""
+        _, handler = await self._connect()
+
+        self.assertEqual(10, handler.ws_connection._compressor._max_wbits)
@@ -0,0 +1,98 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark computing the element ID of a widget with many options.
+
+Widgets hash the string of their (formatted) options into their element ID on
+every run. This reports how long that takes for growing numbers of options,
+split into building the string of the options and hashing it, both for the
+same list of options on every call and for a freshly formatted one, as a
+widget gets on every rerun.
+
+Usage:
+    python scripts/benchmark_element_id.py [--options 1000 10000 50000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import statistics
+import time
+
+from streamlit.elements.lib.utils import _compute_element_id
+
+_NUM_CALLS = 20
+
+
+def _format_options(num_options: int) -> list[str]:
+    return [f"Option {i}" for i in range(num_options)]
+
+
+def _time_ms(func, make_options) -> float:
+    """Return the median time of calling func with the options, in ms."""
+    timings = []
+    for _ in range(_NUM_CALLS):
+        options = make_options()
+        start = time.perf_counter()
+        func(options)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def _compute_id(options: list[str]) -> None:
+    _compute_element_id(
+        "selectbox",
+        user_key="key",
+        form_id="",
+        label="Select",
+        options=options,
+        index=0,
+        help=None,
+        placeholder="Choose an option",
+    )
+
+
+def _print_timings(num_options: int) -> None:
+    options = _format_options(num_options)
+    encoded = str(options).encode("utf-8")
+    print(
+        f"{num_options:>8} "
+        f"{_time_ms(_compute_id, lambda: options):>16.2f} "
+        f"{_time_ms(_compute_id, lambda: _format_options(num_options)):>19.2f} "
+        f"{_time_ms(str, lambda: options):>11.2f} "
+        f"{_time_ms(lambda _: hashlib.md5(encoded), lambda: options):>9.2f}"
+    )
+
+
+def _main(option_counts: list[int]) -> None:
+    print(
+        f"{'options':>8} {'element ID (ms)':>16} {'fresh options (ms)':>19} "
+        f"{'str() (ms)':>11} {'md5 (ms)':>9}"
+    )
+    for num_options in option_counts:
+        _print_timings(num_options)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--options",
+        type=int,
+        nargs="+",
+        default=[1000, 10000, 50000],
+        help="Numbers of options to benchmark",
+    )
+    args = parser.parse_args()
+    _main(args.options)
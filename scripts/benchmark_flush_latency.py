@@ -0,0 +1,128 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the latency from a widget change to the first Delta being sent.
+
+Starts a Streamlit Runtime in-process, connects a single session running a small
+app script, and repeatedly sends it `rerun_script` BackMsgs (as the frontend does
+when a widget changes). For each rerun, it measures the time until the Runtime
+writes the first Delta ForwardMsg to the session's client.
+
+Usage:
+    python scripts/benchmark_flush_latency.py [--reruns 200] [--pause-ms 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+from streamlit import config
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.runtime import Runtime, RuntimeConfig, SessionClient
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.runtime.memory_uploaded_file_manager import MemoryUploadedFileManager
+
+_APP_SCRIPT = """
+import streamlit as st
+
+value = st.slider("Value", 0, 100)
+st.write("Value is", value)
+"""
+
+
+class _TimingClient(SessionClient):
+    """A SessionClient that records when the first Delta and the end of the
+    current script run are written to it.
+    """
+
+    def __init__(self) -> None:
+        self.first_delta_time = 0.0
+        self.script_finished: asyncio.Future[None] = asyncio.Future()
+
+    def reset(self) -> None:
+        self.first_delta_time = 0.0
+        self.script_finished = asyncio.Future()
+
+    def write_forward_msg(self, msg: ForwardMsg) -> None:
+        msg_type = msg.WhichOneof("type")
+        if msg_type == "delta" and not self.first_delta_time:
+            self.first_delta_time = time.perf_counter()
+        elif msg_type == "script_finished" and not self.script_finished.done():
+            self.script_finished.set_result(None)
+
+
+async def _main(num_reruns: int, pause: float) -> None:
+    config.get_config_options()
+    config._set_option("server.fileWatcherType", "none", "<benchmark>")
+    config._set_option("runner.postScriptGC", False, "<benchmark>")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        script_path = os.path.join(temp_dir, "app.py")
+        with open(script_path, "w") as f:
+            f.write(_APP_SCRIPT)
+
+        runtime = Runtime(
+            RuntimeConfig(
+                script_path=script_path,
+                command_line=None,
+                media_file_storage=MemoryMediaFileStorage("/media"),
+                uploaded_file_manager=MemoryUploadedFileManager("/upload"),
+            )
+        )
+        await runtime.start()
+
+        client = _TimingClient()
+        session_id = runtime.connect_session(
+            client=client, user_info={"email": "test@example.com"}
+        )
+
+        latencies = []
+        for _ in range(num_reruns):
+            client.reset()
+            msg = BackMsg()
+            msg.rerun_script.query_string = ""
+
+            start = time.perf_counter()
+            runtime.handle_backmsg(session_id, msg)
+            await asyncio.wait_for(client.script_finished, timeout=10)
+            latencies.append(client.first_delta_time - start)
+
+            await asyncio.sleep(pause)
+
+        runtime.stop()
+        await runtime.stopped
+
+    # The first rerun includes compiling the script, so we don't count it.
+    latencies = latencies[1:]
+    print(f"{len(latencies)} reruns, {pause * 1000:.0f} ms pause between reruns")
+    print("widget change -> first delta written:")
+    print(f"  mean {statistics.mean(latencies) * 1000:.2f} ms")
+    print(f"  p50  {statistics.median(latencies) * 1000:.2f} ms")
+    print(f"  p99  {statistics.quantiles(latencies, n=100)[98] * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=200, help="Number of reruns")
+    parser.add_argument(
+        "--pause-ms", type=float, default=5, help="Pause between reruns in ms"
+    )
+    args = parser.parse_args()
+    asyncio.run(_main(args.reruns, args.pause_ms / 1000))
@@ -0,0 +1,132 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark sending ForwardMsgs with and without websocket batch framing.
+
+Starts a local Tornado websocket server that flushes a number of small Delta
+ForwardMsgs per request, once per message (the non-batching behavior, yielding
+to the eventloop after every message) and once as a single batch frame. The
+client measures the websocket frames received per second and the latency from
+requesting a flush to having decoded all of its ForwardMsgs.
+
+Usage:
+    python scripts/benchmark_forward_msg_batching.py [--msgs 300] [--flushes 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import tornado.web
+import tornado.websocket
+
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.runtime.runtime_util import (
+    pack_forward_msg_batch,
+    serialize_forward_msg,
+    unpack_forward_msg_batch,
+)
+
+
+def _create_delta_msgs(num_msgs: int) -> list[ForwardMsg]:
+    msgs = []
+    for i in range(num_msgs):
+        msg = ForwardMsg()
+        msg.metadata.delta_path[:] = [0, i]
+        msg.delta.new_element.markdown.body = f"Delta number {i}"
+        msgs.append(msg)
+    return msgs
+
+
+class _FlushHandler(tornado.websocket.WebSocketHandler):
+    def initialize(self, msgs: list[ForwardMsg], batch: bool) -> None:
+        self._msgs = msgs
+        self._batch = batch
+
+    async def on_message(self, message: str | bytes) -> None:
+        if self._batch:
+            self.write_message(
+                pack_forward_msg_batch([serialize_forward_msg(m) for m in self._msgs]),
+                binary=True,
+            )
+            await asyncio.sleep(0)
+            return
+
+        for msg in self._msgs:
+            self.write_message(serialize_forward_msg(msg), binary=True)
+            await asyncio.sleep(0)
+
+
+async def _run_mode(num_msgs: int, num_flushes: int, batch: bool) -> dict[str, float]:
+    app = tornado.web.Application(
+        [(r"/", _FlushHandler, {"msgs": _create_delta_msgs(num_msgs), "batch": batch})]
+    )
+    server = app.listen(0, address="127.0.0.1")
+    port = next(iter(server._sockets.values())).getsockname()[1]
+    client = await tornado.websocket.websocket_connect(f"ws://127.0.0.1:{port}/")
+
+    latencies = []
+    num_frames = 0
+    start = time.perf_counter()
+    for _ in range(num_flushes):
+        flush_start = time.perf_counter()
+        await client.write_message(b"flush", binary=True)
+
+        num_received = 0
+        while num_received < num_msgs:
+            frame = await client.read_message()
+            num_frames += 1
+            serialized_msgs = unpack_forward_msg_batch(frame) if batch else [frame]
+            for serialized_msg in serialized_msgs:
+                ForwardMsg().ParseFromString(serialized_msg)
+            num_received += len(serialized_msgs)
+        latencies.append(time.perf_counter() - flush_start)
+    elapsed = time.perf_counter() - start
+
+    client.close()
+    server.stop()
+
+    return {
+        "frames": num_frames,
+        "frames_per_sec": num_frames / elapsed,
+        "msgs_per_sec": num_msgs * num_flushes / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p99_ms": statistics.quantiles(latencies, n=100)[98] * 1000,
+    }
+
+
+async def _main(num_msgs: int, num_flushes: int) -> None:
+    print(f"{num_flushes} flushes of {num_msgs} ForwardMsgs each\n")
+    print(
+        f"{'mode':<10}{'frames':>10}{'frames/s':>12}{'msgs/s':>12}"
+        f"{'p50 ms':>10}{'p99 ms':>10}"
+    )
+    for mode, batch in (("single", False), ("batch", True)):
+        result = await _run_mode(num_msgs, num_flushes, batch)
+        print(
+            f"{mode:<10}{result['frames']:>10.0f}{result['frames_per_sec']:>12.0f}"
+            f"{result['msgs_per_sec']:>12.0f}{result['p50_ms']:>10.2f}"
+            f"{result['p99_ms']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--msgs", type=int, default=300, help="ForwardMsgs per flush")
+    parser.add_argument("--flushes", type=int, default=200, help="Number of flushes")
+    args = parser.parse_args()
+    asyncio.run(_main(args.msgs, args.flushes))
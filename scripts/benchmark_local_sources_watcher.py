@@ -0,0 +1,131 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark the per-run overhead of LocalSourcesWatcher.update_watched_modules.
+
+Generates a package tree with many modules outside of the app's folder, like
+installed dependencies, imports all of them, and creates a LocalSourcesWatcher
+for each of a number of sessions. It then measures how long
+`update_watched_modules` takes, as it's called after every script run:
+
+- on the first run of each session, when all imported modules are new,
+- on a run that didn't import anything, and
+- on a run that imported one more module.
+
+Usage:
+    python scripts/benchmark_local_sources_watcher.py [--modules 3000] [--sessions 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from streamlit import config
+from streamlit.runtime.pages_manager import PagesManager
+from streamlit.watcher.local_sources_watcher import LocalSourcesWatcher
+
+_MODULES_PER_PACKAGE = 50
+
+
+def _create_package_tree(root: str, num_modules: int) -> list[str]:
+    """Write `num_modules` modules into packages under `root`, and return their
+    names.
+    """
+    module_names = []
+    for i in range(num_modules):
+        package = f"bench_pkg{i // _MODULES_PER_PACKAGE}"
+        package_dir = os.path.join(root, package)
+        if not os.path.isdir(package_dir):
+            os.makedirs(package_dir)
+            with open(os.path.join(package_dir, "__init__.py"), "w"):
+                pass
+        with open(os.path.join(package_dir, f"mod{i}.py"), "w") as f:
+            f.write(f"VALUE = {i}\n")
+        module_names.append(f"{package}.mod{i}")
+    return module_names
+
+
+def _time_ms(func) -> float:
+    start = time.perf_counter()
+    func()
+    return (time.perf_counter() - start) * 1000
+
+
+def _print_timings(label: str, timings: list[float]) -> None:
+    print(
+        f"{label}: mean {statistics.mean(timings):.3f} ms, "
+        f"p50 {statistics.median(timings):.3f} ms, max {max(timings):.3f} ms"
+    )
+
+
+def _main(num_modules: int, num_sessions: int) -> None:
+    config.get_config_options()
+    # The modules are scanned either way. This only avoids creating OS-level
+    # watchers for them.
+    config._set_option("server.fileWatcherType", "none", "<benchmark>")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        app_dir = os.path.join(temp_dir, "app")
+        packages_dir = os.path.join(temp_dir, "packages")
+        os.makedirs(app_dir)
+        script_path = os.path.join(app_dir, "app.py")
+        with open(script_path, "w") as f:
+            f.write("import streamlit as st\n")
+
+        module_names = _create_package_tree(packages_dir, num_modules + num_sessions)
+        sys.path.insert(0, packages_dir)
+        for name in module_names[:num_modules]:
+            importlib.import_module(name)
+        extra_module_names = module_names[num_modules:]
+
+        watchers = [
+            LocalSourcesWatcher(PagesManager(script_path, setup_watcher=False))
+            for _ in range(num_sessions)
+        ]
+        print(f"{len(sys.modules)} modules in sys.modules, {num_sessions} sessions\n")
+
+        _print_timings(
+            "first run of a session",
+            [_time_ms(watcher.update_watched_modules) for watcher in watchers],
+        )
+        _print_timings(
+            "run without new imports",
+            [_time_ms(watcher.update_watched_modules) for watcher in watchers],
+        )
+
+        timings = []
+        for watcher, name in zip(watchers, extra_module_names):
+            importlib.import_module(name)
+            timings.append(_time_ms(watcher.update_watched_modules))
+        _print_timings("run with one new import", timings)
+
+        for watcher in watchers:
+            watcher.close()
+        sys.path.remove(packages_dir)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--modules", type=int, default=3000, help="Number of modules to import"
+    )
+    parser.add_argument("--sessions", type=int, default=200, help="Number of sessions")
+    args = parser.parse_args()
+    _main(args.modules, args.sessions)
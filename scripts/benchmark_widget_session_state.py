@@ -0,0 +1,78 @@
+# Copyright (c) Streamlit Inc. (2018-2022) Snowflake Inc. (2022-2024)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmark how script run time scales with the number of keyed widgets.
+
+Runs an app with a growing number of keyed widgets (selectboxes, text inputs
+and number inputs, which all look up their key in Session State) through
+AppTest, and reports the time of a rerun per widget. If rendering a widget
+takes constant time, the time per widget stays flat as the app grows.
+
+Usage:
+    python scripts/benchmark_widget_session_state.py [--widgets 150 300 600 1200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+import time
+
+from streamlit.testing.v1 import AppTest
+
+_APP_SCRIPT = """
+import streamlit as st
+
+for i in range({num_widgets} // 3):
+    st.selectbox("Select", ["a", "b", "c"], key=f"select_{{i}}")
+    st.text_input("Text", key=f"text_{{i}}")
+    st.number_input("Number", key=f"number_{{i}}")
+"""
+
+
+def _time_rerun(num_widgets: int, num_runs: int) -> float:
+    """Return the median time of a rerun of the app, in seconds."""
+    at = AppTest.from_string(_APP_SCRIPT.format(num_widgets=num_widgets))
+    at.run(timeout=60)
+
+    timings = []
+    for _ in range(num_runs):
+        start = time.perf_counter()
+        at.run(timeout=60)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def _main(widget_counts: list[int], num_runs: int) -> None:
+    print(f"{'widgets':>8} {'rerun (ms)':>12} {'per widget (us)':>16}")
+    for num_widgets in widget_counts:
+        rerun_time = _time_rerun(num_widgets, num_runs)
+        print(
+            f"{num_widgets:>8} {rerun_time * 1000:>12.1f} "
+            f"{rerun_time / num_widgets * 1_000_000:>16.1f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--widgets",
+        type=int,
+        nargs="+",
+        default=[150, 300, 600, 1200],
+        help="Numbers of widgets to benchmark",
+    )
+    parser.add_argument("--runs", type=int, default=5, help="Reruns per app size")
+    args = parser.parse_args()
+    _main(args.widgets, args.runs)